@@ -0,0 +1,123 @@
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from product_assistant.benchmarks.load_test import build_fake_agent, latency_summary
+from product_assistant.router.admission import AdmissionController
+
+# A traffic spike against POST /get: one heavy client bursts `--heavy` requests while
+# `--light-clients` clients send `--light` each, all at once. The same burst is replayed
+# without admission control, with FIFO admission and with per-client fair admission.
+
+
+class ProviderConcurrency(BaseCallbackHandler):
+    """Tracks concurrent fake-LLM calls; calls started above `limit` would trip a provider rate limit."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = self.peak = self.over_limit = self.calls = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            if self.in_flight > self.limit:
+                self.over_limit += 1
+
+    def on_llm_end(self, response, **kwargs):
+        with self._lock:
+            self.in_flight -= 1
+
+    def on_llm_error(self, error, **kwargs):
+        with self._lock:
+            self.in_flight -= 1
+
+
+async def run_burst(agent, controller: AdmissionController, heavy: int, light_clients: int, light: int) -> Dict:
+    import httpx
+    from product_assistant.router.main import app, get_admission_controller
+
+    app.state.rag_agent = agent
+    app.dependency_overrides[get_admission_controller] = lambda: controller
+    results = defaultdict(lambda: {"latencies": [], "status": defaultdict(int), "retry_after": []})
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                     timeout=None) as client:
+            async def call(group: str, client_id: str, query: str):
+                started = time.perf_counter()
+                response = await client.post("/get", data={"msg": query}, headers={"X-Client-ID": client_id})
+                results[group]["status"][response.status_code] += 1
+                if response.status_code == 200:
+                    results[group]["latencies"].append(time.perf_counter() - started)
+                elif "retry-after" in response.headers:
+                    results[group]["retry_after"].append(int(response.headers["retry-after"]))
+
+            calls = [call("heavy", "heavy", "What is the price of iPhone 15?") for _ in range(heavy)]
+            calls += [call("light", f"light-{c}", "Show product reviews for Pixel 8")
+                      for _ in range(light) for c in range(light_clients)]
+            started = time.perf_counter()
+            await asyncio.gather(*calls)
+            elapsed = time.perf_counter() - started
+    finally:
+        app.state.rag_agent = None
+        app.dependency_overrides.pop(get_admission_controller, None)
+
+    return {"elapsed_s": round(elapsed, 3), **{
+        group: {"status": dict(r["status"]), "latency": latency_summary(r["latencies"]),
+                "retry_after_s": sorted(set(r["retry_after"]))}
+        for group, r in results.items()}}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Admission control under a burst: none vs FIFO vs fair.")
+    parser.add_argument("--heavy", type=int, default=150, help="Requests from the heavy client.")
+    parser.add_argument("--light-clients", type=int, default=4)
+    parser.add_argument("--light", type=int, default=5, help="Requests per light client.")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--max-queue-per-client", type=int, default=8)
+    parser.add_argument("--provider-limit", type=int, default=32, help="Concurrent LLM calls the provider allows.")
+    parser.add_argument("--llm-latency-ms", type=float, default=50)
+    parser.add_argument("--json", help="Write the full report here.")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    modes = {
+        "none": dict(max_concurrency=10 ** 6, max_queue=10 ** 6, max_queue_per_client=10 ** 6),
+        "fifo": dict(max_concurrency=args.max_concurrency, max_queue=args.max_queue, fair=False),
+        "fair": dict(max_concurrency=args.max_concurrency, max_queue=args.max_queue,
+                     max_queue_per_client=args.max_queue_per_client),
+    }
+    reports = []
+    for mode, kwargs in modes.items():
+        kwargs["trusted_proxies"] = ["127.0.0.1"]  # httpx's ASGI transport peer; clients send X-Client-ID
+        agent = build_fake_agent(llm_latency_s=args.llm_latency_ms / 1000, compress=False)
+        provider = ProviderConcurrency(args.provider_limit)
+        agent.llm.callbacks = [provider]
+        report = asyncio.run(run_burst(agent, AdmissionController(**kwargs), args.heavy, args.light_clients, args.light))
+        report.update(mode=mode, llm_calls=provider.calls, llm_peak_concurrency=provider.peak,
+                      llm_calls_over_provider_limit=provider.over_limit)
+        reports.append(report)
+        print(f"[{mode}] {report['elapsed_s']:.2f}s  LLM peak concurrency={provider.peak} "
+              f"calls over provider limit={provider.over_limit}/{provider.calls}")
+        for group in ("heavy", "light"):
+            r = report[group]
+            print(f"        {group:<5s} status={r['status']} p50={r['latency']['p50_ms']:.0f}ms "
+                  f"p95={r['latency']['p95_ms']:.0f}ms retry_after={r['retry_after_s']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": reports}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import time
+import random
+import asyncio
+import threading
+from typing import Any, List, Optional
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.vectorstores import InMemoryVectorStore
+
+
+class FakeLatencyError(RuntimeError):
+    """Injected failure raised by the fake models."""
+
+
+class _LatencyInjector:
+    """Seeded latency/failure source shared by the fake models."""
+
+    def __init__(self, latency_s: float, jitter_s: float, failure_rate: float, seed: int,
+                 stall_rate: float = 0.0, stall_s: float = 0.0):
+        self.latency_s = latency_s
+        self.jitter_s = jitter_s
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_s = stall_s
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> float:
+        with self._lock:
+            delay = max(0.0, self.latency_s + self._rng.uniform(-self.jitter_s, self.jitter_s))
+            failed = self._rng.random() < self.failure_rate
+            if self._rng.random() < self.stall_rate:
+                delay += self.stall_s
+        if failed:
+            raise FakeLatencyError("injected failure")
+        return delay
+
+    def chance(self, p: float) -> bool:
+        if p <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < p
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic offline chat model with configurable latency, failure rate and
+    occasional stalls (`stall_rate` of calls take an extra `stall_s`, i.e. a latency tail).
+
+    Replies are keyed off the prompts the workflow actually sends: the LLMChainFilter gets
+    "YES", the grader "generator" (or "rewriter" for `rewrite_rate` of its calls, which sends
+    the query through the Rewriter -> Retriever loop), rewrite requests echo the question, and
+    everything else gets a fixed-size answer so token counts stay stable across runs.
+    """
+
+    latency_s: float = 0.05
+    jitter_s: float = 0.0
+    failure_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_s: float = 0.0
+    rewrite_rate: float = 0.0
+    seed: int = 0
+    answer_words: int = 40
+    name_suffix: str = ""
+    _injector: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._injector = _LatencyInjector(self.latency_s, self.jitter_s, self.failure_rate, self.seed,
+                                          self.stall_rate, self.stall_s)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-latency-chat"
+
+    @property
+    def model_name(self) -> str:
+        return "fake-latency-chat" + (f"-{self.name_suffix}" if self.name_suffix else "")
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if "Relevant (YES / NO)" in prompt:
+            text = "YES"
+        elif "Decision:" in prompt:
+            text = "rewriter" if self._injector.chance(self.rewrite_rate) else "generator"
+        elif prompt.startswith("Rewrite this question"):
+            text = prompt.split(":", 1)[-1].strip()
+        else:
+            text = " ".join(["answer"] * self.answer_words)
+        input_tokens, output_tokens = len(prompt.split()), len(text.split())
+        return AIMessage(content=text, usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self._injector.draw())
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self._injector.draw())
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+class LatencyFakeEmbeddings(DeterministicFakeEmbedding):
+    """DeterministicFakeEmbedding (hash-seeded vectors) plus an injected per-call delay."""
+
+    latency_s: float = 0.01
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_s)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency_s)
+        return super().embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency_s)
+        return super().embed_query(text)
+
+
+PRODUCT_NAMES = ["iPhone 15", "Galaxy S24", "Pixel 8", "OnePlus 12", "Redmi Note 13",
+                 "boAt Airdopes", "Sony WH-1000XM5", "MacBook Air M3", "iPad Air", "Noise ColorFit"]
+
+
+def synthetic_catalog(n_products: int = 200, seed: int = 0) -> List[Document]:
+    """Product documents shaped like DataIngestion.to_document output."""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(n_products):
+        name = f"{PRODUCT_NAMES[i % len(PRODUCT_NAMES)]} variant {i}"
+        docs.append(Document(
+            page_content=f"{name} review: " + " ".join(rng.choice(["good", "battery", "camera", "value", "display"])
+                                                    for _ in range(30)),
+            metadata={
+                "product_id": f"FAKE{i:05d}",
+                "product_title": name,
+                "rating": round(rng.uniform(3.0, 5.0), 1),
+                "total_reviews": rng.randint(10, 5000),
+                "price": f"₹{rng.randint(999, 149999)}",
+            },
+        ))
+    return docs
+
+
+def build_fake_retriever(embeddings: LatencyFakeEmbeddings, n_products: int = 200, k: int = 10,
+                         llm: Optional[BaseChatModel] = None, seed: int = 0):
+    """
+    In-memory vector store over a synthetic catalog. With `llm` the retriever is wrapped in the
+    same LLMChainFilter compression as Retriever.load_retriever, so each query also pays k filter calls.
+    """
+    docs = synthetic_catalog(n_products, seed)
+    store = InMemoryVectorStore(embedding=DeterministicFakeEmbedding(size=embeddings.size))
+    store.add_documents(docs)
+    store.embedding = embeddings
+    retriever = store.as_retriever(search_kwargs={"k": k})
+    if llm is None:
+        return retriever
+
+    from langchain.retrievers import ContextualCompressionRetriever
+    from langchain.retrievers.document_compressors import LLMChainFilter
+    return ContextualCompressionRetriever(base_compressor=LLMChainFilter.from_llm(llm), base_retriever=retriever)
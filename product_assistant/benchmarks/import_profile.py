@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Entry points and their cold-start guards. Budgets are wall-clock seconds with headroom for
+# slower machines; the forbidden lists are the real regression check, since any of these
+# modules showing up means a heavy dependency has leaked back onto the import path.
+ENTRY_POINTS: Dict[str, Dict] = {
+    "router": {
+        "modules": ["product_assistant.router.main"],
+        "budget_s": 3.0,
+        "forbidden": ["ragas", "langchain_astradb", "langchain_openai", "langchain_groq",
+                      "langchain_mcp_adapters", "langchain_community", "pandas"],
+    },
+    "mcp_server": {
+        "modules": ["product_assistant.mcp_servers.product_search_server"],
+        "budget_s": 2.0,
+        "forbidden": ["ragas", "langchain_astradb", "langchain_openai", "langchain_groq",
+                      "langchain_community", "pandas"],
+    },
+    "scraper_ui": {
+        # scrapper_ui.py is a Streamlit script; profile what it imports from the package.
+        "modules": ["product_assistant.etl.data_scrapper", "product_assistant.etl.data_ingestion",
+                    "product_assistant.etl.streaming_pipeline"],
+        "budget_s": 2.5,
+        "forbidden": ["ragas", "langchain_astradb", "langchain_openai", "langchain_groq", "pandas"],
+    },
+}
+
+_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+print(json.dumps({{"wall_s": time.perf_counter() - started, "modules": sorted(sys.modules)}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of `-X importtime` output: self/cumulative microseconds, module and nesting depth."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def profile_entry(name: str, spec: Dict, top: int = 10) -> Dict:
+    """Import the entry point's modules in a fresh interpreter and check them against its guards."""
+    env = {**os.environ, "PYTHONPATH": PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(modules=spec["modules"])],
+        capture_output=True, text=True, env=env, cwd=PROJECT_ROOT,
+    )
+    if proc.returncode != 0:
+        return {"entry": name, "ok": False, "error": proc.stderr.strip().splitlines()[-1:]}
+
+    probe = json.loads(proc.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    # Each root package is charged where it is first imported; list the slowest third-party ones.
+    roots = [r for r in rows if "." not in r["module"] and r["module"] != "product_assistant"]
+    heaviest = sorted(roots, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+    loaded_forbidden = sorted({m.split(".")[0] for m in probe["modules"]} & set(spec["forbidden"]))
+    over_budget = probe["wall_s"] > spec["budget_s"]
+    return {
+        "entry": name,
+        "ok": not loaded_forbidden and not over_budget,
+        "wall_s": round(probe["wall_s"], 3),
+        "budget_s": spec["budget_s"],
+        "modules_loaded": len(probe["modules"]),
+        "forbidden_loaded": loaded_forbidden,
+        "heaviest": [{"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1)} for r in heaviest],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Profile cold-start import time of the app entry points.")
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), nargs="+", default=sorted(ENTRY_POINTS))
+    parser.add_argument("--top", type=int, default=10, help="Heaviest top-level imports to list.")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget (slow CI machines).")
+    parser.add_argument("--json", help="Write the full report here.")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for name in args.entry:
+        spec = {**ENTRY_POINTS[name], "budget_s": ENTRY_POINTS[name]["budget_s"] * args.budget_scale}
+        report = profile_entry(name, spec, args.top)
+        reports.append(report)
+        if "error" in report:
+            print(f"[FAIL] {name}: import failed: {report['error']}")
+            continue
+        status = "ok" if report["ok"] else "FAIL"
+        print(f"[{status:4s}] {name:<11s} {report['wall_s']:.2f}s (budget {report['budget_s']:.1f}s), "
+              f"{report['modules_loaded']} modules")
+        if report["forbidden_loaded"]:
+            print(f"       heavy modules on the import path: {', '.join(report['forbidden_loaded'])}")
+        for row in report["heaviest"]:
+            print(f"       {row['cumulative_ms']:>8.1f} ms  {row['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=2)
+    return 0 if all(r["ok"] for r in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
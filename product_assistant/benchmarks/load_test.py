@@ -0,0 +1,203 @@
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from collections import defaultdict
+from typing import Dict, List, Optional
+from langchain_core.messages import HumanMessage
+from product_assistant.benchmarks.fakes import (FakeChatModel, LatencyFakeEmbeddings, build_fake_retriever,
+                                                synthetic_catalog)
+from product_assistant.utils.llm_cascade import CascadingLLM
+from product_assistant.workflow.agentic_rag_workflow import AgenticRAG
+
+DEFAULT_QUERIES = [
+    "What is the price of iPhone 15?",
+    "Show product reviews for Pixel 8",
+    "Which product has the best battery review?",
+    "Hello there!",
+    "Compare the price of Galaxy S24 and OnePlus 12",
+    "Tell me a fun fact",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(latencies_s: List[float]) -> Dict:
+    ms = [v * 1000 for v in latencies_s]
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 2),
+        "p95_ms": round(percentile(ms, 95), 2),
+        "p99_ms": round(percentile(ms, 99), 2),
+        "max_ms": round(max(ms), 2) if ms else 0.0,
+    }
+
+
+def build_fake_agent(llm_latency_s: float = 0.05, embed_latency_s: float = 0.01, failure_rate: float = 0.0,
+                     jitter_s: float = 0.0, n_products: int = 200, top_k: int = 10, compress: bool = True,
+                     tiered: bool = False, small_latency_s: float = 0.01, rewrite_rate: float = 0.0,
+                     seed: int = 0) -> AgenticRAG:
+    """
+    AgenticRAG wired to offline stand-ins; nothing touches the network.
+    With `tiered`, mirrors the default node_models: a small fast model filters, grades and
+    rewrites, the assistant cascades small -> large, and only the generator uses the large model.
+    `rewrite_rate` of grader calls answer "rewriter", so those queries take the rewrite loop.
+    """
+    llm = FakeChatModel(latency_s=llm_latency_s, jitter_s=jitter_s, failure_rate=failure_rate, seed=seed,
+                        rewrite_rate=rewrite_rate, name_suffix="large")
+    embeddings = LatencyFakeEmbeddings(size=256, latency_s=embed_latency_s)
+    # Hash-based vectors carry no meaning, so decisions mostly fall back to keywords; the
+    # embedding round-trip and centroid lookup are still paid like in production.
+    from product_assistant.workflow.intent_router import IntentRouter
+    intent_router = IntentRouter(embeddings, catalog_titles=[d.metadata["product_title"]
+                                                             for d in synthetic_catalog(n_products, seed)])
+    if not tiered:
+        retriever = build_fake_retriever(embeddings, n_products=n_products, k=top_k,
+                                         llm=llm if compress else None, seed=seed)
+        return AgenticRAG(llm=llm, retriever=retriever, intent_router=intent_router)
+
+    small = FakeChatModel(latency_s=small_latency_s, failure_rate=failure_rate, seed=seed + 1,
+                          rewrite_rate=rewrite_rate, name_suffix="small")
+    retriever = build_fake_retriever(embeddings, n_products=n_products, k=top_k,
+                                     llm=small if compress else None, seed=seed)
+    node_llms = {"assistant": CascadingLLM(small=small, large=llm), "grader": small, "rewriter": small,
+                 "generator": llm}
+    return AgenticRAG(retriever=retriever, node_llms=node_llms, intent_router=intent_router)
+
+
+async def _drive(call, queries: List[str], total: int, concurrency: int) -> Dict:
+    """Run `total` calls with at most `concurrency` in flight; returns latencies and errors."""
+    latencies, errors = [], defaultdict(int)
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await call(queries[i % len(queries)])
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors[type(e).__name__] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "errors": dict(errors),
+        "latency": latency_summary(latencies),
+    }
+
+
+async def benchmark_agent(agent: AgenticRAG, queries: List[str], total: int, concurrency: int) -> Dict:
+    """
+    Drive AgenticRAG's compiled graph directly. Each run streams node updates so the gap
+    between consecutive updates gives the per-node cost (the graph executes nodes sequentially).
+    """
+    node_times = defaultdict(list)
+    agent.usage.reset()
+
+    async def call(query: str):
+        config = {"callbacks": [agent.usage]}
+        last = time.perf_counter()
+        async for update in agent.oneshot_app.astream({"messages": [HumanMessage(content=query)]},
+                                              config=config, stream_mode="updates"):
+            now = time.perf_counter()
+            for node in update:
+                node_times[node].append(now - last)
+            last = now
+
+    report = await _drive(call, queries, total, concurrency)
+    report["nodes"] = {node: latency_summary(times) for node, times in sorted(node_times.items())}
+    report["llm_usage"] = agent.usage.report()
+    return report
+
+
+async def benchmark_http(agent: AgenticRAG, queries: List[str], total: int, concurrency: int) -> Dict:
+    """Drive POST /get through the FastAPI app in-process (ASGI transport, no sockets)."""
+    import httpx
+    from product_assistant.router.main import app
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per request otherwise
+    app.state.rag_agent = agent  # what the lifespan would have built
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                     timeout=None) as client:
+            async def call(query: str):
+                response = await client.post("/get", data={"msg": query})
+                response.raise_for_status()
+
+            return await _drive(call, queries, total, concurrency)
+    finally:
+        app.state.rag_agent = None
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline load/latency benchmark for the RAG workflow and /get endpoint.")
+    parser.add_argument("--target", choices=["agent", "http", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--llm-latency-ms", type=float, default=50)
+    parser.add_argument("--embed-latency-ms", type=float, default=10)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--no-compress", action="store_true", help="Skip the LLMChainFilter stage.")
+    parser.add_argument("--tiered", action="store_true", help="Small model for filter/grader/rewriter, cascade for the assistant.")
+    parser.add_argument("--small-latency-ms", type=float, default=10)
+    parser.add_argument("--rewrite-rate", type=float, default=0.2, help="Share of grader calls answering 'rewriter'.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--queries", help="Optional text file with one query per line.")
+    parser.add_argument("--json", help="Write the full report here.")
+    args = parser.parse_args(argv)
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    agent = build_fake_agent(llm_latency_s=args.llm_latency_ms / 1000, embed_latency_s=args.embed_latency_ms / 1000,
+                             failure_rate=args.failure_rate, jitter_s=args.jitter_ms / 1000,
+                             top_k=args.top_k, compress=not args.no_compress, tiered=args.tiered,
+                             small_latency_s=args.small_latency_ms / 1000, rewrite_rate=args.rewrite_rate,
+                             seed=args.seed)
+    targets = ["agent", "http"] if args.target == "both" else [args.target]
+    runners = {"agent": benchmark_agent, "http": benchmark_http}
+
+    results = []
+    for target in targets:
+        for concurrency in args.concurrency:
+            report = asyncio.run(runners[target](agent, queries, args.requests, concurrency))
+            report["target"] = target
+            results.append(report)
+            lat = report["latency"]
+            print(f"[{target:5s}] c={concurrency:<3d} {report['throughput_rps']:>8.2f} req/s  "
+                  f"p50={lat['p50_ms']:.1f}ms p95={lat['p95_ms']:.1f}ms p99={lat['p99_ms']:.1f}ms  "
+                  f"errors={sum(report['errors'].values())}")
+            for node, stats in report.get("nodes", {}).items():
+                print(f"          {node:<10s} n={stats['count']:<5d} mean={stats['mean_ms']:.1f}ms "
+                      f"p95={stats['p95_ms']:.1f}ms")
+            for row in report.get("llm_usage", []):
+                print(f"          llm {row['node']:<10s} {row['model']:<26s} calls={row['calls']:<5d} "
+                      f"tokens={row['input_tokens']}/{row['output_tokens']} mean={row['mean_latency_ms']:.1f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from typing import List, Optional
+
+# Each mode runs in its own interpreter (logging/structlog configuration is process-global)
+# with stderr discarded. --sink-latency-us adds a blocking delay to every handler write to
+# stand in for a slow terminal, container log pipe or network filesystem.
+
+
+def _slow_sinks(latency_s: float):
+    if latency_s <= 0:
+        return
+    original_emit = logging.StreamHandler.emit
+
+    def emit(self, record):
+        time.sleep(latency_s)  # releases the GIL like real blocking I/O
+        original_emit(self, record)
+
+    logging.StreamHandler.emit = emit  # FileHandler / RotatingFileHandler inherit it
+
+
+def _configure_sync(log_dir: str):
+    """The previous setup: handlers write synchronously on the caller's thread."""
+    import structlog
+    file_handler = logging.FileHandler(os.path.join(log_dir, "sync.log"))
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[console_handler, file_handler])
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
+            structlog.processors.add_log_level,
+            structlog.processors.EventRenamer(to="event"),
+            structlog.processors.JSONRenderer(),
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+    return structlog.get_logger("bench")
+
+
+def _configure_queued(log_dir: str, sample_rate: float):
+    from product_assistant.logger.custom_logger import CustomLogger
+    return CustomLogger(log_dir=log_dir, debug_sample_rate=sample_rate).get_logger("bench")
+
+
+async def _run(log, requests: int, concurrency: int, events: int, debug_events: int) -> dict:
+    per_request: List[float] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            spent = 0.0
+            for j in range(events):
+                started = time.perf_counter()
+                log.info("Handled step", request_id=i, step=j, query="price of iphone 15", latency_ms=12.5)
+                spent += time.perf_counter() - started
+            for j in range(debug_events):
+                started = time.perf_counter()
+                log.debug("Retriever candidate", request_id=i, rank=j, score=0.73)
+                spent += time.perf_counter() - started
+            per_request.append(spent)
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(per_request)
+    us = lambda v: round(v * 1e6, 1)  # noqa: E731
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 3),
+        "mean_us_per_request": us(sum(ordered) / len(ordered)),
+        "p50_us_per_request": us(ordered[len(ordered) // 2]),
+        "p99_us_per_request": us(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]),
+    }
+
+
+def _child(args):
+    log_dir = tempfile.mkdtemp(prefix="logbench-")
+    _slow_sinks(args.sink_latency_us / 1e6)
+    if args.mode == "sync":
+        log = _configure_sync(log_dir)
+        # the old setup runs at INFO; debug events are filtered by level there too
+    else:
+        os.environ["LOG_LEVEL"] = "DEBUG" if args.debug_events and args.mode == "queued-debug" else "INFO"
+        log = _configure_queued(log_dir, args.sample_rate)
+    report = asyncio.run(_run(log, args.requests, args.concurrency, args.events, args.debug_events))
+    flush_started = time.perf_counter()
+    if args.mode != "sync":
+        from product_assistant.logger.custom_logger import CustomLogger
+        CustomLogger.shutdown()
+        report["dropped"] = CustomLogger.dropped_records()
+    report["flush_s"] = round(time.perf_counter() - flush_started, 3)
+    report["mode"] = args.mode
+    print(json.dumps(report))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Per-request logging overhead: synchronous vs queued handlers.")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--events", type=int, default=10, help="INFO events per request.")
+    parser.add_argument("--debug-events", type=int, default=20, help="DEBUG events per request.")
+    parser.add_argument("--sample-rate", type=float, default=0.05, help="Debug sampling rate for queued-debug.")
+    parser.add_argument("--sink-latency-us", type=float, default=0, help="Blocking delay per handler write.")
+    parser.add_argument("--mode", choices=["sync", "queued", "queued-debug"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        _child(args)
+        return 0
+
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = {**os.environ, "PYTHONPATH": project_root + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    for mode in ("sync", "queued", "queued-debug"):
+        cmd = [sys.executable, "-m", "product_assistant.benchmarks.logging_benchmark", "--mode", mode,
+               "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+               "--events", str(args.events), "--debug-events", str(args.debug_events),
+               "--sample-rate", str(args.sample_rate), "--sink-latency-us", str(args.sink_latency_us)]
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env)
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"[{mode:12s}] mean={report['mean_us_per_request']:>8.1f}us/request "
+              f"p99={report['p99_us_per_request']:>8.1f}us  total={report['elapsed_s']:.2f}s "
+              f"flush={report['flush_s']:.2f}s dropped={report.get('dropped', 0)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import sys
+import json
+import asyncio
+import argparse
+from typing import List, Optional
+from langchain_core.messages import HumanMessage
+from product_assistant.benchmarks.fakes import FakeChatModel
+from product_assistant.benchmarks.load_test import _drive
+from product_assistant.utils.llm_router import LLMRouter
+
+
+def fake_providers(args) -> dict:
+    """A primary with a latency tail and occasional errors, and a steadier but slower secondary."""
+    return {
+        "primary": FakeChatModel(latency_s=args.primary_ms / 1000, jitter_s=args.primary_ms / 4000,
+                                 stall_rate=args.stall_rate, stall_s=args.stall_ms / 1000,
+                                 failure_rate=args.failure_rate, seed=args.seed, name_suffix="primary"),
+        "secondary": FakeChatModel(latency_s=args.secondary_ms / 1000, jitter_s=args.secondary_ms / 4000,
+                                   seed=args.seed + 1, name_suffix="secondary"),
+    }
+
+
+async def run_scenario(name: str, llm, total: int, concurrency: int) -> dict:
+    async def call(query: str):
+        await llm.ainvoke([HumanMessage(content=query)])
+
+    report = await _drive(call, [f"question {i}" for i in range(50)], total, concurrency)
+    report["scenario"] = name
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare a single LLM provider with the hedging LLMRouter on fakes.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--primary-ms", type=float, default=80)
+    parser.add_argument("--secondary-ms", type=float, default=150)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    parser.add_argument("--stall-ms", type=float, default=2000)
+    parser.add_argument("--failure-rate", type=float, default=0.03)
+    parser.add_argument("--hedge-percentile", type=float, default=90)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the full report here.")
+    args = parser.parse_args(argv)
+
+    single = fake_providers(args)["primary"]
+    router = LLMRouter(providers=fake_providers(args), hedge_percentile=args.hedge_percentile,
+                       hedge_min_delay_s=0.05, hedge_default_delay_s=0.5, min_samples=10)
+
+    results = []
+    for name, llm in (("single-provider", single), ("router", router)):
+        report = asyncio.run(run_scenario(name, llm, args.requests, args.concurrency))
+        if name == "router":
+            report["providers"] = router.stats()
+        results.append(report)
+        lat = report["latency"]
+        print(f"[{name:15s}] {report['throughput_rps']:>8.2f} req/s  p50={lat['p50_ms']:.1f}ms "
+              f"p95={lat['p95_ms']:.1f}ms p99={lat['p99_ms']:.1f}ms  errors={sum(report['errors'].values())}")
+    print("router providers:", json.dumps(results[-1]["providers"]))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
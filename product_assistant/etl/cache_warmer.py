@@ -0,0 +1,134 @@
+import os
+import json
+import time
+from typing import Dict, List, Optional
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.query_log import top_queries
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+
+def _path(relative: str) -> str:
+    return os.path.join(os.getcwd(), relative)  # absolute paths are kept as they are
+
+
+def warm_cache_path(config: Optional[Dict] = None) -> str:
+    """Where CacheWarmer.warm() writes its output (`cache_warmer.output_path`)."""
+    config = load_config() if config is None else config
+    return _path(config.get("cache_warmer", {}).get("output_path", "data/warm_cache.json"))
+
+
+def load_warm_cache(path: Optional[str] = None, ttl_s: Optional[float] = None) -> List[Dict]:
+    """
+    Entries written by the last CacheWarmer.warm() run ([] when missing or unreadable).
+    With `ttl_s`, entries live until `built_at + ttl_s`: [] once that has passed, otherwise
+    each entry carries its remaining lifetime as "ttl_s" (so restarts don't extend it).
+    """
+    path = path or warm_cache_path()
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable warm cache", path=path, error=str(e))
+        return []
+    entries = payload.get("entries", [])
+    if ttl_s is None:
+        return entries
+    remaining = (payload.get("built_at") or 0) + ttl_s - time.time()
+    if remaining <= 0:
+        log.info("Ignoring expired warm cache", path=path, built_at=payload.get("built_at"))
+        return []
+    return [{**entry, "ttl_s": remaining} for entry in entries]
+
+
+def invalidate_warm_cache(path: Optional[str] = None) -> bool:
+    """Delete the warm cache, e.g. after re-ingestion: its answers describe the previous catalog."""
+    path = path or warm_cache_path()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    log.info("Warm cache invalidated", path=path)
+    return True
+
+
+class CacheWarmer:
+    """
+    Precomputes the head of the query distribution after each ingestion run.
+
+    Mines the /get query log for the most frequent normalized questions, then for each one
+    embeds it (one batched call), classifies it, retrieves its documents and runs the full
+    workflow for its answer. The result is written atomically to `cache_warmer.output_path`,
+    which the router loads into its answer cache and the agent's retrieval and query-embedding
+    caches. Entries expire `cache_warmer.answer_ttl_s` after this run, and a new ingestion run
+    deletes the file.
+    """
+
+    def __init__(self, agent=None):
+        self.config = load_config()
+        warm_cfg = self.config.get("cache_warmer", {})
+        log_cfg = self.config.get("query_log", {})
+        self.query_log_path = _path(log_cfg.get("path", "data/query_log.jsonl"))
+        self.backup_count = log_cfg.get("backup_count", 3)
+        self.output_path = warm_cache_path(self.config)
+        self.top_n = warm_cfg.get("top_n", 100)
+        self.min_count = warm_cfg.get("min_count", 3)
+        self.since_days = warm_cfg.get("since_days", 30)
+        self._agent = agent
+
+    @property
+    def agent(self):
+        if self._agent is None:
+            from product_assistant.workflow.agentic_rag_workflow import AgenticRAG
+            self._agent = AgenticRAG()
+        return self._agent
+
+    def mine(self) -> List[Dict]:
+        return top_queries(self.query_log_path, top_n=self.top_n, min_count=self.min_count,
+                           since_days=self.since_days, backup_count=self.backup_count)
+
+    def _embed(self, texts: List[str]):
+        router = self.agent.get_intent_router()
+        if router is not None:
+            return router, router.embeddings.embed_documents(texts)
+        from product_assistant.utils.model_loader import ModelLoader
+        return None, ModelLoader().load_embeddings().embed_documents(texts)
+
+    def warm(self) -> Dict:
+        """Build the warm cache from the query log; returns a summary."""
+        from product_assistant.workflow.intent_router import keyword_intent
+
+        started = time.perf_counter()
+        queries = self.mine()
+        entries, failed = [], 0
+        if queries:
+            router, vectors = self._embed([q["query"] for q in queries])
+            for query, vector in zip(queries, vectors):
+                entry = {**query, "embedding": [round(float(x), 6) for x in vector]}
+                entry["intent"] = router.decide(query["query"], vector).intent if router else keyword_intent(query["query"])
+                try:
+                    if router is not None:
+                        router.prime(query["query"], vector)
+                    if entry["intent"] == "product":
+                        docs = self.agent.load_retriever().invoke(query["query"])
+                        entry["documents"] = [{"page_content": d.page_content, "metadata": d.metadata} for d in docs]
+                        self.agent.retrieval_cache.set(query["normalized"], docs)
+                    entry["answer"] = self.agent.run(query["query"], thread_id=None)
+                except Exception as e:
+                    failed += 1
+                    log.warning("Cache warm-up failed for query", query=query["query"], error=str(e))
+                    continue
+                entries.append(entry)
+
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        tmp_path = f"{self.output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"built_at": time.time(), "source": self.query_log_path, "entries": entries}, f,
+                      ensure_ascii=False)
+        os.replace(tmp_path, self.output_path)
+
+        summary = {"candidates": len(queries), "warmed": len(entries), "failed": failed,
+                   "output_path": self.output_path, "duration_s": round(time.perf_counter() - started, 2)}
+        log.info("Cache warm-up finished", **summary)
+        return summary
@@ -1,34 +1,73 @@
 import os
-import pandas as pd
-from dotenv import load_dotenv
-from typing import List
+import sys
+import uuid
+from typing import Callable, List, Optional
 from langchain_core.documents import Document
-from langchain_astradb import AstraDBVectorStore
-from product_assistant.utils.model_loader import ModelLoader
+from product_assistant.utils.model_loader import ModelLoader, load_env
 from product_assistant.utils.config_loader import load_config
-from logger import GLOBAL_LOGGER as log
+from product_assistant.etl.ingestion_journal import IngestionJournal
+from product_assistant.etl.embedding_snapshot import EmbeddingSnapshot
+from product_assistant.etl.cache_warmer import invalidate_warm_cache, warm_cache_path
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.exception.custom_exception import ProductAssistantException
+
+
+def _astra_vector_store(embedding_dimension: Optional[int] = None, **kwargs):
+    """
+    AstraDBVectorStore, optionally with a known embedding dimension.
+    langchain-astradb 0.6 has no embedding_dimension argument and probes it with embed_query,
+    which embeddings that only serve known texts (SnapshotEmbeddings) cannot answer. The probe
+    lives in the private _prepare_embedding_dimension hook; the version is pinned in
+    requirements.txt and test_embedding_snapshot fails if the hook goes away.
+    """
+    from langchain_astradb import AstraDBVectorStore  # heavy; only needed when talking to Astra
+    from langchain_astradb.utils.astradb import SetupMode
+
+    if embedding_dimension is None:
+        return AstraDBVectorStore(**kwargs)
+    if not callable(getattr(AstraDBVectorStore, "_prepare_embedding_dimension", None)):
+        raise ProductAssistantException(
+            "This langchain-astradb version has no _prepare_embedding_dimension hook; "
+            "cannot create a store with a fixed embedding dimension", sys
+        )
+
+    class _KnownDimensionVectorStore(AstraDBVectorStore):
+        def _prepare_embedding_dimension(self, setup_mode):
+            self.embedding_dimension = embedding_dimension
+            if setup_mode == SetupMode.ASYNC:
+                async def _dimension() -> int:
+                    return embedding_dimension
+                return _dimension()
+            return embedding_dimension
+
+    return _KnownDimensionVectorStore(**kwargs)
+
 
 class DataIngestion:
     """
     Class to handle data transformation and ingestion into AstraDB vector store.
     """
 
-    def __init__(self):
+    def __init__(self, require_csv: bool = True):
         """
         Initialize environment variables, embedding model, and set CSV file path.
+        Snapshot export/import does not need the CSV and passes require_csv=False.
         """
         log.info("Initializing DataIngestion pipeline...")
         self.model_loader=ModelLoader()
         self._load_env_variables()
-        self.csv_path = self._get_csv_path()
-        self.product_data = self._load_csv()
+        self.csv_path = self._get_csv_path() if require_csv else None
+        self.product_data = self._load_csv() if require_csv else None
         self.config=load_config()
+        ingestion_cfg = self.config.get("ingestion", {})
+        self.batch_size = int(ingestion_cfg.get("batch_size", 20))
+        self.journal_dir = os.path.join(os.getcwd(), ingestion_cfg.get("journal_dir", os.path.join("data", "ingestion_runs")))
 
     def _load_env_variables(self):
         '''
         Load environment variables from .env file.
         '''
-        load_dotenv()
+        load_env()
         required_vars = [
             'GROQ_API_KEY', 'OPENAI_API_KEY', 
             'ASTRA_DB_API_ENDPOINT', 'ASTRA_DB_APPLICATION_TOKEN', 'ASTRA_DB_KEYSPACE'
@@ -64,6 +103,7 @@ class DataIngestion:
         """
         Load product data from CSV.
         """
+        import pandas as pd
         df = pd.read_csv(self.csv_path)
         expected_columns = {'product_id','product_title', 'rating', 'total_reviews','price', 'top_reviews'}
 
@@ -90,44 +130,118 @@ class DataIngestion:
                 }
             product_list.append(product_entry)
 
-        documents = []
-        for entry in product_list:
-            metadata = {
-                    "product_id": entry["product_id"],
-                    "product_title": entry["product_title"],
-                    "rating": entry["rating"],
-                    "total_reviews": entry["total_reviews"],
-                    "price": entry["price"]
-            }
-            doc = Document(page_content=entry["top_reviews"], metadata=metadata)
-            documents.append(doc)
+        documents = [self.to_document(entry) for entry in product_list]
 
         log.info(f"Transformed {len(documents)} documents.")
         return documents
 
-    def store_in_vector_db(self, documents: List[Document]):
+    @staticmethod
+    def to_document(entry: dict) -> Document:
+        """
+        Build the LangChain Document for one product entry (reviews as content, the rest as metadata).
+        """
+        metadata = {
+                "product_id": entry["product_id"],
+                "product_title": entry["product_title"],
+                "rating": entry["rating"],
+                "total_reviews": entry["total_reviews"],
+                "price": entry["price"]
+        }
+        return Document(page_content=entry["top_reviews"], metadata=metadata)
+
+    @staticmethod
+    def document_id(doc: Document) -> str:
+        """
+        Deterministic document id, so re-inserting a batch overwrites instead of duplicating.
+        """
+        key = f"{doc.metadata.get('product_id')}|{doc.metadata.get('product_title')}"
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+    def get_vector_store(self, embedding=None, collection_name: Optional[str] = None,
+                          embedding_dimension: Optional[int] = None):
         """
-        Store documents into AstraDB vector store.
+        Build the AstraDB vector store for the configured (or given) collection.
+        Pass embedding_dimension when the embedding cannot embed arbitrary text (e.g. a snapshot).
         """
-        collection_name=self.config["astra_db"]["collection_name"]
-        vstore = AstraDBVectorStore(
-            embedding= self.model_loader.load_embeddings(),
+        collection_name=collection_name or self.config["astra_db"]["collection_name"]
+        return _astra_vector_store(
+            embedding= embedding or self.model_loader.load_embeddings(),
             collection_name=collection_name,
             api_endpoint=self.astra_db_api_endpoint,
             token=self.astra_db_application_token,
             namespace=self.astra_db_keyspace,
+            embedding_dimension=embedding_dimension,
         )
 
-        inserted_ids = vstore.add_documents(documents)
+    def get_journal(self) -> IngestionJournal:
+        """
+        Return the journal for the current CSV, collection and batch size.
+        """
+        if self.csv_path is None:
+            raise ValueError("DataIngestion was created without a CSV; no CSV ingestion journal available")
+        run_id = IngestionJournal.make_run_id(
+            IngestionJournal.fingerprint_file(self.csv_path),
+            self.config["astra_db"]["collection_name"],
+            self.batch_size,
+        )
+        return IngestionJournal(self.journal_dir, run_id)
+
+    def store_in_vector_db(self, documents: List[Document], journal: Optional[IngestionJournal] = None,
+                           start_offset: int = 0, progress_callback: Optional[Callable[[int, int], None]] = None,
+                           vstore=None):
+        """
+        Store documents into AstraDB (or the given) vector store in batches.
+        Each batch is committed to the journal (if given) only after the store acknowledges it.
+        """
+        vstore = vstore or self.get_vector_store()
+        ids = [doc.id or self.document_id(doc) for doc in documents]
+        total = len(documents)
+
+        inserted_ids = []
+        for start in range(start_offset, total, self.batch_size):
+            end = min(start + self.batch_size, total)
+            batch_ids = vstore.add_documents(documents[start:end], ids=ids[start:end])
+            inserted_ids.extend(batch_ids)
+            if journal is not None:
+                journal.record_batch(start // self.batch_size, start, end, batch_ids)
+            log.info("Committed ingestion batch", start=start, end=end, total=total)
+            if progress_callback:
+                progress_callback(end, total)
+
         log.info(f"Successfully inserted {len(inserted_ids)} documents into AstraDB.")
         return vstore, inserted_ids
 
-    def run_pipeline(self):
+    def run_pipeline(self, resume: bool = True, progress_callback: Optional[Callable[[int, int], None]] = None):
         """
         Run the full data ingestion pipeline: transform data and store into vector DB.
+        With resume=True an interrupted run for the same CSV continues from its last committed batch;
+        with resume=False any existing checkpoint is discarded and the run starts from zero.
         """
         documents = self.transform_data()
-        vstore, _ = self.store_in_vector_db(documents)
+        journal = self.get_journal()
+        if not resume:
+            journal.reset()
+
+        state = journal.state()
+        if state and state["status"] == IngestionJournal.STATUS_COMPLETED:
+            log.info("Ingestion run already completed, nothing to do", run_id=journal.run_id)
+            return self.get_vector_store()
+        if state and state["status"] == IngestionJournal.STATUS_ABORTED:
+            log.info("Previous ingestion run was aborted, starting over", run_id=journal.run_id)
+            journal.reset()
+            state = None
+
+        start_offset = state["next_offset"] if state else 0
+        if start_offset:
+            log.info("Resuming ingestion run", run_id=journal.run_id, next_offset=start_offset, total=len(documents))
+        journal.start(len(documents), self.batch_size, csv_path=self.csv_path,
+                      collection_name=self.config["astra_db"]["collection_name"])
+
+        vstore, _ = self.store_in_vector_db(documents, journal=journal, start_offset=start_offset,
+                                            progress_callback=progress_callback)
+        journal.complete()
+        # Warmed answers and retrievals describe the previous catalog; the router stops serving them.
+        invalidate_warm_cache(warm_cache_path(self.config))
 
         #Optionally do a quick search
         query = "Can you tell me the low budget iphone?"
@@ -137,6 +251,85 @@ class DataIngestion:
         for res in results:
             log.info(f"Content: {res.page_content}\nMetadata: {res.metadata}\n")
 
+        # Off by default: warming runs the full workflow for every popular question; see `ingestion_cli warm`.
+        if self.config.get("cache_warmer", {}).get("run_after_ingestion", False):
+            self.warm_caches()
+        return vstore
+
+    def warm_caches(self):
+        """Precompute answers for popular logged questions against the fresh catalog (never fails the run)."""
+        try:
+            from product_assistant.etl.cache_warmer import CacheWarmer
+            return CacheWarmer().warm()
+        except Exception as e:
+            log.warning("Cache warm-up failed; ingestion result is unaffected", error=str(e))
+            return None
+
+    def export_snapshot(self, path: str, dtype: str = "float32", collection_name: Optional[str] = None,
+                        limit: int = 1_000_000) -> EmbeddingSnapshot:
+        """
+        Export (id, text hash, vector, metadata) of every document in the collection to a snapshot.
+        Vectors are read back from AstraDB, so no embedding calls are made.
+        """
+        vstore = self.get_vector_store(collection_name=collection_name)
+        ids, documents, vectors = [], [], []
+        for result in vstore.run_query(n=limit, include_embeddings=True):
+            if result.embedding is None:
+                continue
+            ids.append(result.id)
+            documents.append(result.document)
+            vectors.append(result.embedding)
+
+        log.info("Exporting embedding snapshot", collection=collection_name or self.config["astra_db"]["collection_name"],
+                 count=len(ids))
+        return EmbeddingSnapshot.write(path, ids, documents, vectors, dtype=dtype,
+                                       embedding_model=self.config["embedding_model"]["model_name"])
+
+    def import_snapshot(self, path: str, collection_name: Optional[str] = None, vstore=None, resume: bool = True,
+                        progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        Bulk-load a snapshot into the configured collection (or any LangChain vector store passed as vstore)
+        without calling the embeddings API. Checkpointed through the same journal as run_pipeline.
+        Returns the store written to; for an empty snapshot nothing is written and the given
+        vstore (None by default) is returned as is.
+        """
+        snapshot = EmbeddingSnapshot.load(path)
+        expected_model = self.config["embedding_model"]["model_name"]
+        if snapshot.manifest.get("embedding_model") not in ("", None, expected_model):
+            raise ValueError(
+                f"Snapshot was embedded with '{snapshot.manifest['embedding_model']}' "
+                f"but the configured model is '{expected_model}'"
+            )
+
+        target = collection_name or self.config["astra_db"]["collection_name"]
+        if not snapshot.entries:
+            log.info("Snapshot is empty, nothing to import", path=path)
+            return vstore
+        if vstore is None:
+            vstore = self.get_vector_store(embedding=snapshot.embeddings(), collection_name=target,
+                                            embedding_dimension=snapshot.manifest["dim"])
+
+        journal = IngestionJournal(
+            self.journal_dir, IngestionJournal.make_run_id(snapshot.fingerprint(), target, self.batch_size)
+        )
+        if not resume:
+            journal.reset()
+        state = journal.state()
+        if state and state["status"] == IngestionJournal.STATUS_COMPLETED:
+            log.info("Snapshot import already completed, nothing to do", run_id=journal.run_id)
+            return vstore
+        if state and state["status"] == IngestionJournal.STATUS_ABORTED:
+            journal.reset()
+            state = None
+
+        documents = snapshot.documents()
+        journal.start(len(documents), self.batch_size, snapshot_path=path, collection_name=target)
+        self.store_in_vector_db(documents, journal=journal, start_offset=state["next_offset"] if state else 0,
+                                progress_callback=progress_callback, vstore=vstore)
+        journal.complete()
+        log.info("Snapshot imported", path=path, collection=target, count=len(documents))
+        return vstore
+
 # Run if this file is executed directly
 if __name__ == "__main__":
     ingestion = DataIngestion()
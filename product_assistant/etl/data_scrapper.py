@@ -1,101 +1,181 @@
 import csv
-import time
-import re
 import os
-from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
+from product_assistant.etl.driver_pool import ChromeDriverPool
+from product_assistant.etl.http_fetcher import HttpFetcher
+from product_assistant.etl.page_parser import REVIEW_BLOCK_SELECTOR, parse_reviews, parse_search_results
+from product_assistant.etl.page_waits import PageWaiter
+from product_assistant.etl.scrape_cache import ScrapeCache
+from product_assistant.utils.config_loader import load_config
+
+PRODUCT_COLUMNS = ["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"]
 
 class FlipkartScrapper:
-    def __init__(self, output_dir="data"):
+    def __init__(self, output_dir="data", pool_size=None, max_pages_per_driver=None):
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        scraper_cfg = load_config().get("scraper", {})
+        self.pool_size = pool_size or scraper_cfg.get("pool_size", 2)
+        self.max_pages_per_driver = max_pages_per_driver or scraper_cfg.get("max_pages_per_driver", 25)
+        self.waiter = PageWaiter(scraper_cfg.get("waits"))
+        self.http_first = scraper_cfg.get("http_first", True)
+        self.http_cfg = scraper_cfg.get("http", {})
+        # When set, every fetched page is saved here for offline parser benchmarks.
+        self.fixture_dir = scraper_cfg.get("fixture_dir")
+        self._pool = None
+        self._http = None
+        cache_cfg = scraper_cfg.get("cache", {})
+        self.cache = ScrapeCache(
+            cache_cfg.get("path", os.path.join(self.output_dir, "scrape_cache.sqlite")),
+            product_ttl_s=cache_cfg.get("product_ttl_hours", 24) * 3600,
+            query_ttl_s=cache_cfg.get("query_ttl_hours", 6) * 3600,
+        ) if cache_cfg.get("enabled", True) else None
+
+    @property
+    def pool(self) -> ChromeDriverPool:
+        """Driver pool, started lazily and kept warm across products and queries."""
+        if self._pool is None:
+            self._pool = ChromeDriverPool(size=self.pool_size, max_pages_per_driver=self.max_pages_per_driver)
+        return self._pool
+
+    @property
+    def http(self) -> HttpFetcher:
+        """Pooled HTTP client for the server-rendered fast path."""
+        if self._http is None:
+            self._http = HttpFetcher(
+                timeout=self.http_cfg.get("timeout", 8),
+                pool_size=self.http_cfg.get("pool_size", 10),
+            )
+        return self._http
+
+    def close(self):
+        """Quit all pooled browsers and HTTP connections."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def _save_fixture(self, kind, url, html):
+        if not self.fixture_dir:
+            return
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        name = f"{kind}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.html"
+        with open(os.path.join(self.fixture_dir, name), "w", encoding="utf-8") as f:
+            f.write(html)
 
     def get_top_reviews(self,product_url,count=2):
         """Get the top reviews for a product.
+        Tries a plain HTTP fetch first and only falls back to the browser when the
+        server-rendered HTML does not already contain enough reviews.
         """
-        options = uc.ChromeOptions()
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        driver = uc.Chrome(options=options,use_subprocess=True)
-
         if not product_url.startswith("http"):
             return "No reviews found"
 
+        reviews = []
+        if self.http_first:
+            html = self.http.get(product_url)
+            if html:
+                self._save_fixture("product", product_url, html)
+                reviews = parse_reviews(html, count)
+            if len(reviews) >= count:
+                return " || ".join(reviews)
+            print(f"HTTP fast path found {len(reviews)}/{count} reviews, falling back to browser: {product_url}")
+
         try:
-            driver.get(product_url)
-            time.sleep(4)
-            try:
-                driver.find_element(By.XPATH, "//button[contains(text(), '✕')]").click()
-                time.sleep(1)
-            except Exception as e:
-                print(f"Error occurred while closing popup: {e}")
-
-            for _ in range(4):
-                ActionChains(driver).send_keys(Keys.END).perform()
-                time.sleep(1.5)
-
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            review_blocks = soup.select("div._27M-vq, div.col.EPCmJX, div._6K-7Co")
-            seen = set()
-            reviews = []
-
-            for block in review_blocks:
-                text = block.get_text(separator=" ", strip=True)
-                if text and text not in seen:
-                    reviews.append(text)
-                    seen.add(text)
-                if len(reviews) >= count:
-                    break
+            reviews = self.pool.fetch(product_url, lambda driver: self._extract_reviews(driver, count)) or reviews
         except Exception:
-            reviews = []
+            pass
 
-        driver.quit()
         return " || ".join(reviews) if reviews else "No reviews found"
+
+    def _extract_reviews(self, driver, count):
+        """Close the login popup, scroll to load reviews and parse them from the loaded product page."""
+        self.waiter.document_ready(driver)
+        self.waiter.dismiss_popup(driver)
+        # Stop scrolling as soon as enough review blocks are rendered.
+        def count_reviews():
+            return driver.execute_script(f"return document.querySelectorAll('{REVIEW_BLOCK_SELECTOR}').length")
+
+        if self.waiter.scroll_until(driver, count_reviews, count) < count:
+            # Page stopped growing early; give in-flight review requests a chance to land.
+            self.waiter.network_idle(driver, timeout=self.waiter.timeouts["scroll_step"])
+
+        html = driver.page_source
+        self._save_fixture("product", driver.current_url, html)
+        return parse_reviews(html, count)
     
-    def scrape_flipkart_products(self, query, max_products=1, review_count=2):
+    def scrape_flipkart_products(self, query, max_products=1, review_count=2, use_cache=True):
         """Scrape Flipkart products based on a search query.
+        Review pages of the found products are fetched concurrently on the driver pool.
+        With the scrape cache enabled, only stale search listings and products are re-fetched;
+        use_cache=False forces a refresh (results are still written back to the cache).
         """
-        options = uc.ChromeOptions()
-        driver = uc.Chrome(options=options,use_subprocess=True)
-        search_url = f"https://www.flipkart.com/search?q={query.replace(' ', '+')}"
-        driver.get(search_url)
-        time.sleep(4)
-
-        try:
-            driver.find_element(By.XPATH, "//button[contains(text(), '✕')]").click()
-        except Exception as e:
-            print(f"Error occurred while closing popup: {e}")
-
-        time.sleep(2)
-        products = []
-
-        items = driver.find_elements(By.CSS_SELECTOR, "div[data-id]")[:max_products]
-        for item in items:
-            try:
-                title = item.find_element(By.CSS_SELECTOR, "div.KzDlHZ").text.strip()
-                price = item.find_element(By.CSS_SELECTOR, "div.Nx9bqj").text.strip()
-                rating = item.find_element(By.CSS_SELECTOR, "div.XQDdHH").text.strip()
-                reviews_text = item.find_element(By.CSS_SELECTOR, "span.Wphh3N").text.strip()
-                match = re.search(r"\d+(,\d+)?(?=\s+Reviews)", reviews_text)
-                total_reviews = match.group(0) if match else "N/A"
-
-                link_el = item.find_element(By.CSS_SELECTOR, "a[href*='/p/']")
-                href = link_el.get_attribute("href")
-                product_link = href if href.startswith("http") else "https://www.flipkart.com" + href #type: ignore
-                match = re.findall(r"/p/(itm[0-9A-Za-z]+)", href) # type: ignore
-                product_id = match[0] if match else "N/A"
-            except Exception as e:
-                print(f"Error occurred while processing item: {e}")
-                continue
-
-            top_reviews = self.get_top_reviews(product_link, count=review_count) if "flipkart.com" in product_link else "Invalid product URL" # type: ignore
-            products.append([product_id, title, rating, total_reviews, price, top_reviews])
-
-        driver.quit()
+        listings = self._cached_listings(query, max_products, use_cache)
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            products = list(executor.map(lambda l: self._product_row(l, review_count, use_cache), listings))
         return products
+
+    def iter_flipkart_products(self, query, max_products=1, review_count=2, use_cache=True):
+        """Like scrape_flipkart_products, but yields each product row as soon as it is scraped."""
+        listings = self._cached_listings(query, max_products, use_cache)
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            futures = [executor.submit(self._product_row, l, review_count, use_cache) for l in listings]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _cached_listings(self, query, max_products, use_cache):
+        listings = self.cache.get_query(query, max_products) if self.cache is not None and use_cache else None
+        if listings is None:
+            search_url = f"https://www.flipkart.com/search?q={query.replace(' ', '+')}"
+            listings = self._search_listings(search_url, max_products)
+            if self.cache is not None and listings:
+                self.cache.put_query(query, listings, max_products)
+        return listings
+
+    def _product_row(self, listing, review_count, use_cache):
+        """CSV row for one listing, with its top reviews from the cache or a fresh scrape."""
+        product_id = listing["product_id"]
+        cacheable = self.cache is not None and product_id != "N/A"
+        if cacheable and use_cache:
+            cached = self.cache.get_product(product_id, review_count)
+            if cached is not None:
+                return cached
+
+        product_link = listing["product_link"]
+        top_reviews = self.get_top_reviews(product_link, count=review_count) if "flipkart.com" in product_link else "Invalid product URL"
+        row = [product_id, listing["product_title"], listing["rating"],
+               listing["total_reviews"], listing["price"], top_reviews]
+        if cacheable and top_reviews not in ("No reviews found", "Invalid product URL"):
+            self.cache.put_product(product_id, row, review_count)
+        return row
+
+    def _search_listings(self, search_url, max_products):
+        """Product records from the search page, over HTTP when the HTML already has results."""
+        if self.http_first:
+            html = self.http.get(search_url)
+            if html:
+                self._save_fixture("search", search_url, html)
+                listings = parse_search_results(html, max_products)
+                if listings:
+                    return listings
+            print(f"HTTP fast path found no search results, falling back to browser: {search_url}")
+        return self.pool.fetch(search_url, lambda driver: self._extract_listings(driver, max_products))
+
+    def _extract_listings(self, driver, max_products):
+        """Snapshot a loaded search results page once and parse every listing from it."""
+        if self.waiter.element(driver, By.CSS_SELECTOR, "div[data-id]") is None:
+            print(f"No search results rendered for {driver.current_url}")
+            return []
+        self.waiter.dismiss_popup(driver)
+        self.waiter.dom_stable(driver)
+
+        html = driver.page_source
+        self._save_fixture("search", driver.current_url, html)
+        return parse_search_results(html, max_products)
     
     def save_to_csv(self, data, filename="product_reviews.csv"):
         """Save the scraped product reviews to a CSV file."""
@@ -110,6 +190,6 @@ class FlipkartScrapper:
 
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow(["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"])
+            writer.writerow(PRODUCT_COLUMNS)
             writer.writerows(data)
         
\ No newline at end of file
@@ -0,0 +1,191 @@
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, TypeVar
+import undetected_chromedriver as uc
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+T = TypeVar("T")
+
+# Page-level failures that leave the browser session perfectly usable.
+_RECOVERABLE_ERRORS = (
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+
+def _is_crash(error: BaseException) -> bool:
+    return isinstance(error, WebDriverException) and not isinstance(error, _RECOVERABLE_ERRORS)
+
+
+class ChromeDriverPool:
+    """
+    Pool of warm Chrome instances shared across products and search queries.
+
+    At most `size` browsers exist at once; callers block until one is idle. A browser
+    is recycled after `max_pages_per_driver` page loads or as soon as its session
+    fails, so a crashed or bloated browser never serves another page.
+    """
+
+    def __init__(self, size: int = 2, max_pages_per_driver: int = 25):
+        self.size = max(1, size)
+        self.max_pages_per_driver = max(1, max_pages_per_driver)
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        # undetected_chromedriver patches the chromedriver binary on startup; serialize launches.
+        self._launch_lock = threading.Lock()
+        self._live = 0
+        self._pages: Dict[int, int] = {}
+        self._closed = False
+        self.timings: List[Dict] = []
+
+    def _new_driver(self):
+        options = uc.ChromeOptions()
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        started = time.perf_counter()
+        with self._launch_lock:
+            driver = uc.Chrome(options=options, use_subprocess=True)
+        with self._lock:
+            self._pages[id(driver)] = 0
+        log.info("Chrome driver started", seconds=round(time.perf_counter() - started, 3))
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            log.warning("Error quitting Chrome driver", error=str(e))
+        with self._lock:
+            self._live -= 1
+
+    def _page_count(self, driver) -> int:
+        with self._lock:
+            return self._pages.get(id(driver), 0)
+
+    def _count_page(self, driver):
+        with self._lock:
+            self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("ChromeDriverPool is closed")
+                can_launch = self._live < self.size
+                if can_launch:
+                    self._live += 1
+            if can_launch:
+                try:
+                    return self._new_driver()
+                except Exception:
+                    with self._lock:
+                        self._live -= 1
+                    raise
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrow a driver. It is returned to the pool on success, or discarded if it crashed
+        or reached its page budget.
+        """
+        driver = self._acquire()
+        healthy = True
+        try:
+            yield driver
+        except Exception as e:
+            healthy = not _is_crash(e)
+            raise
+        finally:
+            pages = self._page_count(driver)
+            if not healthy or self._closed or pages >= self.max_pages_per_driver:
+                if healthy:
+                    log.info("Recycling Chrome driver", pages=pages)
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+
+    def fetch(self, url: str, handler: Callable[..., T], retries: int = 1) -> T:
+        """
+        Load `url` in a pooled driver and return handler(driver).
+        A crashed driver is replaced and the page retried up to `retries` times.
+        """
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with self.driver() as driver:
+                    self._count_page(driver)
+                    driver.get(url)
+                    result = handler(driver)
+                self._record(url, started, ok=True)
+                return result
+            except Exception as e:
+                self._record(url, started, ok=False)
+                attempt += 1
+                if not _is_crash(e) or attempt > retries:
+                    raise
+                log.warning("Chrome driver crashed, retrying with a fresh one", url=url, error=str(e).splitlines()[0])
+
+    def _record(self, url: str, started: float, ok: bool):
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self.timings.append({"url": url, "seconds": seconds, "ok": ok})
+        log.info("Page fetched", url=url, seconds=round(seconds, 3), ok=ok)
+
+    def timing_summary(self) -> Dict:
+        """
+        Aggregate per-page timings: count, failures, mean/p50/p95/max seconds.
+        """
+        with self._lock:
+            durations = sorted(t["seconds"] for t in self.timings)
+            failures = sum(1 for t in self.timings if not t["ok"])
+        if not durations:
+            return {"pages": 0, "failures": 0}
+
+        def pct(p: float) -> float:
+            return round(durations[min(len(durations) - 1, int(p * len(durations)))], 3)
+
+        return {
+            "pages": len(durations),
+            "failures": failures,
+            "mean_s": round(sum(durations) / len(durations), 3),
+            "p50_s": pct(0.50),
+            "p95_s": pct(0.95),
+            "max_s": round(durations[-1], 3),
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from product_assistant.etl.ingestion_journal import IngestionJournal
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.exception.custom_exception import ProductAssistantException
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingSnapshot:
+    """
+    Compact on-disk snapshot of embedded documents.
+
+    A snapshot is a directory holding:
+      - vectors.npy:   (count, dim) float32 or float16 matrix, row i belongs to index line i
+      - index.jsonl:   one line per row with id, text_hash, text and metadata
+      - manifest.json: count, dim, dtype and the embedding model the vectors came from
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    INDEX_FILE = "index.jsonl"
+    MANIFEST_FILE = "manifest.json"
+    SUPPORTED_DTYPES = ("float32", "float16")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.manifest: Dict = {}
+        self.entries: List[Dict] = []
+        self.vectors: Optional[np.ndarray] = None
+
+    @classmethod
+    def write(cls, path: str, ids: List[str], documents: List[Document], vectors: Iterable[List[float]],
+              dtype: str = "float32", embedding_model: str = "") -> "EmbeddingSnapshot":
+        """
+        Write documents and their vectors to a snapshot directory.
+        """
+        if dtype not in cls.SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported snapshot dtype '{dtype}', expected one of {cls.SUPPORTED_DTYPES}")
+
+        matrix = np.asarray(list(vectors), dtype=dtype)
+        if matrix.size == 0 and not documents and not ids:
+            matrix = matrix.reshape(0, 0)  # empty collection: keep a 2-D (0, 0) matrix
+        if matrix.ndim != 2 or matrix.shape[0] != len(documents) or len(ids) != len(documents):
+            raise ProductAssistantException(
+                f"Snapshot shape mismatch: {len(ids)} ids, {len(documents)} documents, vectors {matrix.shape}", sys
+            )
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, cls.VECTORS_FILE), matrix)
+        with open(os.path.join(path, cls.INDEX_FILE), "w", encoding="utf-8") as f:
+            for doc_id, doc in zip(ids, documents):
+                entry = {
+                    "id": doc_id,
+                    "text_hash": text_hash(doc.page_content),
+                    "text": doc.page_content,
+                    "metadata": doc.metadata,
+                }
+                f.write(json.dumps(entry, default=str) + "\n")
+
+        manifest = {
+            "count": int(matrix.shape[0]),
+            "dim": int(matrix.shape[1]),
+            "dtype": dtype,
+            "embedding_model": embedding_model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(path, cls.MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        log.info("Embedding snapshot written", path=path, count=manifest["count"], dim=manifest["dim"], dtype=dtype)
+        return cls.load(path)
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingSnapshot":
+        """
+        Load a snapshot; vectors are memory-mapped rather than read eagerly.
+        """
+        snapshot = cls(path)
+        manifest_path = os.path.join(path, cls.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Snapshot manifest not found at: {manifest_path}")
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            snapshot.manifest = json.load(f)
+        with open(os.path.join(path, cls.INDEX_FILE), "r", encoding="utf-8") as f:
+            snapshot.entries = [json.loads(line) for line in f if line.strip()]
+        snapshot.vectors = np.load(os.path.join(path, cls.VECTORS_FILE), mmap_mode="r")
+
+        if len(snapshot.entries) != snapshot.vectors.shape[0]:
+            raise ProductAssistantException(
+                f"Corrupt snapshot at {path}: {len(snapshot.entries)} index rows vs {snapshot.vectors.shape[0]} vectors",
+                sys,
+            )
+        return snapshot
+
+    def fingerprint(self) -> str:
+        return IngestionJournal.fingerprint_file(os.path.join(self.path, self.INDEX_FILE))
+
+    def documents(self) -> List[Document]:
+        return [Document(id=e["id"], page_content=e["text"], metadata=e["metadata"]) for e in self.entries]
+
+    def ids(self) -> List[str]:
+        return [e["id"] for e in self.entries]
+
+    def embeddings(self, fallback: Optional[Embeddings] = None) -> "SnapshotEmbeddings":
+        return SnapshotEmbeddings(self, fallback=fallback)
+
+
+class SnapshotEmbeddings(Embeddings):
+    """
+    Embeddings implementation that serves vectors from a snapshot by text hash.
+
+    Passing it as the `embedding` of any LangChain vector store turns `add_documents`
+    into a local bulk load. Texts missing from the snapshot go to `fallback`, or raise if none.
+    """
+
+    def __init__(self, snapshot: EmbeddingSnapshot, fallback: Optional[Embeddings] = None):
+        self.snapshot = snapshot
+        self.fallback = fallback
+        self._row_by_hash = {e["text_hash"]: i for i, e in enumerate(snapshot.entries)}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = []
+        missing = []
+        for i, text in enumerate(texts):
+            row = self._row_by_hash.get(text_hash(text))
+            if row is None:
+                missing.append(i)
+                vectors.append(None)
+            else:
+                vectors.append(self.snapshot.vectors[row].astype(np.float32).tolist())  # type: ignore
+
+        if missing:
+            if self.fallback is None:
+                raise ProductAssistantException(f"{len(missing)} texts are not present in the embedding snapshot", sys)
+            log.info("Embedding texts missing from snapshot", count=len(missing))
+            fresh = self.fallback.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+        return vectors  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """
+    Embeddings implementation that serves vectors registered ahead of time by text hash.
+
+    Lets embedding and vector-store upsert run as separate stages: one stage embeds and
+    registers, the next calls `add_documents` and the store picks the vectors up here.
+    """
+
+    def __init__(self, fallback: Optional[Embeddings] = None):
+        self.fallback = fallback
+        self._vectors: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, texts: List[str], vectors: List[List[float]]):
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                self._vectors[text_hash(text)] = vector
+
+    def release(self, texts: List[str]):
+        with self._lock:
+            for text in texts:
+                self._vectors.pop(text_hash(text), None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            vectors = [self._vectors.get(text_hash(text)) for text in texts]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            if self.fallback is None:
+                raise ProductAssistantException(f"{len(missing)} texts have no precomputed embedding", sys)
+            fresh = self.fallback.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+        return vectors  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        if self.fallback is None:
+            raise ProductAssistantException("PrecomputedEmbeddings has no fallback model for queries", sys)
+        return self.fallback.embed_query(text)
@@ -0,0 +1,51 @@
+import time
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+
+class HttpFetcher:
+    """
+    Pooled keep-alive HTTP client for pages whose server-rendered HTML is enough.
+    Returns None instead of raising, so callers can fall back to the browser.
+    """
+
+    def __init__(self, timeout: float = 8, pool_size: int = 10, retries: int = 1):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            log.warning("HTTP fetch failed", url=url, error=str(e))
+            return None
+
+        log.info("HTTP page fetched", url=url, status=response.status_code,
+                 seconds=round(time.perf_counter() - started, 3))
+        if response.status_code != 200 or "html" not in response.headers.get("Content-Type", ""):
+            return None
+        return response.text
+
+    def close(self):
+        self.session.close()
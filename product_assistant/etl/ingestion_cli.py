@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import argparse
+from product_assistant.utils.config_loader import load_config
+from product_assistant.etl.ingestion_journal import IngestionJournal
+
+
+def _journal_dir() -> str:
+    ingestion_cfg = load_config().get("ingestion", {})
+    return os.path.join(os.getcwd(), ingestion_cfg.get("journal_dir", os.path.join("data", "ingestion_runs")))
+
+
+def _summary(state: dict) -> dict:
+    return {k: v for k, v in state.items() if k != "inserted_ids"} | {"inserted_count": len(state["inserted_ids"])}
+
+
+def cmd_run(args):
+    from product_assistant.etl.data_ingestion import DataIngestion
+
+    ingestion = DataIngestion()
+    journal = ingestion.get_journal()
+    if args.run_id and args.run_id != journal.run_id:
+        print(f"Run {args.run_id} does not match the current CSV/config (current run id: {journal.run_id}).")
+        return 1
+    ingestion.run_pipeline(resume=not args.restart)
+    print(json.dumps(_summary(journal.state()), indent=2))
+    return 0
+
+
+def cmd_status(args):
+    journal_dir = _journal_dir()
+    journals = [IngestionJournal(journal_dir, args.run_id)] if args.run_id else IngestionJournal.list_runs(journal_dir)
+    states = [s for s in (j.state() for j in journals) if s]
+    if not states:
+        print("No ingestion runs found.")
+        return 1 if args.run_id else 0
+    for state in states:
+        if args.ids:
+            print(json.dumps(state, indent=2))
+        else:
+            print(json.dumps(_summary(state), indent=2))
+    return 0
+
+
+def cmd_abort(args):
+    journal = IngestionJournal(_journal_dir(), args.run_id)
+    state = journal.state()
+    if not state:
+        print(f"No ingestion run found with id {args.run_id}.")
+        return 1
+    if state["status"] != IngestionJournal.STATUS_RUNNING:
+        print(f"Run {args.run_id} is already {state['status']}.")
+        return 1
+    journal.abort(args.reason)
+    print(f"Run {args.run_id} aborted; the next run will start from zero.")
+    return 0
+
+
+def cmd_export(args):
+    from product_assistant.etl.data_ingestion import DataIngestion
+
+    snapshot = DataIngestion(require_csv=False).export_snapshot(args.path, dtype=args.dtype,
+                                                                collection_name=args.collection)
+    print(json.dumps(snapshot.manifest, indent=2))
+    return 0
+
+
+def cmd_import(args):
+    from product_assistant.etl.data_ingestion import DataIngestion
+
+    DataIngestion(require_csv=False).import_snapshot(args.path, collection_name=args.collection,
+                                                     resume=not args.restart)
+    print(f"Snapshot {args.path} imported.")
+    return 0
+
+
+def cmd_warm(args):
+    from product_assistant.etl.cache_warmer import CacheWarmer
+
+    warmer = CacheWarmer()
+    if args.dry_run:
+        print(json.dumps(warmer.mine(), indent=2, ensure_ascii=False))
+        return 0
+    print(json.dumps(warmer.warm(), indent=2))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage checkpointed ingestion runs and embedding snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_resume = sub.add_parser("resume", help="Start ingestion, or resume the interrupted run for the current CSV.")
+    p_resume.add_argument("run_id", nargs="?", help="Expected run id; refuses to run if the current CSV maps elsewhere.")
+    p_resume.add_argument("--restart", action="store_true", help="Discard the checkpoint and start from zero.")
+    p_resume.set_defaults(func=cmd_run)
+
+    p_status = sub.add_parser("status", help="Inspect one run, or list all runs.")
+    p_status.add_argument("run_id", nargs="?")
+    p_status.add_argument("--ids", action="store_true", help="Include the inserted document ids.")
+    p_status.set_defaults(func=cmd_status)
+
+    p_abort = sub.add_parser("abort", help="Abort a running ingestion so it is not resumed.")
+    p_abort.add_argument("run_id")
+    p_abort.add_argument("--reason", default="aborted from CLI")
+    p_abort.set_defaults(func=cmd_abort)
+
+    p_export = sub.add_parser("export", help="Export the collection's vectors to a local snapshot.")
+    p_export.add_argument("path")
+    p_export.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    p_export.add_argument("--collection", help="Source collection (defaults to astra_db.collection_name).")
+    p_export.set_defaults(func=cmd_export)
+
+    p_import = sub.add_parser("import", help="Load a snapshot into a collection without re-embedding.")
+    p_import.add_argument("path")
+    p_import.add_argument("--collection", help="Target collection (defaults to astra_db.collection_name).")
+    p_import.add_argument("--restart", action="store_true", help="Discard the checkpoint and start from zero.")
+    p_import.set_defaults(func=cmd_import)
+
+    p_warm = sub.add_parser("warm", help="Precompute answers for the most frequent logged questions.")
+    p_warm.add_argument("--dry-run", action="store_true", help="Only list the questions that would be warmed.")
+    p_warm.set_defaults(func=cmd_warm)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from product_assistant.logger import GLOBAL_LOGGER as log
+from product_assistant.exception.custom_exception import ProductAssistantException
+
+
+class IngestionJournal:
+    """
+    Append-only journal that checkpoints the progress of one ingestion run.
+
+    Every event is written as a single JSON line and fsync'ed, so a crash can at worst
+    leave one torn line, which is skipped when the journal is replayed.
+    """
+
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_ABORTED = "aborted"
+
+    def __init__(self, journal_dir: str, run_id: str):
+        self.journal_dir = journal_dir
+        self.run_id = run_id
+        self.path = os.path.join(journal_dir, f"{run_id}.jsonl")
+
+    @staticmethod
+    def fingerprint_file(path: str) -> str:
+        """
+        Return a sha256 fingerprint of a file's content.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_run_id(fingerprint: str, collection_name: str, batch_size: int) -> str:
+        """
+        Derive a stable run id, so rerunning the same data into the same collection resumes.
+        """
+        key = f"{fingerprint}|{collection_name}|{batch_size}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def list_runs(cls, journal_dir: str) -> List["IngestionJournal"]:
+        """
+        Return journals found in the journal directory, most recently modified first.
+        """
+        if not os.path.isdir(journal_dir):
+            return []
+        names = [n for n in os.listdir(journal_dir) if n.endswith(".jsonl")]
+        names.sort(key=lambda n: os.path.getmtime(os.path.join(journal_dir, n)), reverse=True)
+        return [cls(journal_dir, n[: -len(".jsonl")]) for n in names]
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _append(self, event: str, **payload):
+        os.makedirs(self.journal_dir, exist_ok=True)
+        record = {"event": event, "ts": datetime.now(timezone.utc).isoformat(), **payload}
+        with open(self.path, "a+", encoding="utf-8") as f:
+            # Terminate a torn line left by a crash so the new event stays parseable.
+            if f.tell() > 0:
+                f.seek(f.tell() - 1)
+                if f.read(1) != "\n":
+                    f.write("\n")
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _events(self) -> List[Dict]:
+        if not self.exists():
+            return []
+        events = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    log.warning("Skipping torn journal entry", run_id=self.run_id)
+        return events
+
+    def start(self, total: int, batch_size: int, **meta):
+        """
+        Record the start of a run. Existing journals are left untouched.
+        """
+        if self.exists():
+            return
+        self._append("start", run_id=self.run_id, total=total, batch_size=batch_size, **meta)
+        log.info("Ingestion run started", run_id=self.run_id, total=total, batch_size=batch_size)
+
+    def record_batch(self, batch_index: int, start: int, end: int, inserted_ids: List[str]):
+        """
+        Commit a batch once the vector store has acknowledged it.
+        """
+        self._append("batch", batch=batch_index, start=start, end=end, inserted_ids=inserted_ids)
+
+    def complete(self):
+        self._append("complete")
+        log.info("Ingestion run completed", run_id=self.run_id)
+
+    def abort(self, reason: str = ""):
+        if not self.exists():
+            raise ProductAssistantException(f"No ingestion run found with id {self.run_id}", sys)
+        self._append("abort", reason=reason)
+        log.info("Ingestion run aborted", run_id=self.run_id, reason=reason)
+
+    def reset(self):
+        """
+        Discard the journal so the next run starts from offset zero.
+        """
+        if self.exists():
+            os.remove(self.path)
+
+    def state(self) -> Optional[Dict]:
+        """
+        Replay the journal and return the current run state, or None if there is no journal.
+        """
+        events = self._events()
+        if not events or events[0].get("event") != "start":
+            return None
+
+        header = events[0]
+        state = {
+            "run_id": self.run_id,
+            "status": self.STATUS_RUNNING,
+            "total": header.get("total", 0),
+            "batch_size": header.get("batch_size"),
+            "started_at": header.get("ts"),
+            "updated_at": events[-1].get("ts"),
+            "meta": {k: v for k, v in header.items() if k not in {"event", "ts", "run_id", "total", "batch_size"}},
+            "batches_committed": 0,
+            "next_offset": 0,
+            "inserted_ids": [],
+        }
+        for event in events[1:]:
+            kind = event.get("event")
+            if kind == "batch":
+                state["batches_committed"] += 1
+                state["next_offset"] = max(state["next_offset"], event["end"])
+                state["inserted_ids"].extend(event.get("inserted_ids", []))
+            elif kind == "complete":
+                state["status"] = self.STATUS_COMPLETED
+            elif kind == "abort":
+                state["status"] = self.STATUS_ABORTED
+                state["abort_reason"] = event.get("reason", "")
+        return state
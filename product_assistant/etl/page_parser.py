@@ -0,0 +1,108 @@
+import re
+from typing import Dict, List, Optional
+import lxml.html
+
+# CSS form is used for in-browser counting, XPath form for lxml (no cssselect dependency).
+REVIEW_BLOCK_SELECTOR = "div._27M-vq, div.col.EPCmJX, div._6K-7Co"
+
+
+def _has_class(*classes: str) -> str:
+    """XPath predicate matching elements that carry all the given CSS classes."""
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {c} ')" for c in classes)
+
+
+_REVIEW_BLOCKS_XPATH = " | ".join([
+    f"//div[{_has_class('_27M-vq')}]",
+    f"//div[{_has_class('col', 'EPCmJX')}]",
+    f"//div[{_has_class('_6K-7Co')}]",
+])
+_TITLE_XPATH = f"//span[{_has_class('VU-ZEz')}] | //span[{_has_class('B_NuCI')}] | //h1"
+_PRICE_XPATH = f"//div[{_has_class('Nx9bqj')}]"
+_RATING_XPATH = f"//div[{_has_class('XQDdHH')}]"
+
+_RESULT_ITEMS_XPATH = "//div[@data-id]"
+_RESULT_TITLE_XPATH = f".//div[{_has_class('KzDlHZ')}]"
+_RESULT_PRICE_XPATH = f".//div[{_has_class('Nx9bqj')}]"
+_RESULT_RATING_XPATH = f".//div[{_has_class('XQDdHH')}]"
+_RESULT_REVIEWS_XPATH = f".//span[{_has_class('Wphh3N')}]"
+_RESULT_LINK_XPATH = ".//a[contains(@href, '/p/')]"
+_TOTAL_REVIEWS_RE = re.compile(r"\d+(,\d+)?(?=\s+Reviews)")
+_PRODUCT_ID_RE = re.compile(r"/p/(itm[0-9A-Za-z]+)")
+
+
+def element_text(el) -> str:
+    """Whitespace-normalized text of an element, like BeautifulSoup's get_text(' ', strip=True)."""
+    return " ".join(part.strip() for part in el.itertext() if part.strip())
+
+
+def _first_text(root, xpath: str) -> Optional[str]:
+    for el in root.xpath(xpath):
+        text = element_text(el)
+        if text:
+            return text
+    return None
+
+
+def _collect_reviews(root, count: int) -> List[str]:
+    seen = set()
+    reviews = []
+    for block in root.xpath(_REVIEW_BLOCKS_XPATH):
+        text = element_text(block)
+        if text and text not in seen:
+            reviews.append(text)
+            seen.add(text)
+        if len(reviews) >= count:
+            break
+    return reviews
+
+
+def parse_reviews(html: str, count: int) -> List[str]:
+    """Return up to `count` distinct review texts from a product page."""
+    return _collect_reviews(lxml.html.fromstring(html), count)
+
+
+def parse_product_page(html: str, review_count: int = 2) -> Dict:
+    """
+    Parse title, price, rating and top reviews from a product page in a single lxml pass.
+    Missing fields are None (reviews an empty list) rather than errors.
+    """
+    root = lxml.html.fromstring(html)
+    return {
+        "title": _first_text(root, _TITLE_XPATH),
+        "price": _first_text(root, _PRICE_XPATH),
+        "rating": _first_text(root, _RATING_XPATH),
+        "reviews": _collect_reviews(root, review_count),
+    }
+
+
+def parse_search_results(html: str, max_products: int) -> List[Dict]:
+    """
+    Parse up to `max_products` product records from a search results page in one lxml pass.
+
+    Each field is extracted independently and falls back to "N/A", so a result missing
+    e.g. its rating is still returned. Only results without a product link are skipped.
+    """
+    root = lxml.html.fromstring(html)
+    products = []
+    for item in root.xpath(_RESULT_ITEMS_XPATH):
+        links = item.xpath(_RESULT_LINK_XPATH)
+        if not links:
+            continue
+        href = links[0].get("href", "")
+        product_link = href if href.startswith("http") else "https://www.flipkart.com" + href
+        match = _PRODUCT_ID_RE.search(href)
+
+        reviews_text = _first_text(item, _RESULT_REVIEWS_XPATH) or ""
+        reviews_match = _TOTAL_REVIEWS_RE.search(reviews_text)
+
+        products.append({
+            "product_id": match.group(1) if match else "N/A",
+            "product_title": _first_text(item, _RESULT_TITLE_XPATH) or links[0].get("title") or "N/A",
+            "rating": _first_text(item, _RESULT_RATING_XPATH) or "N/A",
+            "total_reviews": reviews_match.group(0) if reviews_match else "N/A",
+            "price": _first_text(item, _RESULT_PRICE_XPATH) or "N/A",
+            "product_link": product_link,
+        })
+        if len(products) >= max_products:
+            break
+    return products
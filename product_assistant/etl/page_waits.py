@@ -0,0 +1,116 @@
+import time
+from typing import Callable, Dict, Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+DEFAULT_TIMEOUTS = {
+    "page_load": 10,      # document.readyState == "complete"
+    "results": 10,        # first search result rendered
+    "popup": 1.5,         # login popup appears (it often doesn't)
+    "scroll_step": 3,     # content growth after one END key press
+    "quiet_period": 0.4,  # DOM / network must be unchanged this long to count as settled
+    "max_scrolls": 6,
+}
+
+_DOM_SIZE_JS = "return document.getElementsByTagName('*').length"
+_RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length"
+_PAGE_HEIGHT_JS = "return document.body ? document.body.scrollHeight : 0"
+
+
+class PageWaiter:
+    """
+    Adaptive waits for scraper page loads.
+
+    Every step waits for an observable condition (element present, readyState, DOM or
+    network quiet) with its own timeout, so a fast page is processed as soon as it is
+    ready and a slow one gets at most the configured budget.
+    """
+
+    def __init__(self, timeouts: Optional[Dict] = None, poll_interval: float = 0.1):
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.poll_interval = poll_interval
+
+    def _poll_until_stable(self, driver, probe_js: str, timeout: float) -> bool:
+        """Poll a JS probe until its value stops changing for the quiet period."""
+        quiet = self.timeouts["quiet_period"]
+        deadline = time.monotonic() + timeout
+        last_value = driver.execute_script(probe_js)
+        last_change = time.monotonic()
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            value = driver.execute_script(probe_js)
+            now = time.monotonic()
+            if value != last_value:
+                last_value, last_change = value, now
+            elif now - last_change >= quiet:
+                return True
+        return False
+
+    def document_ready(self, driver) -> bool:
+        try:
+            WebDriverWait(driver, self.timeouts["page_load"], poll_frequency=self.poll_interval).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            log.warning("Timed out waiting for document ready", url=driver.current_url)
+            return False
+
+    def element(self, driver, by: str, selector: str, timeout: Optional[float] = None):
+        """Return the first matching element once present, or None on timeout."""
+        timeout = timeout if timeout is not None else self.timeouts["results"]
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=self.poll_interval).until(
+                EC.presence_of_element_located((by, selector))
+            )
+        except TimeoutException:
+            return None
+
+    def dom_stable(self, driver, timeout: Optional[float] = None) -> bool:
+        timeout = timeout if timeout is not None else self.timeouts["page_load"]
+        return self._poll_until_stable(driver, _DOM_SIZE_JS, timeout)
+
+    def network_idle(self, driver, timeout: Optional[float] = None) -> bool:
+        timeout = timeout if timeout is not None else self.timeouts["page_load"]
+        return self._poll_until_stable(driver, _RESOURCE_COUNT_JS, timeout)
+
+    def dismiss_popup(self, driver) -> bool:
+        """Close the login popup if it shows up within the popup timeout."""
+        try:
+            button = WebDriverWait(driver, self.timeouts["popup"], poll_frequency=self.poll_interval).until(
+                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), '✕')]"))
+            )
+            button.click()
+            return True
+        except TimeoutException:
+            return False
+        except Exception as e:
+            print(f"Error occurred while closing popup: {e}")
+            return False
+
+    def scroll_until(self, driver, count_fn: Callable[[], int], target: int) -> int:
+        """
+        Press END until count_fn() reaches target, the page stops growing, or max_scrolls is hit.
+        Each press waits only until the page height changes (bounded by scroll_step).
+        """
+        count = count_fn()
+        scrolls = 0
+        while count < target and scrolls < self.timeouts["max_scrolls"]:
+            height = driver.execute_script(_PAGE_HEIGHT_JS)
+            ActionChains(driver).send_keys(Keys.END).perform()
+            scrolls += 1
+            try:
+                WebDriverWait(driver, self.timeouts["scroll_step"], poll_frequency=self.poll_interval).until(
+                    lambda d: d.execute_script(_PAGE_HEIGHT_JS) != height or count_fn() >= target
+                )
+            except TimeoutException:
+                # Nothing more is loading; scrolling further would only burn time.
+                break
+            count = count_fn()
+        log.info("Scrolling finished", scrolls=scrolls, found=count, target=target)
+        return count
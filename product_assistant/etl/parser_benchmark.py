@@ -0,0 +1,71 @@
+import os
+import sys
+import glob
+import time
+import argparse
+from typing import Callable, Dict, List
+from product_assistant.etl.page_parser import parse_product_page, parse_search_results
+
+
+def _load_fixtures(fixture_dir: str, prefix: str) -> List[str]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, f"{prefix}_*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def benchmark(parser: Callable[[str], object], pages: List[str], repeat: int) -> Dict:
+    """Run parser over every page `repeat` times and report throughput."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            parser(html)
+    elapsed = time.perf_counter() - started
+    parsed = len(pages) * repeat
+    return {
+        "pages": parsed,
+        "seconds": round(elapsed, 4),
+        "pages_per_s": round(parsed / elapsed, 1) if elapsed else None,
+        "ms_per_page": round(1000 * elapsed / parsed, 3) if parsed else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark scraper HTML parsers offline against saved fixtures "
+                    "(capture them by setting scraper.fixture_dir in config.yaml)."
+    )
+    parser.add_argument("fixture_dir")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--reviews", type=int, default=2)
+    parser.add_argument("--max-products", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    product_pages = _load_fixtures(args.fixture_dir, "product")
+    search_pages = _load_fixtures(args.fixture_dir, "search")
+    if not product_pages and not search_pages:
+        print(f"No product_*.html or search_*.html fixtures found in {args.fixture_dir}")
+        return 1
+
+    if search_pages:
+        print("search pages (lxml):",
+              benchmark(lambda h: parse_search_results(h, args.max_products), search_pages, args.repeat))
+    if not product_pages:
+        return 0
+    print("product pages (lxml):", benchmark(lambda h: parse_product_page(h, args.reviews), product_pages, args.repeat))
+    try:
+        from bs4 import BeautifulSoup
+        from product_assistant.etl.page_parser import REVIEW_BLOCK_SELECTOR
+
+        def bs4_reviews(html):
+            return [b.get_text(separator=" ", strip=True) for b in BeautifulSoup(html, "html.parser").select(REVIEW_BLOCK_SELECTOR)]
+
+        print("product pages (bs4 baseline):", benchmark(bs4_reviews, product_pages, args.repeat))
+    except ImportError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class ScrapeCache:
+    """
+    Local SQLite cache of scrape results with per-kind TTLs.
+
+    - products: keyed by Flipkart product_id, holds the full product row incl. top reviews
+    - queries:  keyed by normalized search query, holds the parsed search listings
+    An entry is a hit only if it is younger than its TTL and was scraped with at least as
+    many reviews / results as the caller now asks for; anything else is re-fetched.
+    """
+
+    def __init__(self, path: str, product_ttl_s: float, query_ttl_s: float):
+        self.path = path
+        self.product_ttl_s = product_ttl_s
+        self.query_ttl_s = query_ttl_s
+        self._lock = threading.Lock()
+        self._stats = {kind: {"hits": 0, "misses": 0, "stale": 0} for kind in ("products", "queries")}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS products ("
+                "product_id TEXT PRIMARY KEY, payload TEXT NOT NULL, review_count INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "query TEXT PRIMARY KEY, payload TEXT NOT NULL, max_products INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _lookup(self, kind: str, sql: str, key: str, ttl_s: float, min_size: int):
+        with self._lock:
+            row = self._conn.execute(sql, (key,)).fetchone()
+            stats = self._stats[kind]
+            if row is None:
+                stats["misses"] += 1
+                return None
+            payload, size, fetched_at = row
+            if time.time() - fetched_at > ttl_s or size < min_size:
+                stats["stale"] += 1
+                return None
+            stats["hits"] += 1
+        return json.loads(payload)
+
+    def get_product(self, product_id: str, review_count: int) -> Optional[List]:
+        """Cached product row, or None if missing or stale."""
+        return self._lookup(
+            "products", "SELECT payload, review_count, fetched_at FROM products WHERE product_id = ?",
+            product_id, self.product_ttl_s, review_count,
+        )
+
+    def put_product(self, product_id: str, row: List, review_count: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?)",
+                (product_id, json.dumps(row), review_count, time.time()),
+            )
+
+    def get_query(self, query: str, max_products: int) -> Optional[List[Dict]]:
+        """Cached search listings, or None if missing or stale."""
+        listings = self._lookup(
+            "queries", "SELECT payload, max_products, fetched_at FROM queries WHERE query = ?",
+            self.normalize_query(query), self.query_ttl_s, max_products,
+        )
+        return listings[:max_products] if listings is not None else None
+
+    def put_query(self, query: str, listings: List[Dict], max_products: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)",
+                (self.normalize_query(query), json.dumps(listings), max_products, time.time()),
+            )
+
+    def stats(self) -> Dict:
+        """Hit/miss/stale counters since startup plus the number of stored entries."""
+        with self._lock:
+            stats = {kind: dict(counters) for kind, counters in self._stats.items()}
+            stats["products"]["entries"] = self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+            stats["queries"]["entries"] = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        return stats
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM products")
+            self._conn.execute("DELETE FROM queries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
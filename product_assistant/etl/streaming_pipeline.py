@@ -0,0 +1,188 @@
+import time
+import queue
+import threading
+from typing import Dict, List, Optional
+from product_assistant.etl.data_scrapper import FlipkartScrapper, PRODUCT_COLUMNS
+from product_assistant.etl.data_ingestion import DataIngestion
+from product_assistant.etl.embedding_snapshot import PrecomputedEmbeddings
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+_DONE = object()
+
+
+class ScrapeToIngestPipeline:
+    """
+    Streams scraped products into the vector store while scraping is still running.
+
+    scrape -> transform -> embed -> upsert run on their own threads and are connected by
+    bounded queues, so a slow stage applies backpressure instead of buffering everything,
+    and end-to-end time approaches the slowest stage rather than the sum of all stages.
+    """
+
+    STAGES = ("scrape", "transform", "embed", "upsert")
+
+    def __init__(self, scrapper: FlipkartScrapper, ingestion: DataIngestion, queue_size: int = 8,
+                 batch_size: Optional[int] = None, flush_after_s: float = 0.5):
+        self.scrapper = scrapper
+        self.ingestion = ingestion
+        self.batch_size = batch_size or ingestion.batch_size
+        # A partial batch is embedded once no new document arrived for this long.
+        self.flush_after_s = flush_after_s
+        self.precomputed = PrecomputedEmbeddings(fallback=ingestion.model_loader.load_embeddings())
+        self.vstore = ingestion.get_vector_store(embedding=self.precomputed)
+
+        self._queues = {name: queue.Queue(maxsize=queue_size) for name in ("rows", "documents", "batches")}
+        self._lock = threading.Lock()
+        self._stats = {stage: {"in": 0, "out": 0, "errors": 0, "busy_s": 0.0} for stage in self.STAGES}
+        self._threads: List[threading.Thread] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self.rows: List[List] = []
+        self.inserted_ids: List[str] = []
+        self.errors: List[str] = []
+
+    # ---------------- Bookkeeping ----------------
+    def _count(self, stage: str, key: str, amount=1):
+        with self._lock:
+            self._stats[stage][key] += amount
+
+    def _error(self, stage: str, error: Exception):
+        self._count(stage, "errors")
+        with self._lock:
+            self.errors.append(f"{stage}: {error}")
+        log.error("Streaming pipeline stage failed", stage=stage, error=str(error))
+
+    # ---------------- Stages ----------------
+    def _scrape(self, queries, max_products, review_count, use_cache):
+        out = self._queues["rows"]
+        try:
+            for query in queries:
+                self._count("scrape", "in")
+                started = time.perf_counter()
+                try:
+                    for row in self.scrapper.iter_flipkart_products(query, max_products=max_products,
+                                                                    review_count=review_count, use_cache=use_cache):
+                        self._count("scrape", "busy_s", time.perf_counter() - started)
+                        out.put(row)
+                        self._count("scrape", "out")
+                        started = time.perf_counter()
+                except Exception as e:
+                    self._error("scrape", e)
+                self._count("scrape", "busy_s", time.perf_counter() - started)
+        finally:
+            out.put(_DONE)
+
+    def _transform(self):
+        inbox, out = self._queues["rows"], self._queues["documents"]
+        seen_titles = set()
+        while (row := inbox.get()) is not _DONE:
+            self._count("transform", "in")
+            started = time.perf_counter()
+            try:
+                if row[1] in seen_titles:
+                    continue
+                seen_titles.add(row[1])
+                doc = DataIngestion.to_document(dict(zip(PRODUCT_COLUMNS, row)))
+                doc.id = DataIngestion.document_id(doc)
+                with self._lock:
+                    self.rows.append(row)
+            except Exception as e:
+                self._error("transform", e)
+                continue
+            finally:
+                self._count("transform", "busy_s", time.perf_counter() - started)
+            out.put(doc)
+            self._count("transform", "out")
+        out.put(_DONE)
+
+    def _embed_batch(self, docs, out):
+        started = time.perf_counter()
+        try:
+            texts = [d.page_content for d in docs]
+            self.precomputed.register(texts, self.precomputed.fallback.embed_documents(texts))  # type: ignore
+            out.put(docs)
+            self._count("embed", "out", len(docs))
+        except Exception as e:
+            self._error("embed", e)
+        finally:
+            self._count("embed", "busy_s", time.perf_counter() - started)
+
+    def _embed(self):
+        inbox, out = self._queues["documents"], self._queues["batches"]
+        batch = []
+        while True:
+            try:
+                doc = inbox.get(timeout=self.flush_after_s)
+            except queue.Empty:
+                if batch:
+                    self._embed_batch(batch, out)
+                    batch = []
+                continue
+            if doc is _DONE:
+                break
+            self._count("embed", "in")
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                self._embed_batch(batch, out)
+                batch = []
+        if batch:
+            self._embed_batch(batch, out)
+        out.put(_DONE)
+
+    def _upsert(self):
+        inbox = self._queues["batches"]
+        while (docs := inbox.get()) is not _DONE:
+            self._count("upsert", "in", len(docs))
+            started = time.perf_counter()
+            try:
+                ids = self.vstore.add_documents(docs, ids=[d.id for d in docs])
+                with self._lock:
+                    self.inserted_ids.extend(ids)
+                self._count("upsert", "out", len(ids))
+            except Exception as e:
+                self._error("upsert", e)
+            finally:
+                self.precomputed.release([d.page_content for d in docs])
+                self._count("upsert", "busy_s", time.perf_counter() - started)
+
+    # ---------------- Public API ----------------
+    def start(self, queries: List[str], max_products: int = 1, review_count: int = 2, use_cache: bool = True):
+        """Start all stages in background threads and return immediately."""
+        self._started_at = time.perf_counter()
+        targets = [
+            (self._scrape, (queries, max_products, review_count, use_cache)),
+            (self._transform, ()),
+            (self._embed, ()),
+            (self._upsert, ()),
+        ]
+        self._threads = [
+            threading.Thread(target=fn, args=args, name=f"pipeline-{stage}", daemon=True)
+            for stage, (fn, args) in zip(self.STAGES, targets)
+        ]
+        for thread in self._threads:
+            thread.start()
+        log.info("Streaming pipeline started", queries=len(queries), batch_size=self.batch_size)
+        return self
+
+    def is_running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def join(self, timeout: Optional[float] = None):
+        for thread in self._threads:
+            thread.join(timeout)
+        if not self.is_running() and self._finished_at is None:
+            self._finished_at = time.perf_counter()
+            log.info("Streaming pipeline finished", progress=self.progress())
+        return self
+
+    def progress(self) -> Dict:
+        """Per-stage counters (in/out/errors/busy seconds), queue depths and elapsed time."""
+        with self._lock:
+            stages = {stage: dict(stats, busy_s=round(stats["busy_s"], 3)) for stage, stats in self._stats.items()}
+        end = self._finished_at or time.perf_counter()
+        return {
+            "stages": stages,
+            "queues": {name: q.qsize() for name, q in self._queues.items()},
+            "elapsed_s": round(end - self._started_at, 3) if self._started_at else 0.0,
+            "running": self.is_running(),
+        }
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import statistics
+from typing import Dict, List, Optional
+from product_assistant.evaluation.ragas_eval import ascore, evaluator_model
+from product_assistant.utils.config_loader import load_config
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+METRICS = ("context_precision", "response_relevancy")
+
+
+class ScoreCache:
+    """
+    Append-only JSONL cache of metric scores keyed by a hash of (metric, evaluator, sample).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._scores: Dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._scores[entry["key"]] = entry["score"]
+                    except (json.JSONDecodeError, KeyError):
+                        continue
+
+    @staticmethod
+    def key(metric: str, model: str, sample: Dict) -> str:
+        payload = json.dumps([metric, model, sample["query"], sample["response"], sample["contexts"]])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        return self._scores.get(key)
+
+    def put(self, key: str, score: float):
+        self._scores[key] = score
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "score": score}) + "\n")
+
+
+def load_dataset(path: str) -> List[Dict]:
+    """
+    Read a JSONL dataset; each line needs query (or user_input), response and contexts
+    (or retrieved_contexts, a list of strings).
+    """
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            contexts = row.get("contexts", row.get("retrieved_contexts", []))
+            if isinstance(contexts, str):
+                contexts = [contexts]
+            query = row.get("query", row.get("user_input"))
+            if query is None or "response" not in row:
+                raise ValueError(f"{path}:{line_no}: each sample needs 'query' and 'response'")
+            samples.append({"id": row.get("id", line_no), "query": query, "response": row["response"], "contexts": contexts})
+    return samples
+
+
+def _summarize(scores: List[float]) -> Dict:
+    if not scores:
+        return {"count": 0}
+    ordered = sorted(scores)
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 4),
+        "p10": round(ordered[int(0.10 * (len(ordered) - 1))], 4),
+        "p50": round(statistics.median(ordered), 4),
+        "min": round(ordered[0], 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class BatchEvaluator:
+    """
+    Scores a dataset concurrently with one shared evaluator LLM.
+    At most `concurrency` metric calls are in flight; cached scores skip the LLM entirely.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, cache_path: Optional[str] = None, metrics=METRICS):
+        eval_cfg = load_config().get("evaluation", {})
+        self.concurrency = concurrency if concurrency is not None else eval_cfg.get("concurrency", 8)
+        self.cache = ScoreCache(cache_path or eval_cfg.get("cache_path", os.path.join("data", "eval_cache.jsonl")))
+        self.metrics = metrics
+        self.stats = {"scored": 0, "cache_hits": 0, "failed": 0}
+
+    async def _score(self, semaphore: asyncio.Semaphore, model: str, metric: str, sample: Dict):
+        key = ScoreCache.key(metric, model, sample)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        async with semaphore:
+            try:
+                score = float(await ascore(metric, sample["query"], sample["response"], sample["contexts"]))
+            except Exception as e:
+                self.stats["failed"] += 1
+                log.warning("Metric scoring failed", metric=metric, sample_id=sample["id"], error=str(e))
+                return None
+        self.stats["scored"] += 1
+        self.cache.put(key, score)
+        return score
+
+    async def aevaluate(self, samples: List[Dict]) -> Dict:
+        started = time.perf_counter()
+        model = evaluator_model()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        jobs = [(sample, metric) for sample in samples for metric in self.metrics]
+        scores = await asyncio.gather(*(self._score(semaphore, model, metric, sample) for sample, metric in jobs))
+
+        per_sample: Dict = {}
+        for (sample, metric), score in zip(jobs, scores):
+            per_sample.setdefault(sample["id"], {"id": sample["id"], "query": sample["query"]})[metric] = score
+
+        return {
+            "evaluator_model": model,
+            "samples": len(samples),
+            "elapsed_s": round(time.perf_counter() - started, 3),
+            "concurrency": self.concurrency,
+            **self.stats,
+            "metrics": {m: _summarize([s for (_, metric), s in zip(jobs, scores) if metric == m and s is not None])
+                        for m in self.metrics},
+            "results": list(per_sample.values()),
+        }
+
+    def evaluate(self, samples: List[Dict]) -> Dict:
+        return asyncio.run(self.aevaluate(samples))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch RAGAS evaluation over a JSONL dataset.")
+    parser.add_argument("dataset", help="JSONL with query, response and contexts per line.")
+    parser.add_argument("--report", help="Write the full report (aggregates + per-sample scores) here as JSON.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Max concurrent metric calls (default: config).")
+    parser.add_argument("--cache", help="Score cache path (default: evaluation.cache_path).")
+    parser.add_argument("--metrics", nargs="+", choices=METRICS, default=list(METRICS))
+    args = parser.parse_args(argv)
+
+    evaluator = BatchEvaluator(concurrency=args.concurrency, cache_path=args.cache, metrics=tuple(args.metrics))
+    report = evaluator.evaluate(load_dataset(args.dataset))
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({k: v for k, v in report.items() if k != "results"}, indent=2))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,66 @@
 import asyncio
-from utils.model_loader import ModelLoader
+import threading
+from product_assistant.utils.model_loader import ModelLoader
 from ragas import SingleTurnSample
 from ragas.llms import LangchainLLMWrapper
 from ragas.embeddings import LangchainEmbeddingsWrapper
 from ragas.metrics import LLMContextPrecisionWithoutReference, ResponseRelevancy
 # from grpc.experimental.aio import grpc_aio
 # grpc_aio.init_grpc_aio()
-model_loader = ModelLoader()
+
+_metrics = None
+_evaluator_model = ""
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """
+    Build the evaluator LLM/embeddings and metric objects once and share them across calls.
+    """
+    global _metrics, _evaluator_model
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                model_loader = ModelLoader()
+                llm = model_loader.load_llm()
+                _evaluator_model = str(getattr(llm, "model_name", None) or getattr(llm, "model", ""))
+                evaluator_llm = LangchainLLMWrapper(llm)
+                evaluator_embeddings = LangchainEmbeddingsWrapper(model_loader.load_embeddings())
+                _metrics = {
+                    "context_precision": LLMContextPrecisionWithoutReference(llm=evaluator_llm),
+                    "response_relevancy": ResponseRelevancy(llm=evaluator_llm, embeddings=evaluator_embeddings),
+                }
+    return _metrics
+
+
+def evaluator_model() -> str:
+    """Name of the shared evaluator LLM (part of score cache keys)."""
+    get_metrics()
+    return _evaluator_model
+
+
+def build_sample(query, response, retrieved_context):
+    return SingleTurnSample(
+        user_input=query,
+        response=response,
+        retrieved_contexts=retrieved_context
+    )
+
+
+async def ascore(metric_name, query, response, retrieved_context):
+    metric = get_metrics()[metric_name]
+    return await metric.single_turn_ascore(build_sample(query, response, retrieved_context))
+
 
 def evaluate_response_precision(query, response, retrieved_context):
     try:
-        sample = SingleTurnSample(
-            user_input=query,
-            response=response,
-            reference_contexts=retrieved_context
-        )
-
-        async def main():
-            llm = model_loader.load_llm()
-            evaluator_llm = LangchainLLMWrapper(llm)
-            context_precision = LLMContextPrecisionWithoutReference(llm=evaluator_llm)
-            result = await context_precision.single_turn_ascore(sample)
-            return result
-        
-        return asyncio.run(main())
+        return asyncio.run(ascore("context_precision", query, response, retrieved_context))
     except Exception as e:
         return e
-    
+
 
 def evaluate_response_relevancy(query, response, retrieved_context):
     try:
-        sample = SingleTurnSample(
-            user_input=query,
-            response=response,
-            reference_contexts=retrieved_context
-        )
-
-        async def main():
-            llm = model_loader.load_llm()
-            evaluator_llm = LangchainLLMWrapper(llm)
-            relevancy_metric = ResponseRelevancy(llm=evaluator_llm)
-            result = await relevancy_metric.single_turn_ascore(sample)
-            return result
-        
-        return asyncio.run(main())
+        return asyncio.run(ascore("response_relevancy", query, response, retrieved_context))
     except Exception as e:
         return e
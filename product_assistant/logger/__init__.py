@@ -1,4 +1,29 @@
 # logger/__init__.py
+import threading
 from .custom_logger import CustomLogger
+
+
+class _LazyLogger:
+    """
+    Stand-in for the shared logger that builds it on first use, so importing the package
+    has no side effects (no logs/ directory, no handler or structlog configuration).
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    self._logger = CustomLogger().get_logger(self._name)
+        return self._logger
+
+    def __getattr__(self, attr):
+        return getattr(self._get(), attr)
+
+
 # Create a single shared logger instance
-GLOBAL_LOGGER = CustomLogger().get_logger("product_assistant")
\ No newline at end of file
+GLOBAL_LOGGER = _LazyLogger("product_assistant")
@@ -1,53 +1,227 @@
 import os
+import sys
+import queue
+import random
+import atexit
 import logging
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 import structlog
 
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller. When the queue is full, debug/info records are
+    dropped; a warning or error instead evicts the oldest queued debug/info record to make
+    room, and is dropped only if the queue holds nothing but warnings and errors. Drops are counted.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        # structlog already rendered the JSON line into record.msg; skip the default
+        # re-format + copy.copy() of every record on the caller's thread.
+        if record.args or record.exc_info:
+            return super().prepare(record)
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.levelno >= logging.WARNING and self._replace_oldest_minor(record):
+            _DroppingQueueHandler.dropped += 1  # the evicted record
+            return
+        _DroppingQueueHandler.dropped += 1
+
+    def _replace_oldest_minor(self, record) -> bool:
+        q = self.queue
+        with q.mutex:
+            for i, queued in enumerate(q.queue):
+                if queued is not None and queued.levelno < logging.WARNING:  # None is the listener's sentinel
+                    del q.queue[i]
+                    q.queue.append(record)
+                    q.not_empty.notify()
+                    return True
+        return False
+
+
+class _BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains everything queued so far and writes it in one go per handler
+    (one write + flush per batch instead of per record), so the writer thread wakes up and
+    competes for the GIL far less often under load.
+    """
+
+    max_batch = 512
+
+    def enqueue_sentinel(self):
+        # QueueListener uses put_nowait(), which raises queue.Full from the atexit hook when the
+        # queue is full. The sentinel may exceed maxsize by one; everything before it is written.
+        q = self.queue
+        with q.mutex:
+            q.queue.append(self._sentinel)
+            q.unfinished_tasks += 1
+            q.not_empty.notify()
+
+    def _monitor(self):
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = self._sentinel in batch
+            records = [r for r in batch if r is not self._sentinel]
+            if records:
+                for handler in self.handlers:
+                    self._write_batch(handler, records)
+            if stop:
+                return
+
+    @staticmethod
+    def _write_batch(handler: logging.Handler, records):
+        records = [r for r in records if r.levelno >= handler.level]
+        if not records:
+            return
+        if not isinstance(handler, logging.StreamHandler):
+            for record in records:
+                handler.handle(record)
+            return
+        handler.acquire()
+        try:
+            lines = []
+            for record in records:
+                if isinstance(handler, RotatingFileHandler) and handler.shouldRollover(record):
+                    if lines:
+                        handler.stream.write("".join(lines))
+                        lines = []
+                    handler.doRollover()
+                lines.append(handler.format(record) + handler.terminator)
+            if handler.stream is None:  # FileHandler opened with delay=True
+                handler.stream = handler._open()  # type: ignore
+            handler.stream.write("".join(lines))
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
+        finally:
+            handler.release()
+
+
+class DebugSampler:
+    """structlog processor that keeps only a fraction of debug events (errors and info always pass)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+
+    def __call__(self, logger, method_name, event_dict):
+        if method_name == "debug" and self.rate < 1.0 and random.random() >= self.rate:
+            raise structlog.DropEvent
+        return event_dict
+
+
 class CustomLogger:
-    def __init__(self, log_dir="logs"):
-        # Ensure logs directory exists
-        self.logs_dir = os.path.join(os.getcwd(), log_dir)
-        os.makedirs(self.logs_dir, exist_ok=True)
+    """
+    JSON logging to console and a size-rotated file, configured once per process.
+
+    Callers only format the event and enqueue it; a QueueListener thread does the actual
+    console/file writes, so request handlers never wait on disk or terminal I/O.
+    Settings come from constructor args, then env (LOG_LEVEL, LOG_DIR, LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT, LOG_DEBUG_SAMPLE_RATE, LOG_QUEUE_SIZE, LOG_CONSOLE), then defaults.
+    """
+
+    _configured = False
+    _lock = threading.Lock()
+    _listener: Optional[QueueListener] = None
+    log_file_path: Optional[str] = None
+
+    def __init__(self, log_dir: Optional[str] = None, level: Optional[str] = None,
+                 max_bytes: Optional[int] = None, backup_count: Optional[int] = None,
+                 debug_sample_rate: Optional[float] = None, queue_size: Optional[int] = None,
+                 console: Optional[bool] = None):
+        env = os.environ.get
+        self.log_dir = log_dir or env("LOG_DIR", "logs")
+        self.level = (level or env("LOG_LEVEL", "INFO")).upper()
+        self.max_bytes = max_bytes if max_bytes is not None else int(env("LOG_MAX_BYTES", 10 * 1024 * 1024))
+        self.backup_count = backup_count if backup_count is not None else int(env("LOG_BACKUP_COUNT", 5))
+        self.debug_sample_rate = (debug_sample_rate if debug_sample_rate is not None
+                                  else float(env("LOG_DEBUG_SAMPLE_RATE", 1.0)))
+        self.queue_size = queue_size if queue_size is not None else int(env("LOG_QUEUE_SIZE", 10000))
+        self.console = console if console is not None else env("LOG_CONSOLE", "1") not in ("0", "false", "False")
 
-        # Timestamped log file (for persistence)
-        log_file = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
-        self.log_file_path = os.path.join(self.logs_dir, log_file)
+    def configure(self):
+        """Install the queue handler, background writer and structlog pipeline (first call only)."""
+        with CustomLogger._lock:
+            if CustomLogger._configured:
+                return
+            logs_dir = os.path.join(os.getcwd(), self.log_dir)
+            os.makedirs(logs_dir, exist_ok=True)
+            # Timestamped log file (for persistence), rotated by size
+            log_file = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
+            CustomLogger.log_file_path = os.path.join(logs_dir, log_file)
+
+            formatter = logging.Formatter("%(message)s")  # Raw JSON lines rendered by structlog
+            handlers = []
+            file_handler = RotatingFileHandler(CustomLogger.log_file_path, maxBytes=self.max_bytes,
+                                               backupCount=self.backup_count, encoding="utf-8", delay=True)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+            if self.console:
+                console_handler = logging.StreamHandler(sys.stderr)
+                console_handler.setFormatter(formatter)
+                handlers.append(console_handler)
+
+            log_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+            CustomLogger._listener = _BatchingQueueListener(log_queue, *handlers, respect_handler_level=True)
+            CustomLogger._listener.start()
+            atexit.register(CustomLogger.shutdown)
+
+            root = logging.getLogger()
+            root.handlers = [_DroppingQueueHandler(log_queue)]
+            root.setLevel(self.level)
+
+            # Configure structlog for JSON structured logging
+            structlog.configure(
+                processors=[
+                    structlog.stdlib.filter_by_level,  # drop below-level events before any formatting
+                    structlog.contextvars.merge_contextvars,  # request_id etc. bound per request
+                    DebugSampler(self.debug_sample_rate),
+                    structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
+                    structlog.processors.add_log_level,
+                    structlog.processors.EventRenamer(to="event"),
+                    structlog.processors.JSONRenderer()
+                ],
+                logger_factory=structlog.stdlib.LoggerFactory(),
+                wrapper_class=structlog.stdlib.BoundLogger,
+                cache_logger_on_first_use=True,
+            )
+            CustomLogger._configured = True
 
     def get_logger(self, name=__file__):
-        logger_name = os.path.basename(name)
-
-        # Configure logging for console + file (both JSON)
-        file_handler = logging.FileHandler(self.log_file_path)
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(logging.Formatter("%(message)s"))  # Raw JSON lines
-
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter("%(message)s"))
-
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(message)s",  # Structlog will handle JSON rendering
-            handlers=[console_handler, file_handler]
-        )
-
-        # Configure structlog for JSON structured logging
-        structlog.configure(
-            processors=[
-                structlog.processors.TimeStamper(fmt="iso", utc=True, key="timestamp"),
-                structlog.processors.add_log_level,
-                structlog.processors.EventRenamer(to="event"),
-                structlog.processors.JSONRenderer()
-            ],
-            logger_factory=structlog.stdlib.LoggerFactory(),
-            cache_logger_on_first_use=True,
-        )
-
-        return structlog.get_logger(logger_name)
+        self.configure()
+        return structlog.get_logger(os.path.basename(name))
+
+    @staticmethod
+    def dropped_records() -> int:
+        return _DroppingQueueHandler.dropped
+
+    @staticmethod
+    def shutdown():
+        """Flush queued records and stop the writer thread."""
+        with CustomLogger._lock:
+            if CustomLogger._listener is not None:
+                CustomLogger._listener.stop()
+                CustomLogger._listener = None
 
 
 # # --- Usage Example ---
 # if __name__ == "__main__":
 #     logger = CustomLogger().get_logger(__file__)
 #     logger.info("User uploaded a file", user_id=123, filename="report.pdf")
-#     logger.error("Failed to process PDF", error="File not found", user_id=123)
\ No newline at end of file
+#     logger.error("Failed to process PDF", error="File not found", user_id=123)
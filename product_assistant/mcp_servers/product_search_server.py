@@ -1,16 +1,58 @@
+import json
+import asyncio
+import threading
+from typing import List
 from mcp.server.fastmcp import FastMCP
-from product_assistant.retriever.retrieval import Retriever
-from langchain_community.tools import DuckDuckGoSearchRun
+from product_assistant.utils.config_loader import load_config
+from product_assistant.mcp_servers.web_search import AsyncWebSearch
 
 # Initialize the MCP server
 mcp = FastMCP("hybrid_search")
 
-# Load Retriever
-retriever_instance = Retriever()
-retriever = retriever_instance.load_retriever()
+# Retriever (Astra DB + LLM filter) and the DuckDuckGo tool are built on first use, so
+# importing or starting the server doesn't pay for them or need credentials up front.
+_retriever_instance = None
+_web_search_tool = None
+_init_lock = threading.Lock()
 
-# Langchain DuckDuckGo Search Tool
-web_search_tool = DuckDuckGoSearchRun()
+
+def get_retriever_instance():
+    global _retriever_instance
+    if _retriever_instance is None:
+        with _init_lock:
+            if _retriever_instance is None:
+                from product_assistant.retriever.retrieval import Retriever
+                instance = Retriever()
+                instance.load_retriever()
+                _retriever_instance = instance
+    return _retriever_instance
+
+
+def ddg_search(query: str) -> str:
+    global _web_search_tool
+    if _web_search_tool is None:
+        with _init_lock:
+            if _web_search_tool is None:
+                from langchain_community.tools import DuckDuckGoSearchRun
+                _web_search_tool = DuckDuckGoSearchRun()
+    return _web_search_tool.run(query)
+
+
+server_cfg = load_config().get("mcp_server", {})
+MAX_BATCH_QUERIES = server_cfg.get("max_batch_queries", 20)
+SNIPPET_CHARS = server_cfg.get("snippet_chars", 300)
+# Bounds concurrent retrievals (and their LLM filter calls) across all batch requests.
+retrieval_semaphore = asyncio.Semaphore(server_cfg.get("batch_concurrency", 4))
+
+# DuckDuckGoSearchRun is synchronous; run it off the event loop with timeouts and caching.
+web_search_cfg = server_cfg.get("web_search", {})
+web_searcher = AsyncWebSearch(
+    ddg_search,
+    max_concurrent=web_search_cfg.get("max_concurrent", 4),
+    timeout_s=web_search_cfg.get("timeout_s", 10),
+    cache_ttl_s=web_search_cfg.get("cache_ttl_s", 600),
+    cache_size=web_search_cfg.get("cache_size", 256),
+)
 
 # ---------------- Helpers ----------------
 def format_docs(docs) -> str:
@@ -28,25 +70,79 @@ def format_docs(docs) -> str:
         formatted_chunks.append(formatted)
     return "\n\n---\n\n".join(formatted_chunks)
 
+def structure_docs(scored_docs) -> list:
+    results = []
+    for d, score in scored_docs:
+        meta = d.metadata or {}
+        results.append({
+            "id": d.id,
+            "product_id": meta.get("product_id"),
+            "score": round(float(score), 4) if score is not None else None,
+            "metadata": meta,
+            "snippet": d.page_content.strip()[:SNIPPET_CHARS],
+        })
+    return results
+
+async def retrieve(query: str, structured: bool):
+    """Run one retrieval; structured results keep ids, metadata and relevance scores."""
+    async with retrieval_semaphore:
+        # First call builds the retriever (blocking client setup) off the event loop.
+        retriever_instance = _retriever_instance or await asyncio.to_thread(get_retriever_instance)
+        if structured:
+            return structure_docs(await retriever_instance.acall_retriever_with_scores(query))
+        return format_docs(await retriever_instance.load_retriever().ainvoke(query))  # type: ignore
+
 # ---------------- MCP Tools ----------------
 @mcp.tool()
-async def get_product_info(query: str) -> str:
-    """Fetch product info from vector DB."""
+async def get_product_info(query: str, structured: bool = False) -> str:
+    """Fetch product info from vector DB. With structured=True, returns JSON with ids, metadata, scores and snippets."""
     try:
-        docs = retriever.invoke(query)  # type: ignore
-        context = format_docs(docs)
-        if not context:
+        result = await retrieve(query, structured)
+        if structured:
+            return json.dumps({"query": query, "products": result}, default=str)
+        if not result:
             return "No local results found."
-        return context
+        return result
     except Exception as e:
+        if structured:
+            return json.dumps({"query": query, "products": [], "error": str(e)})
         return f"Error retrieving product info: {str(e)}"
+
+@mcp.tool()
+async def get_products_info(queries: List[str], structured: bool = False) -> str:
+    """Fetch product info for several queries in one call; retrievals run concurrently.
+    With structured=True, returns JSON with one entry per query (ids, metadata, scores, snippets)."""
+    if len(queries) > MAX_BATCH_QUERIES:
+        message = f"Too many queries: {len(queries)} (max {MAX_BATCH_QUERIES})"
+        return json.dumps({"error": message}) if structured else f"Error retrieving product info: {message}"
+
+    outcomes = await asyncio.gather(*(retrieve(q, structured) for q in queries), return_exceptions=True)
+
+    if structured:
+        results = []
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, BaseException):
+                results.append({"query": query, "products": [], "error": str(outcome)})
+            else:
+                results.append({"query": query, "products": outcome})
+        return json.dumps({"results": results}, default=str)
+
+    sections = []
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, BaseException):
+            body = f"Error retrieving product info: {str(outcome)}"
+        else:
+            body = outcome or "No local results found."
+        sections.append(f"### Query: {query}\n\n{body}")
+    return "\n\n===\n\n".join(sections)
     
 @mcp.tool()
 async def web_search(query: str) -> str:
     """Perform web search using DuckDuckGo."""
     try:
-        result = web_search_tool.run(query)
-        return result
+        return await web_searcher.search(query)
+    except asyncio.TimeoutError:
+        return f"Error performing web search: timed out after {web_searcher.timeout_s}s"
     except Exception as e:
         return f"Error performing web search: {str(e)}"
     
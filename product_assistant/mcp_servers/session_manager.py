@@ -0,0 +1,167 @@
+import time
+import asyncio
+import threading
+from contextlib import AsyncExitStack
+from typing import Any, Dict, Optional
+from langchain_core.tools import BaseTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.tracing import span
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+DEFAULT_SERVERS = {
+    "hybrid_search": {
+        "transport": "streamable_http",
+        "url": "http://localhost:8000/mcp",
+    }
+}
+
+
+class MCPSessionManager:
+    """
+    Process-wide, lazily connected MCP sessions with cached tool handles.
+
+    `MultiServerMCPClient.get_tools()` returns tools that open a fresh session (and redo the
+    initialize handshake) on every call. Here one session per server is opened on first use
+    and kept alive by a background task, tools are loaded once and bound to that session,
+    and lookups are a dict access. A ping-based health check and reconnect-on-failure keep
+    the sessions usable across server restarts.
+    """
+
+    def __init__(self, connections: Dict[str, Dict], health_check_interval_s: float = 30,
+                 connect_timeout_s: float = 10):
+        self.connections = connections
+        self.health_check_interval_s = health_check_interval_s
+        self.connect_timeout_s = connect_timeout_s
+        self._client = MultiServerMCPClient(connections)  # type: ignore
+        self._tools: Dict[str, BaseTool] = {}
+        self._sessions: Dict[str, Any] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._last_health_check = 0.0
+
+    # ---------------- Connection lifecycle ----------------
+    async def _hold_sessions(self, ready: asyncio.Future):
+        """
+        Open every session and keep them open until asked to stop.
+        The transports use anyio cancel scopes, which must be entered and exited in the
+        same task, hence one long-lived task owning the AsyncExitStack.
+        """
+        try:
+            async with AsyncExitStack() as stack:
+                sessions, tools = {}, {}
+                for name in self.connections:
+                    session = await stack.enter_async_context(self._client.session(name))
+                    sessions[name] = session
+                    for tool in await load_mcp_tools(session):
+                        tools[tool.name] = tool
+                self._sessions, self._tools = sessions, tools
+                ready.set_result(True)
+                await self._stop.wait()  # type: ignore
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                log.warning("MCP session task ended with error", error=str(e))
+        finally:
+            self._sessions, self._tools = {}, {}
+
+    async def _connect(self):
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        ready = loop.create_future()
+        self._runner = loop.create_task(self._hold_sessions(ready))
+        await asyncio.wait_for(ready, timeout=self.connect_timeout_s)
+        self._last_health_check = time.monotonic()
+        log.info("MCP sessions connected", servers=list(self._sessions), tools=list(self._tools))
+
+    async def _disconnect(self):
+        if self._runner is not None and not self._runner.done():
+            self._stop.set()  # type: ignore
+            try:
+                await asyncio.wait_for(self._runner, timeout=self.connect_timeout_s)
+            except Exception as e:
+                log.warning("Error closing MCP sessions", error=str(e))
+        self._runner = None
+
+    async def _ensure_connected(self, force_reconnect: bool = False):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the loop that opened them (e.g. after a new asyncio.run()).
+            self._loop, self._lock, self._runner = loop, asyncio.Lock(), None
+            self._sessions, self._tools = {}, {}
+
+        async with self._lock:  # type: ignore
+            alive = self._runner is not None and not self._runner.done() and self._sessions
+            if alive and not force_reconnect:
+                return
+            await self._disconnect()
+            await self._connect()
+
+    async def health_check(self) -> bool:
+        """Ping every session; reconnect if any of them fails."""
+        await self._ensure_connected()
+        try:
+            for session in list(self._sessions.values()):
+                await asyncio.wait_for(session.send_ping(), timeout=self.connect_timeout_s)
+            healthy = True
+        except Exception as e:
+            log.warning("MCP health check failed, reconnecting", error=str(e))
+            await self._ensure_connected(force_reconnect=True)
+            healthy = False
+        self._last_health_check = time.monotonic()
+        return healthy
+
+    # ---------------- Tools ----------------
+    async def get_tool(self, name: str) -> Optional[BaseTool]:
+        await self._ensure_connected()
+        if time.monotonic() - self._last_health_check > self.health_check_interval_s:
+            await self.health_check()
+        return self._tools.get(name)
+
+    async def call_tool(self, name: str, arguments: Dict) -> Any:
+        """Invoke a tool over the persistent session, reconnecting once if the session broke."""
+        with span("mcp_tool", name):
+            return await self._call_tool(name, arguments)
+
+    async def _call_tool(self, name: str, arguments: Dict) -> Any:
+        tool = await self.get_tool(name)
+        if tool is None:
+            raise KeyError(f"MCP tool '{name}' not found; available: {sorted(self._tools)}")
+        try:
+            return await tool.ainvoke(arguments)
+        except ToolException:
+            raise
+        except Exception as e:
+            log.warning("MCP tool call failed, reconnecting and retrying", tool=name, error=str(e))
+            await self._ensure_connected(force_reconnect=True)
+            tool = self._tools.get(name)
+            if tool is None:
+                raise
+            return await tool.ainvoke(arguments)
+
+    async def aclose(self):
+        if self._loop is asyncio.get_running_loop():
+            await self._disconnect()
+
+
+_manager: Optional[MCPSessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_mcp_session_manager() -> MCPSessionManager:
+    """Return the process-wide MCP session manager, created from config on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                client_cfg = load_config().get("mcp_client", {})
+                _manager = MCPSessionManager(
+                    client_cfg.get("servers", DEFAULT_SERVERS),
+                    health_check_interval_s=client_cfg.get("health_check_interval_s", 30),
+                    connect_timeout_s=client_cfg.get("connect_timeout_s", 10),
+                )
+    return _manager
@@ -0,0 +1,120 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+from product_assistant.utils.ttl_cache import TTLCache
+
+
+class AsyncWebSearch:
+    """
+    Runs a blocking search function off the event loop.
+
+    Calls go to a bounded thread pool, at most `max_concurrent` run at once, each is
+    cut off after `timeout_s`, identical in-flight queries share one backend call, and
+    successful results are kept in a TTL cache.
+
+    A thread cannot be interrupted, so a call that times out keeps its slot until the
+    backend actually returns; `max_concurrent` therefore bounds real backend calls, and
+    `timeout_s` also covers the wait for a free slot.
+    """
+
+    def __init__(self, search_fn: Callable[[str], str], max_concurrent: int = 4, timeout_s: float = 10,
+                 cache_ttl_s: float = 600, cache_size: int = 256):
+        self.search_fn = search_fn
+        self.timeout_s = timeout_s
+        self.cache = TTLCache(max_size=cache_size, ttl_s=cache_ttl_s)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="web-search")
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:  # loop already closed
+            pass
+
+    async def _call(self, query: str) -> str:
+        await self._semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(self.search_fn, query)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self.stats["calls"] += 1
+        # Released when the worker finishes, not when the caller stops waiting.
+        future.add_done_callback(lambda _: self._release_slot(loop))
+        return await asyncio.wrap_future(future)
+
+    async def _run(self, query: str) -> str:
+        return await asyncio.wait_for(self._call(query), timeout=self.timeout_s)
+
+    async def search(self, query: str) -> str:
+        """Search without blocking the loop. Raises asyncio.TimeoutError past the per-call timeout."""
+        key = self._key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        task = asyncio.ensure_future(self._run(query))
+        self._inflight[key] = task
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        self.cache.set(key, result)
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Load check against a local stand-in backend:
+#   python -m product_assistant.mcp_servers.web_search
+if __name__ == "__main__":
+    import random
+
+    def fake_backend(query: str) -> str:
+        time.sleep(random.uniform(0.05, 0.3) if "slow" not in query else 2)
+        return f"results for {query}"
+
+    async def probe_loop_lag(stop: asyncio.Event, samples: list):
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            samples.append(time.perf_counter() - started - 0.01)
+
+    async def main():
+        searcher = AsyncWebSearch(fake_backend, max_concurrent=8, timeout_s=1, cache_ttl_s=60)
+        queries = [f"query {i % 40}" for i in range(400)] + ["slow query"] * 5
+        stop, lag = asyncio.Event(), []
+        probe = asyncio.create_task(probe_loop_lag(stop, lag))
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(searcher.search(q) for q in queries), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe
+        failures = sum(isinstance(o, BaseException) for o in outcomes)
+        print(f"{len(queries)} searches in {elapsed:.2f}s, {failures} failed")
+        print("stats:", searcher.stats, "cache:", searcher.cache.stats())
+        print(f"max event-loop lag: {max(lag) * 1000:.1f} ms")
+        searcher.shutdown()
+
+    asyncio.run(main())
@@ -1,11 +1,8 @@
 import os
-from langchain_astradb import AstraDBVectorStore
-from typing import List
-from product_assistant.utils.model_loader import ModelLoader
+from typing import List, Tuple
+from langchain_core.documents import Document
+from product_assistant.utils.model_loader import ModelLoader, load_env
 from product_assistant.utils.config_loader import load_config
-from dotenv import load_dotenv
-from langchain.retrievers.document_compressors import LLMChainFilter
-from langchain.retrievers import ContextualCompressionRetriever
 
 class Retriever:
     def __init__(self):
@@ -19,7 +16,7 @@ class Retriever:
         '''
         Load environment variables from .env file.
         '''
-        load_dotenv()
+        load_env()
         required_vars = [
             'GROQ_API_KEY', 'OPENAI_API_KEY', 
             'ASTRA_DB_API_ENDPOINT', 'ASTRA_DB_APPLICATION_TOKEN', 'ASTRA_DB_KEYSPACE'
@@ -36,6 +33,11 @@ class Retriever:
         self.astra_db_keyspace = os.getenv('ASTRA_DB_KEYSPACE')
 
     def load_retriever(self):
+        # Heavy clients are imported on first use so importing this module stays cheap.
+        from langchain_astradb import AstraDBVectorStore
+        from langchain.retrievers import ContextualCompressionRetriever
+        from langchain.retrievers.document_compressors import LLMChainFilter
+
         if not self.vs:
             collection_name = self.config['astra_db']['collection_name']
 
@@ -57,7 +59,7 @@ class Retriever:
                                "score_threshold": 0.3
                                }
             )
-            llm = self.model_loader.load_llm()
+            llm = self.model_loader.load_llm_for("retriever_filter")
 
             compressor = LLMChainFilter.from_llm(llm)
 
@@ -66,9 +68,21 @@ class Retriever:
                 base_retriever=mmr_retriever    
             )
             print("Retriever loaded successfully.")
-            return self.retriever
+        return self.retriever
 
     def call_retriever(self, query):
         retriever = self.load_retriever()
         output = retriever.invoke(query) #type: ignore
         return output
+
+    async def acall_retriever_with_scores(self, query) -> List[Tuple[Document, float]]:
+        """
+        Retrieve with relevance scores kept: candidates come from a scored similarity search
+        and are then filtered by the same LLM compressor as load_retriever.
+        """
+        retriever = self.load_retriever()
+        top_k = self.config['retriever']['top_k'] if 'retriever' in self.config else 3
+        scored = await self.vs.asimilarity_search_with_relevance_scores(query, k=top_k) #type: ignore
+        kept = await retriever.base_compressor.acompress_documents([doc for doc, _ in scored], query) #type: ignore
+        kept_ids = {id(doc) for doc in kept}
+        return [(doc, score) for doc, score in scored if id(doc) in kept_ids]
@@ -0,0 +1,203 @@
+import math
+import time
+import asyncio
+import ipaddress
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Iterable, Optional, Sequence
+from product_assistant.utils.metrics import METRICS
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+IN_FLIGHT = METRICS.gauge("admission_in_flight", "Chat requests currently running the workflow.")
+QUEUE_DEPTH = METRICS.gauge("admission_queue_depth", "Chat requests waiting for a workflow slot.")
+WAIT_SECONDS = METRICS.histogram("admission_wait_seconds", "Time chat requests spent queued before admission.",
+                                 buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+REJECTED = METRICS.counter("admission_rejected_total", "Chat requests turned away by admission control.", ["reason"])
+
+
+class AdmissionRejected(Exception):
+    """Raised instead of queueing; the router turns it into a 429/503 with Retry-After."""
+
+    def __init__(self, status_code: int, reason: str, retry_after_s: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, per-client fair wait queue for the chat endpoint.
+
+    At most `max_concurrency` requests run the workflow at once. Further requests wait in a
+    queue of at most `max_queue` entries (503 when full) with at most `max_queue_per_client`
+    per client (429 beyond that), for up to `queue_timeout_s` (503 on timeout). Freed slots go
+    to waiting clients round-robin, so one client's burst cannot starve everyone else
+    (`fair=False` gives plain FIFO). Retry-After is estimated from the current backlog and
+    the moving average of slot hold times. Meant for a single event loop (one per worker).
+
+    Clients are keyed by peer address; X-Client-ID / X-Forwarded-For are honoured only on
+    requests from `trusted_proxies` (addresses or CIDRs), since any client can set them.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 64, max_queue_per_client: int = 8,
+                 queue_timeout_s: float = 30.0, fair: bool = True, trusted_proxies: Iterable[str] = ()):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.queue_timeout_s = queue_timeout_s
+        self.fair = fair
+        self.trusted_proxies = tuple(ipaddress.ip_network(p, strict=False) for p in trusted_proxies)
+        self._active = 0
+        self._queued = 0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {}
+        self._ring: Deque[str] = deque()  # clients with waiters, in round-robin order
+        self._service_ewma_s: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, cfg: Dict) -> "AdmissionController":
+        return cls(max_concurrency=cfg.get("max_concurrency", 8), max_queue=cfg.get("max_queue", 64),
+                   max_queue_per_client=cfg.get("max_queue_per_client", 8),
+                   queue_timeout_s=cfg.get("queue_timeout_s", 30.0), fair=cfg.get("fair", True),
+                   trusted_proxies=cfg.get("trusted_proxies") or ())
+
+    # ---------------- Helpers ----------------
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained, at least 1."""
+        service_s = self._service_ewma_s or 1.0
+        backlog = self._active + self._queued
+        return max(1, math.ceil(service_s * backlog / self.max_concurrency))
+
+    def _reject(self, status_code: int, reason: str, client_id: str):
+        REJECTED.inc(reason=reason)
+        retry_after_s = self.retry_after()
+        log.warning("Request rejected by admission control", reason=reason, client=client_id,
+                    in_flight=self._active, queued=self._queued, retry_after_s=retry_after_s)
+        raise AdmissionRejected(status_code, reason, retry_after_s)
+
+    def _update_gauges(self):
+        IN_FLIGHT.set(self._active)
+        QUEUE_DEPTH.set(self._queued)
+
+    def _discard_waiter(self, key: str, waiter: asyncio.Future):
+        queue = self._queues.get(key)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[key]
+            self._ring.remove(key)
+
+    # ---------------- Slots ----------------
+    async def acquire(self, client_id: str) -> float:
+        """Wait for a workflow slot; returns the seconds spent queued or raises AdmissionRejected."""
+        if self._active < self.max_concurrency and not self._queued:
+            self._active += 1
+            self._update_gauges()
+            WAIT_SECONDS.observe(0.0)
+            return 0.0
+
+        key = client_id if self.fair else "*"
+        if self._queued >= self.max_queue:
+            self._reject(503, "queue_full", client_id)
+        queue = self._queues.get(key)
+        if self.fair and queue is not None and len(queue) >= self.max_queue_per_client:
+            self._reject(429, "client_queue_full", client_id)
+
+        waiter = asyncio.get_running_loop().create_future()
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._ring.append(key)
+        queue.append(waiter)
+        self._queued += 1
+        self._update_gauges()
+
+        started = time.perf_counter()
+        try:
+            # asyncio.wait, not wait_for: on 3.10 wait_for swallows a cancellation that arrives
+            # after the slot was handed over, and the cancelled request would run anyway.
+            done, _ = await asyncio.wait({waiter}, timeout=self.queue_timeout_s)
+        except BaseException:
+            # Cancelled (client went away): give back a slot that was already handed over.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard_waiter(key, waiter)
+                self._update_gauges()
+            raise
+        if not done:
+            self._discard_waiter(key, waiter)
+            self._update_gauges()
+            self._reject(503, "queue_timeout", client_id)
+        waited_s = time.perf_counter() - started
+        WAIT_SECONDS.observe(waited_s)
+        return waited_s
+
+    def release(self, held_s: Optional[float] = None):
+        """Free a slot, handing it straight to the next waiting client in round-robin order."""
+        if held_s is not None:
+            self._service_ewma_s = held_s if self._service_ewma_s is None else \
+                0.8 * self._service_ewma_s + 0.2 * held_s
+        while self._ring:
+            key = self._ring.popleft()
+            queue = self._queues[key]
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._ring.append(key)
+            else:
+                del self._queues[key]
+            if not waiter.done():
+                waiter.set_result(None)  # the slot moves to the waiter; _active is unchanged
+                self._update_gauges()
+                return
+        self._active -= 1
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(self, client_id: str):
+        """`async with controller.slot(client):` - hold a workflow slot for the duration of the block."""
+        waited_s = await self.acquire(client_id)
+        started = time.perf_counter()
+        try:
+            yield waited_s
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def client_id(self, request) -> str:
+        return client_id_from(request, self.trusted_proxies)
+
+    def stats(self) -> Dict:
+        return {"in_flight": self._active, "queued": self._queued, "clients_waiting": len(self._ring),
+                "service_ewma_s": round(self._service_ewma_s or 0.0, 3)}
+
+
+def _is_trusted(host: str, trusted_proxies: Sequence) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+def client_id_from(request, trusted_proxies: Sequence = ()) -> str:
+    """
+    Fairness key: the peer address. Behind a trusted proxy, its X-Client-ID, else the last
+    X-Forwarded-For hop that is not itself a trusted proxy.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer, trusted_proxies):
+        return peer
+    client_id = request.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted(hop, trusted_proxies):
+                return hop
+        if hops:
+            return hops[0]
+    return peer
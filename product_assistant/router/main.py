@@ -1,15 +1,42 @@
+import os
+import time
+import threading
 import uvicorn
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from pathlib import Path
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request, Form, Depends
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from langchain_core.messages import HumanMessage
-from workflow.agentic_rag_workflow import AgenticRAG
+from starlette.concurrency import run_in_threadpool
+from product_assistant.workflow.agentic_rag_workflow import AgenticRAG
+from product_assistant.router.admission import AdmissionController, AdmissionRejected
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.metrics import METRICS, PROMETHEUS_CONTENT_TYPE
+from product_assistant.utils.tracing import bind_request_id, clear_request_id
+from product_assistant.utils.query_log import QueryLog, normalize_query
+from product_assistant.utils.ttl_cache import TTLCache
+from product_assistant.etl.cache_warmer import load_warm_cache, warm_cache_path
 
-app = FastAPI()
-app.mount('/static', StaticFiles(directory='static'), name='static')
-templates = Jinja2Templates(directory='templates')
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warmed answers are served from the first request on, and the agent is built before any
+    # request needs it (in a worker thread: model clients and the graph take a while).
+    get_answer_cache()
+    get_query_log()
+    await run_in_threadpool(get_rag_agent)
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+app.mount('/static', StaticFiles(directory=BASE_DIR / 'static'), name='static')
+templates = Jinja2Templates(directory=BASE_DIR / 'templates')
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,13 +46,145 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+HTTP_REQUESTS = METRICS.counter("http_requests_total", "HTTP requests by route, method and status.",
+                                ["route", "method", "status"])
+HTTP_SECONDS = METRICS.histogram("http_request_duration_seconds", "HTTP request latency by route.",
+                                 ["route", "method"])
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Give every request an id (honouring X-Request-ID), bind it to the logs and record latency."""
+    request_id = bind_request_id(request.headers.get("x-request-id"))
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_SECONDS.observe(time.perf_counter() - started, route=route, method=request.method)
+        HTTP_REQUESTS.inc(route=route, method=request.method, status=status)
+        clear_request_id()
+
+
+ANSWER_CACHE = METRICS.counter("answer_cache_requests_total", "Chat requests by warm answer cache result.",
+                               ["result"])
+
+
+_rag_agent_lock = threading.Lock()
+
+
+def get_rag_agent() -> AgenticRAG:
+    """
+    One agent (models, retriever, compiled graph) per process, shared by all requests and kept
+    on `app.state.rag_agent`. Built at most once: conversations live in the agent's
+    checkpointer, so a second instance would lose their history.
+    """
+    agent = getattr(app.state, "rag_agent", None)
+    if agent is None:
+        with _rag_agent_lock:
+            agent = getattr(app.state, "rag_agent", None)
+            if agent is None:
+                agent = AgenticRAG()
+                agent.warm(_load_warm_entries())
+                app.state.rag_agent = agent
+    return agent
+
+
+def _load_warm_entries():
+    """Warm cache entries that have not expired, each with its remaining "ttl_s"."""
+    return load_warm_cache(ttl_s=load_config().get("cache_warmer", {}).get("answer_ttl_s", 24 * 3600))
+
+
+def _warm_cache_signature():
+    try:
+        stat = os.stat(warm_cache_path())
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size  # the warmer replaces the file atomically
+
+
+_answer_cache_lock = threading.Lock()
+_answer_cache = {"signature": None, "cache": None}
+
+
+def get_answer_cache() -> TTLCache:
+    """
+    Precomputed answers for popular questions (etl/cache_warmer.py), keyed by normalized query.
+    Reloaded whenever the warm cache file changes: a new warm-up run replaces it, an ingestion
+    run deletes it. The agent's retrieval cache is reset along with it.
+    """
+    signature = _warm_cache_signature()
+    with _answer_cache_lock:
+        if _answer_cache["cache"] is not None and _answer_cache["signature"] == signature:
+            return _answer_cache["cache"]
+        entries = _load_warm_entries()
+        cache = TTLCache(max_size=max(len(entries), 1))
+        for entry in entries:
+            if entry.get("answer"):
+                cache.set(entry["normalized"], entry["answer"], entry["ttl_s"])
+        reload = _answer_cache["cache"] is not None
+        _answer_cache.update(signature=signature, cache=cache)
+    agent = getattr(app.state, "rag_agent", None)
+    if reload and agent is not None:
+        agent.retrieval_cache.clear()
+        agent.warm(entries)
+    return cache
+
+
+@lru_cache(maxsize=1)
+def get_query_log() -> Optional[QueryLog]:
+    cfg = load_config().get("query_log", {})
+    if not cfg.get("enabled", True):
+        return None
+    # Relative to the working directory, like the other data/ paths (the cache warmer reads it there)
+    return QueryLog(os.path.join(os.getcwd(), cfg.get("path", "data/query_log.jsonl")),
+                    max_bytes=cfg.get("max_bytes", 50 * 1024 * 1024), backup_count=cfg.get("backup_count", 3))
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    """Concurrency limit + fair wait queue in front of the workflow (config `admission`)."""
+    return AdmissionController.from_config(load_config().get("admission", {}))
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    return JSONResponse({"error": "Server is busy, please retry shortly.", "reason": exc.reason},
+                        status_code=exc.status_code, headers={"Retry-After": str(exc.retry_after_s)})
+
+
 # ---------------- FastAPI Endpoints ----------------
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint: HTTP, span (node/retriever/LLM/MCP) and token metrics."""
+    return Response(METRICS.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 @app.post('/get')
-async def chat(msg: str = Form(...)):
-    rag_agent = AgenticRAG()
-    response = await rag_agent.run(msg)
-    return {"response": response}
\ No newline at end of file
+async def chat(request: Request, msg: str = Form(...), thread_id: Optional[str] = Form(None),
+               admission: AdmissionController = Depends(get_admission_controller),
+               answer_cache: TTLCache = Depends(get_answer_cache),
+               query_log: Optional[QueryLog] = Depends(get_query_log)):
+    started = time.perf_counter()
+    # Stand-alone questions (no conversation thread) can be answered from the warm cache.
+    response = answer_cache.get(normalize_query(msg)) if thread_id is None else None
+    cached = response is not None
+    if thread_id is None:
+        ANSWER_CACHE.inc(result="hit" if cached else "miss")
+    if not cached:
+        # Resolved only on a miss; normally already built by the lifespan, so this returns at once.
+        rag_agent = await run_in_threadpool(get_rag_agent)
+        # Each request fans out into several LLM calls; admission keeps that bounded under spikes.
+        async with admission.slot(admission.client_id(request)):
+            # Conversations keep their turns in the agent's checkpointer; one-shot questions keep nothing.
+            response = await rag_agent.arun(msg, thread_id=thread_id)
+    if query_log is not None:
+        query_log.record(msg, latency_ms=(time.perf_counter() - started) * 1000, cached=cached, thread_id=thread_id)
+    return {"response": response}
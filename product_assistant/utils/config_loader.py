@@ -1,13 +1,19 @@
 # utils/config_loader.py
 from pathlib import Path
 import os
+import threading
 import yaml
 
+# resolved path -> (mtime_ns, parsed config); re-parsed only when the file changes
+_config_cache: dict = {}
+_config_lock = threading.Lock()
+
+
 def _project_root() -> Path:
     # .../utils/config_loader.py -> parents[1] == project root
     return Path(__file__).resolve().parents[1]
 
-def load_config(config_path: str | None = None) -> dict:
+def resolve_config_path(config_path: str | None = None) -> Path:
     """
     Resolve config path reliably irrespective of CWD.
     Priority: explicit arg > CONFIG_PATH env > <project_root>/config/config.yaml
@@ -19,9 +25,24 @@ def load_config(config_path: str | None = None) -> dict:
     path = Path(config_path)
     if not path.is_absolute():
         path = _project_root() / path
+    return path
 
-    if not path.exists():
+def load_config(config_path: str | None = None, reload: bool = False) -> dict:
+    """
+    Parsed YAML config, memoized per file and re-read only when its mtime changes
+    (or reload=True). The returned dict is shared between callers: treat it as read-only.
+    """
+    path = resolve_config_path(config_path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
\ No newline at end of file
+    with _config_lock:
+        cached = _config_cache.get(path)
+        if cached is not None and cached[0] == mtime and not reload:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        _config_cache[path] = (mtime, config)
+        return config
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+MODES = ("off", "read_write", "record", "replay")
+
+
+class LLMCacheMissError(LookupError):
+    """Raised in replay mode when a prompt has no recorded response."""
+
+
+class DiskLLMCache(BaseCache):
+    """
+    SQLite-backed LangChain LLM cache with size-based LRU eviction.
+
+    Entries are keyed by sha256 of the llm_string (model + invocation parameters, secrets
+    masked by LangChain) and the serialized prompt messages. Modes:
+    - read_write: serve hits, call the model on misses and store the result
+    - record:     always call the model and overwrite the stored response
+    - replay:     serve hits only; a miss raises LLMCacheMissError (deterministic runs)
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, mode: str = "read_write"):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unsupported LLM cache mode '{mode}'; expected one of {MODES[1:]}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, llm_string TEXT NOT NULL, payload TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_access)")
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if self.mode == "record":
+            return None
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                with self._conn:
+                    self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        if row is None:
+            if self.mode == "replay":
+                raise LLMCacheMissError(f"No recorded LLM response for prompt key {key[:12]} (replay mode)")
+            return None
+        return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if self.mode == "replay":
+            return
+        payload = json.dumps([dumps(generation) for generation in return_val])
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, llm_string, payload, size, now, now),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._stats["writes"] += 1
+            self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until the payload total fits max_bytes (lock held)."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self._stats["evictions"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            return {**self._stats, "mode": self.mode, "entries": entries, "bytes": self._total_bytes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[tuple, DiskLLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def load_llm_cache(config: Dict) -> Optional[DiskLLMCache]:
+    """
+    Return the shared disk cache described by the `llm_cache` config block, or None when
+    disabled. LLM_CACHE_MODE (off | read_write | record | replay) overrides the configured mode.
+    """
+    cache_cfg = config.get("llm_cache", {})
+    mode = os.getenv("LLM_CACHE_MODE", cache_cfg.get("mode", "off")).lower()
+    if mode not in MODES:
+        raise ValueError(f"Unsupported LLM cache mode '{mode}'; expected one of {MODES}")
+    if mode == "off":
+        return None
+
+    path = cache_cfg.get("path", os.path.join("data", "llm_cache.sqlite"))
+    max_bytes = int(cache_cfg.get("max_size_mb", 256) * 1024 * 1024)
+    key = (os.path.abspath(path), mode, max_bytes)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = DiskLLMCache(path, max_bytes=max_bytes, mode=mode)
+            log.info("LLM response cache enabled", path=path, mode=mode, max_size_mb=cache_cfg.get("max_size_mb", 256))
+        return _caches[key]
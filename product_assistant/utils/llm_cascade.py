@@ -0,0 +1,119 @@
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+from langchain_core.callbacks import CallbackManager
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+DEFAULT_ESCALATE_PHRASES = (
+    "i'm not sure", "i am not sure", "i don't know", "i do not know", "not enough information",
+    "cannot determine", "can't determine", "unable to answer", "no relevant", "unclear",
+)
+
+
+def _child_callbacks(run_manager) -> Optional[CallbackManager]:
+    """Callbacks for the inner model calls, parented to the cascade's own run (LLM run managers have no get_child)."""
+    if run_manager is None:
+        return None
+    return CallbackManager(
+        handlers=run_manager.inheritable_handlers,
+        inheritable_handlers=run_manager.inheritable_handlers,
+        parent_run_id=run_manager.run_id,
+        tags=run_manager.inheritable_tags,
+        inheritable_tags=run_manager.inheritable_tags,
+        metadata=run_manager.inheritable_metadata,
+        inheritable_metadata=run_manager.inheritable_metadata,
+    )
+
+
+class CascadingLLM(BaseChatModel):
+    """
+    Ask the small model first and escalate to the large one only when the answer looks unreliable:
+    - shorter than `min_answer_chars`, or containing one of `escalate_phrases`
+    - mean token logprob below `logprob_threshold`, when the provider returns logprobs
+      (e.g. ChatOpenAI(logprobs=True)); skipped otherwise
+    Errors from the small model also escalate. `calls` / `escalations` are shared by every
+    node and thread using the model, so they are only updated under a lock.
+    """
+
+    small: BaseChatModel
+    large: BaseChatModel
+    min_answer_chars: int = 20
+    escalate_phrases: Sequence[str] = DEFAULT_ESCALATE_PHRASES
+    logprob_threshold: Optional[float] = None
+    calls: int = 0
+    escalations: int = 0
+    _lock: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-cascade"
+
+    @property
+    def model_name(self) -> str:
+        return f"cascade({getattr(self.small, 'model_name', '?')}->{getattr(self.large, 'model_name', '?')})"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"small": getattr(self.small, "model_name", None), "large": getattr(self.large, "model_name", None)}
+
+    def escalation_reason(self, message: BaseMessage) -> Optional[str]:
+        text = str(message.content).strip()
+        if len(text) < self.min_answer_chars:
+            return "short_answer"
+        lowered = text.lower()
+        if any(phrase in lowered for phrase in self.escalate_phrases):
+            return "hedging_phrase"
+        if self.logprob_threshold is not None:
+            tokens = ((message.response_metadata or {}).get("logprobs") or {}).get("content") or []
+            logprobs = [t["logprob"] for t in tokens if isinstance(t, dict) and "logprob" in t]
+            if logprobs and sum(logprobs) / len(logprobs) < self.logprob_threshold:
+                return f"low_confidence(p={math.exp(sum(logprobs) / len(logprobs)):.2f})"
+        return None
+
+    def _count(self, escalated: bool):
+        with self._lock:
+            self.calls += 1
+            self.escalations += int(escalated)
+
+    def _result(self, message: BaseMessage, model: str, reason: Optional[str]) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=message)],
+                          llm_output={"cascade_model": model, "escalation_reason": reason})
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        callbacks = _child_callbacks(run_manager)
+        try:
+            message = self.small.invoke(messages, stop=stop, config={"callbacks": callbacks}, **kwargs)
+            reason = self.escalation_reason(message)
+        except Exception as e:
+            reason = f"small_model_error({type(e).__name__})"
+        self._count(escalated=reason is not None)
+        if reason is None:
+            return self._result(message, "small", None)
+        return self._result(self.large.invoke(messages, stop=stop, config={"callbacks": callbacks}, **kwargs),
+                            "large", reason)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        callbacks = _child_callbacks(run_manager)
+        try:
+            message = await self.small.ainvoke(messages, stop=stop, config={"callbacks": callbacks}, **kwargs)
+            reason = self.escalation_reason(message)
+        except Exception as e:
+            reason = f"small_model_error({type(e).__name__})"
+        self._count(escalated=reason is not None)
+        if reason is None:
+            return self._result(message, "small", None)
+        message = await self.large.ainvoke(messages, stop=stop, config={"callbacks": callbacks}, **kwargs)
+        return self._result(message, "large", reason)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            calls, escalations = self.calls, self.escalations
+        return {"calls": calls, "escalations": escalations,
+                "escalation_rate": round(escalations / calls, 3) if calls else 0.0}
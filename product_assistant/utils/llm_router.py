@@ -0,0 +1,264 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+
+class ProviderStats:
+    """Rolling latency / error window for one provider."""
+
+    def __init__(self, window: int = 50):
+        self._lock = threading.Lock()
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.last_failure = 0.0
+        self.calls = self.failures = self.hedges_won = 0
+
+    def record(self, latency_s: float, ok: bool):
+        with self._lock:
+            self.calls += 1
+            self.outcomes.append(ok)
+            if ok:
+                self.latencies.append(latency_s)
+            else:
+                self.failures += 1
+                self.last_failure = time.monotonic()
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return (self.outcomes.count(False) / len(self.outcomes)) if self.outcomes else 0.0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def snapshot(self) -> Dict:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate(), 3),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class LLMRouter(BaseChatModel):
+    """
+    Chat model that spreads each call over several provider models.
+
+    Providers are tried in order of health, then rolling median latency. If the first one
+    has not answered after its `hedge_percentile` latency (clamped to
+    [hedge_min_delay_s, hedge_default_delay_s] until enough samples exist), a duplicate
+    request goes to the next provider and whichever finishes first wins. A failed call
+    fails over to the next provider immediately. Providers whose recent error rate exceeds
+    `max_error_rate` are moved to the back of the order for `cooldown_s`.
+
+    Each call sends at most one hedge, and at most `max_hedges_in_flight` hedges run at once
+    across the process: when a provider slows down for everyone, further calls wait for it
+    instead of doubling the load. In the sync path the hedge clock starts when the primary
+    request is actually sent, and only hedges use the thread pool (sized to the hedge budget,
+    so they never queue); losing calls cannot be cancelled and keep their thread until the
+    provider answers.
+    """
+
+    providers: Dict[str, BaseChatModel]
+    hedge_percentile: float = 90
+    hedge_min_delay_s: float = 1.0
+    hedge_default_delay_s: float = 4.0
+    min_samples: int = 10
+    window: int = 50
+    max_error_rate: float = 0.5
+    cooldown_s: float = 30
+    max_hedges_in_flight: int = 8
+    _stats: Any = None
+    _executor: Any = None
+    _hedge_slots: Any = None
+
+    def model_post_init(self, __context: Any) -> None:
+        self._stats = {name: ProviderStats(self.window) for name in self.providers}
+        self._executor = ThreadPoolExecutor(max_workers=max(self.max_hedges_in_flight, 1), thread_name_prefix="llm-router")
+        self._hedge_slots = threading.BoundedSemaphore(max(self.max_hedges_in_flight, 1))
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-router"
+
+    @property
+    def model_name(self) -> str:
+        return "router(" + ",".join(self.providers) + ")"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"providers": list(self.providers)}
+
+    # ---------------- Policy ----------------
+    def ranked_providers(self) -> List[str]:
+        now = time.monotonic()
+
+        def rank(item: Tuple[int, str]):
+            position, name = item
+            stats = self._stats[name]
+            cooling = stats.error_rate() > self.max_error_rate and now - stats.last_failure < self.cooldown_s
+            median = stats.percentile(50)
+            return (cooling, median if median is not None else 0.0, position)
+
+        return [name for _, name in sorted(enumerate(self.providers), key=rank)]
+
+    def hedge_delay(self, name: str) -> float:
+        stats = self._stats[name]
+        if len(stats.latencies) < self.min_samples:
+            return self.hedge_default_delay_s
+        return min(max(stats.percentile(self.hedge_percentile), self.hedge_min_delay_s), self.hedge_default_delay_s)  # type: ignore
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    # ---------------- Calls ----------------
+    def _call(self, name: str, messages: List[BaseMessage], stop, kwargs):
+        started = time.perf_counter()
+        try:
+            message = self.providers[name].invoke(messages, stop=stop, **kwargs)
+        except Exception:
+            self._stats[name].record(time.perf_counter() - started, ok=False)
+            raise
+        self._stats[name].record(time.perf_counter() - started, ok=True)
+        return message
+
+    async def _acall(self, name: str, messages: List[BaseMessage], stop, kwargs):
+        started = time.perf_counter()
+        try:
+            message = await self.providers[name].ainvoke(messages, stop=stop, **kwargs)
+        except asyncio.CancelledError:
+            raise  # lost the hedge race; not the provider's fault
+        except Exception:
+            self._stats[name].record(time.perf_counter() - started, ok=False)
+            raise
+        self._stats[name].record(time.perf_counter() - started, ok=True)
+        return message
+
+    def _result(self, name: str, message, hedged: bool) -> ChatResult:
+        if hedged:
+            self._stats[name].hedges_won += 1
+        return ChatResult(generations=[ChatGeneration(message=message)], llm_output={"provider": name})
+
+    def _start(self, name: str, messages: List[BaseMessage], stop, kwargs) -> Future:
+        """Primary request on its own thread, so it never queues behind hedges in the pool."""
+        future: Future = Future()
+
+        def run():
+            future.started_at = time.monotonic()  # type: ignore[attr-defined]
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._call(name, messages, stop, kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f"llm-router-{name}", daemon=True).start()
+        return future
+
+    def _hedge(self, name: str, messages: List[BaseMessage], stop, kwargs) -> Optional[Future]:
+        """Hedge request on the pool, or None when `max_hedges_in_flight` are already running."""
+        if not self._hedge_slots.acquire(blocking=False):
+            return None
+        future = self._executor.submit(self._call, name, messages, stop, kwargs)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        queue = self.ranked_providers()
+        running: Dict[Future, str] = {}
+        last_error: Optional[BaseException] = None
+        first, primary, can_hedge = "", None, True
+
+        while running or queue:
+            if not running:
+                first = queue.pop(0)
+                if not queue:
+                    # Nothing left to hedge or fail over to: a plain call on the caller's thread.
+                    try:
+                        return self._result(first, self._call(first, messages, stop, kwargs), hedged=False)
+                    except Exception as e:
+                        last_error = e
+                        log.warning("LLM provider failed, failing over", provider=first, error=str(e))
+                        break
+                primary = self._start(first, messages, stop, kwargs)
+                running[primary] = first
+
+            timeout = None
+            if can_hedge and queue and list(running) == [primary]:
+                started_at = getattr(primary, "started_at", None)
+                delay = self.hedge_delay(first)
+                timeout = delay if started_at is None else max(started_at + delay - time.monotonic(), 0.0)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if getattr(primary, "started_at", None) is None:
+                    continue  # the clock only runs once the request is sent
+                hedge = self._hedge(queue[0], messages, stop, kwargs)
+                can_hedge = False
+                if hedge is None:
+                    log.info("Hedge budget exhausted, waiting on slow LLM call", slow_provider=first)
+                    continue
+                log.info("Hedging slow LLM call", slow_provider=first, hedge_provider=queue[0])
+                running[hedge] = queue.pop(0)
+                continue
+            for future in done:
+                name = running.pop(future)
+                try:
+                    message = future.result()
+                except Exception as e:
+                    last_error = e
+                    log.warning("LLM provider failed, failing over", provider=name, error=str(e))
+                    continue
+                return self._result(name, message, hedged=name != first)
+        raise last_error if last_error else RuntimeError("No LLM providers configured")
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        queue = self.ranked_providers()
+        running: Dict[asyncio.Task, str] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch():
+            name = queue.pop(0)
+            task = asyncio.ensure_future(self._acall(name, messages, stop, kwargs))
+            running[task] = name
+            return task
+
+        first, can_hedge = running[launch()], True
+        try:
+            while running:
+                timeout = self.hedge_delay(first) if can_hedge and queue and len(running) == 1 else None
+                done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    can_hedge = False
+                    if not self._hedge_slots.acquire(blocking=False):
+                        log.info("Hedge budget exhausted, waiting on slow LLM call", slow_provider=first)
+                        continue
+                    log.info("Hedging slow LLM call", slow_provider=first, hedge_provider=queue[0])
+                    launch().add_done_callback(lambda _: self._hedge_slots.release())
+                    continue
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        log.warning("LLM provider failed, failing over", provider=name, error=str(last_error))
+                        continue
+                    return self._result(name, task.result(), hedged=name != first)
+                if not running and queue:
+                    first = running[launch()]
+        finally:
+            for task in running:
+                task.cancel()
+        raise last_error if last_error else RuntimeError("No LLM providers configured")
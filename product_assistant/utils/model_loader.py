@@ -1,10 +1,13 @@
 import os
 import sys
 import json
+import threading
+from typing import Any, Callable, Dict, Optional
 from dotenv import load_dotenv
 from product_assistant.utils.config_loader import load_config
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_groq import ChatGroq
+from product_assistant.utils.llm_cache import load_llm_cache
+from product_assistant.utils.llm_router import LLMRouter
+from product_assistant.utils.llm_cascade import CascadingLLM
 from product_assistant.logger import GLOBAL_LOGGER as log
 from product_assistant.exception.custom_exception import ProductAssistantException
 import asyncio
@@ -51,23 +54,103 @@ class ApiKeyManager:
         return val
 
 
-class ModelLoader:
-    """
-    Loads embedding models and LLMs based on config and environment.
-    """
+_env_loaded = False
+_env_lock = threading.Lock()
 
-    def __init__(self):
+
+def load_env(force: bool = False):
+    """Load .env once per process (skipped in production, where env comes from the platform)."""
+    global _env_loaded
+    with _env_lock:
+        if _env_loaded and not force:
+            return
         if os.getenv("ENV", "local").lower() != "production":
-            load_dotenv()
+            load_dotenv(override=force)
             log.info("Running in LOCAL mode: .env loaded")
         else:
             log.info("Running in PRODUCTION mode")
+        _env_loaded = True
 
-        self.api_key_mgr = ApiKeyManager()
-        self.config = load_config()
-        log.info("YAML config loaded", config_keys=list(self.config.keys()))
 
-    
+class ModelRegistry:
+    """
+    Process-wide, thread-safe store of the expensive objects ModelLoader hands out.
+
+    The API key manager is built once and model clients are memoized per spec (the config
+    block they were built from), so every component shares the same clients and their HTTP
+    connection pools. Config is read through load_config, which re-parses only when the
+    file's mtime changes; reload() drops everything so the next lookup rebuilds from the
+    current file and environment.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._api_key_mgr: Optional[ApiKeyManager] = None
+        self._models: Dict[tuple, Any] = {}
+        # The parsed config the cached clients belong to; load_config returns a new object once
+        # the file changes, and anyone may trigger that re-parse before reload() runs.
+        self._config: Optional[Dict] = load_config()
+
+    def api_key_manager(self) -> ApiKeyManager:
+        with self._lock:
+            if self._api_key_mgr is None:
+                load_env()
+                self._api_key_mgr = ApiKeyManager()
+            return self._api_key_mgr
+
+    def get_or_create(self, kind: str, spec: Dict, factory: Callable[[], Any]) -> Any:
+        """Return the object built for (kind, spec), calling factory() only on the first request."""
+        key = (kind, json.dumps(spec, sort_keys=True, default=str))
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = factory()
+                log.info("Model client created", kind=kind, cached_models=len(self._models))
+            return self._models[key]
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read .env and config.yaml and drop cached keys and clients if the config changed
+        (always with force=True). Returns True when the cache was cleared.
+        """
+        with self._lock:
+            after = load_config(reload=force)
+            if after is self._config and not force:
+                return False
+            self._config = after
+            load_env(force=True)
+            self._api_key_mgr = None
+            self._models.clear()
+            log.info("Model registry reloaded", config_keys=list(after.keys()))
+            return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"models": [kind for kind, _ in self._models], "api_keys_loaded": self._api_key_mgr is not None}
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+class ModelLoader:
+    """
+    Loads embedding models and LLMs based on config and environment.
+    Construction is cheap: keys, config and model clients come from the shared ModelRegistry.
+    """
+
+    def __init__(self):
+        self.registry = get_model_registry()
+        self.api_key_mgr = self.registry.api_key_manager()
+        self.config = load_config()
 
     def load_embeddings(self):
         """
@@ -75,53 +158,131 @@ class ModelLoader:
         """
         try:
             model_name = self.config["embedding_model"]["model_name"]
-            log.info("Loading embedding model", model=model_name)
 
-            # Patch: Ensure an event loop exists for gRPC aio
-            try:
-                asyncio.get_running_loop()
-            except RuntimeError:
-                asyncio.set_event_loop(asyncio.new_event_loop())
+            def build():
+                log.info("Loading embedding model", model=model_name)
+                # Patch: Ensure an event loop exists for gRPC aio
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    asyncio.set_event_loop(asyncio.new_event_loop())
+                from langchain_openai import OpenAIEmbeddings
+                return OpenAIEmbeddings(model=model_name)
+
+            return self.registry.get_or_create("embeddings", self.config["embedding_model"], build)
 
-            return OpenAIEmbeddings(model=model_name)
-        
         except Exception as e:
             log.error("Error loading embedding model", error=str(e))
             raise ProductAssistantException("Failed to load embedding model", sys)
 
 
-    def load_llm(self):
+    def load_llm(self, provider_key: Optional[str] = None):
         """
         Load and return the configured LLM model.
+        Provider: explicit arg > LLM_PROVIDER env > "router" if llm_router.enabled > first `llm` entry.
         """
         llm_block = self.config["llm"]
-        provider_key = os.getenv("LLM_PROVIDER", "google")
+        if provider_key is None:
+            default = "router" if self.config.get("llm_router", {}).get("enabled") else next(iter(llm_block))
+            provider_key = os.getenv("LLM_PROVIDER", default)
+
+        if provider_key == "router":
+            return self.load_llm_router()
 
         if provider_key not in llm_block:
             log.error("LLM provider not found in config", provider=provider_key)
             raise ValueError(f"LLM provider '{provider_key}' not found in config")
 
         llm_config = llm_block[provider_key]
+        spec = {
+            "provider_key": provider_key,
+            "llm": llm_config,
+            "llm_cache": self.config.get("llm_cache", {}),
+            "llm_cache_mode": os.getenv("LLM_CACHE_MODE"),
+        }
+        return self.registry.get_or_create("llm", spec, lambda: self._build_llm(llm_config))
+
+    def load_llm_for(self, node: str):
+        """
+        LLM assigned to a workflow node by `node_models` (tier name per node, default "large").
+        Tiers map to `llm` entries in `model_tiers` (null = the default provider); the special
+        tier "cascade" answers with the small tier and escalates to the large one when unsure.
+        """
+        tier = self.config.get("node_models", {}).get(node, "large")
+        if tier == "cascade":
+            cascade_cfg = self.config.get("cascade", {})
+            small, large = self._load_tier(cascade_cfg.get("small", "small")), self._load_tier(cascade_cfg.get("large", "large"))
+            spec = {"cascade": cascade_cfg, "small": id(small), "large": id(large)}
+            return self.registry.get_or_create("llm_cascade", spec, lambda: CascadingLLM(
+                small=small,
+                large=large,
+                min_answer_chars=cascade_cfg.get("min_answer_chars", 20),
+                logprob_threshold=cascade_cfg.get("logprob_threshold"),
+                **({"escalate_phrases": cascade_cfg["escalate_phrases"]} if cascade_cfg.get("escalate_phrases") else {}),
+            ))
+        return self._load_tier(tier)
+
+    def _load_tier(self, tier: str):
+        tiers = self.config.get("model_tiers", {})
+        if tier not in tiers:
+            log.error("Model tier not found in config", tier=tier)
+            raise ValueError(f"Model tier '{tier}' not found in model_tiers")
+        return self.load_llm(tiers[tier])
+
+    def load_llm_router(self):
+        """
+        Latency-aware router over the providers listed in `llm_router.providers`,
+        with hedged requests and failover (see utils/llm_router.py).
+        """
+        router_cfg = self.config.get("llm_router", {})
+        names = router_cfg.get("providers") or list(self.config["llm"])
+
+        def build():
+            log.info("Loading LLM router", providers=names)
+            return LLMRouter(
+                providers={name: self.load_llm(name) for name in names},
+                hedge_percentile=router_cfg.get("hedge_percentile", 90),
+                hedge_min_delay_s=router_cfg.get("hedge_min_delay_s", 1.0),
+                hedge_default_delay_s=router_cfg.get("hedge_default_delay_s", 4.0),
+                min_samples=router_cfg.get("min_samples", 10),
+                window=router_cfg.get("window", 50),
+                max_error_rate=router_cfg.get("max_error_rate", 0.5),
+                cooldown_s=router_cfg.get("cooldown_s", 30),
+                max_hedges_in_flight=router_cfg.get("max_hedges_in_flight", 8),
+            )
+
+        spec = {"router": router_cfg, "llm": {name: self.config["llm"].get(name) for name in names}}
+        return self.registry.get_or_create("llm_router", spec, build)
+
+    def _build_llm(self, llm_config: Dict):
         provider = llm_config.get("provider")
         model_name = llm_config.get("model_name")
         temperature = llm_config.get("temperature", 0.2)
         max_tokens = llm_config.get("max_output_tokens", 2048)
 
-        log.info("Loading LLM", provider=provider, model=model_name)
+        # Disk response cache (None when llm_cache.mode / LLM_CACHE_MODE is "off")
+        cache = load_llm_cache(self.config)
+
+        log.info("Loading LLM", provider=provider, model=model_name, cache=cache.mode if cache else "off")
 
+        # Provider SDKs are imported only for the provider actually used.
         if provider == "OpenAI":
+            from langchain_openai import ChatOpenAI
             return ChatOpenAI(
                 model=model_name,
                 api_key=self.api_key_mgr.get("OPENAI_API_KEY"),
                 temperature=temperature,
-                max_tokens=max_tokens #type: ignore
+                max_tokens=max_tokens, #type: ignore
+                cache=cache,
             )
 
         elif provider == "groq":
+            from langchain_groq import ChatGroq
             return ChatGroq(
                 model=model_name,
                 api_key=self.api_key_mgr.get("GROQ_API_KEY"), #type: ignore
                 temperature=temperature,
+                cache=cache,
             )
 
         # elif provider == "openai":
@@ -0,0 +1,103 @@
+import os
+import re
+import json
+import time
+import queue
+import atexit
+import logging
+import unicodedata
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Iterator, List, Optional
+
+_SPACES = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?!.,;:]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Cache/aggregation key for a question: NFKC, lower case, collapsed spaces, no trailing punctuation."""
+    text = unicodedata.normalize("NFKC", query or "").lower().strip()
+    return _TRAILING.sub("", _SPACES.sub(" ", text))
+
+
+class QueryLog:
+    """
+    Append-only JSONL log of the questions served by /get, rotated by size.
+    One line per request: timestamp, raw and normalized query, status, latency and whether the
+    answer came from the warm cache. Mined by the cache warmer (etl/cache_warmer.py).
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backup_count: int = 3):
+        self.path = path
+        self.backup_count = backup_count
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # A dedicated non-propagating logger: the request path only enqueues the line, a
+        # listener thread appends it to the size-rotated file.
+        self._logger = logging.getLogger(f"product_assistant.query_log.{os.path.abspath(path)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._listener: Optional[QueueListener] = None
+        if not self._logger.handlers:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                          encoding="utf-8", delay=True)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            log_queue: queue.Queue = queue.Queue()
+            self._listener = QueueListener(log_queue, handler)
+            self._listener.start()
+            atexit.register(self.close)
+            self._logger.addHandler(QueueHandler(log_queue))
+
+    def record(self, query: str, status: int = 200, latency_ms: Optional[float] = None,
+               cached: bool = False, thread_id: Optional[str] = None):
+        entry = {"ts": round(time.time(), 3), "query": query, "normalized": normalize_query(query),
+                 "status": status, "cached": cached}
+        if latency_ms is not None:
+            entry["latency_ms"] = round(latency_ms, 1)
+        if thread_id:
+            entry["thread_id"] = thread_id
+        self._logger.info(json.dumps(entry, ensure_ascii=False))
+
+    def close(self):
+        """Flush pending lines and stop the writer thread."""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+
+
+def iter_query_log(path: str, backup_count: int = 3) -> Iterator[Dict]:
+    """Entries from the current log and its rotated backups (oldest first); bad lines are skipped."""
+    paths = [f"{path}.{i}" for i in range(backup_count, 0, -1)] + [path]
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def top_queries(path: str, top_n: int = 100, min_count: int = 2, since_days: Optional[float] = 30,
+                backup_count: int = 3) -> List[Dict]:
+    """
+    Most frequent normalized questions among successful stand-alone requests, each with its most
+    common raw phrasing: [{"normalized", "query", "count"}], most frequent first. Turns of a
+    conversation (logged with a thread_id) are skipped: their meaning depends on earlier turns.
+    """
+    cutoff = time.time() - since_days * 86400 if since_days else 0
+    counts: Counter = Counter()
+    phrasings: Dict[str, Counter] = {}
+    for entry in iter_query_log(path, backup_count):
+        if entry.get("status") != 200 or entry.get("ts", 0) < cutoff or not entry.get("normalized") \
+                or entry.get("thread_id"):
+            continue
+        key = entry["normalized"]
+        counts[key] += 1
+        phrasings.setdefault(key, Counter())[entry.get("query", key).strip()] += 1
+    return [{"normalized": key, "query": phrasings[key].most_common(1)[0][0], "count": count}
+            for key, count in counts.most_common(top_n) if count >= min_count]
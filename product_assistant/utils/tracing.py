@@ -0,0 +1,198 @@
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import structlog
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from product_assistant.utils.metrics import METRICS
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+# Request id of the request being served. The router middleware sets it and binds it into
+# structlog's contextvars, so every log line emitted while serving a request carries it.
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+SPAN_SECONDS = METRICS.histogram(
+    "rag_span_duration_seconds", "Duration of pipeline spans (graph nodes, retriever, LLM and MCP calls).",
+    ["kind", "name"])
+SPAN_ERRORS = METRICS.counter("rag_span_errors_total", "Spans that ended with an exception.", ["kind", "name"])
+LLM_TOKENS = METRICS.counter("rag_llm_tokens_total", "LLM tokens by node, model and direction.",
+                             ["node", "model", "direction"])
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def bind_request_id(request_id: Optional[str] = None) -> str:
+    """Make `request_id` (or a fresh one) current for this context and for structlog output."""
+    request_id = request_id or new_request_id()
+    request_id_var.set(request_id)
+    structlog.contextvars.bind_contextvars(request_id=request_id)
+    return request_id
+
+
+def clear_request_id():
+    request_id_var.set(None)
+    structlog.contextvars.unbind_contextvars("request_id")
+
+
+def record_span(kind: str, name: str, duration_s: float, error: Optional[str] = None,
+                request_id: Optional[str] = None, **attrs):
+    """Feed one finished span into the histograms and emit it as a structured log event."""
+    SPAN_SECONDS.observe(duration_s, kind=kind, name=name)
+    if error:
+        SPAN_ERRORS.inc(kind=kind, name=name)
+    fields = {"kind": kind, "name": name, "duration_ms": round(duration_s * 1000, 2), **attrs}
+    request_id = request_id or request_id_var.get()
+    if request_id:
+        fields["request_id"] = request_id
+    if error:
+        log.warning("span", error=error, **fields)
+    else:
+        log.info("span", **fields)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """
+    Time a block as a span: `with span("mcp_tool", "web_search"): ...`.
+    Works inside coroutines too, since it only reads the clock on entry and exit.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        record_span(kind, name, time.perf_counter() - started, error=type(e).__name__, **attrs)
+        raise
+    record_span(kind, name, time.perf_counter() - started, **attrs)
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback that turns graph runs into spans:
+    - node: the run LangGraph opens for each node (run name == `langgraph_node`)
+    - retriever: every retriever invocation (outer compression retriever and inner vector search)
+    - llm: every leaf model call, with input/output token counts
+    The request id is taken from the run metadata (`request_id`, set by AgenticRAG.run/arun),
+    which is inherited by child runs, so it survives thread pools where contextvars may not.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[UUID, Dict] = {}
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], kind: str, name: str,
+               metadata: Optional[Dict]):
+        metadata = metadata or {}
+        with self._lock:
+            if parent_run_id in self._runs:
+                self._runs[parent_run_id]["has_children"] = True
+            self._runs[run_id] = {"kind": kind, "name": name, "node": metadata.get("langgraph_node", "-"),
+                                  "request_id": metadata.get("request_id"), "started": time.perf_counter(),
+                                  "has_children": False}
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attrs) -> Optional[Dict]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        if run["kind"] == "llm" and run["has_children"]:
+            return run  # wrapper (router/cascade): the inner calls are the spans
+        extra = {"node": run["node"]} if run["kind"] != "node" else {}
+        record_span(run["kind"], run["name"], time.perf_counter() - run["started"],
+                    error=type(error).__name__ if error else None, request_id=run["request_id"],
+                    **extra, **attrs)
+        return run
+
+    # ---- graph nodes ----
+    def on_chain_start(self, serialized: Dict[str, Any], inputs: Dict[str, Any], *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> Any:
+        node = (metadata or {}).get("langgraph_node")
+        if node is not None and kwargs.get("name") == node:
+            self._start(run_id, parent_run_id, "node", node, metadata)
+
+    def on_chain_end(self, outputs: Dict[str, Any], *, run_id: UUID, **kwargs: Any) -> Any:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._end(run_id, error)
+
+    # ---- retriever ----
+    def on_retriever_start(self, serialized: Dict[str, Any], query: str, *, run_id: UUID,
+                           parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                           **kwargs: Any) -> Any:
+        self._start(run_id, parent_run_id, "retriever", kwargs.get("name") or "retriever", metadata)
+
+    def on_retriever_end(self, documents, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._end(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._end(run_id, error)
+
+    # ---- LLM calls ----
+    def _llm_start(self, run_id, parent_run_id, metadata, kwargs):
+        metadata = metadata or {}
+        model = (metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model_name")
+                 or "unknown")
+        self._start(run_id, parent_run_id, "llm", model, metadata)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                            **kwargs: Any) -> Any:
+        self._llm_start(run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                     **kwargs: Any) -> Any:
+        self._llm_start(run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> Any:
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens):
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens, output_tokens = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        run = self._end(run_id, input_tokens=input_tokens, output_tokens=output_tokens)
+        if run is not None and not run["has_children"]:
+            LLM_TOKENS.inc(input_tokens, node=run["node"], model=run["name"], direction="input")
+            LLM_TOKENS.inc(output_tokens, node=run["node"], model=run["name"], direction="output")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        self._end(run_id, error)
+
+
+_tracer: Optional[TracingCallbackHandler] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> TracingCallbackHandler:
+    """Process-wide tracing callback, passed alongside the usage tracker on every graph run."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = TracingCallbackHandler()
+    return _tracer
+
+
+def trace_config(thread_id: Optional[str], *callbacks, request_id: Optional[str] = None) -> Dict:
+    """RunnableConfig for one graph run: checkpointer thread, tracer + extra callbacks, request id."""
+    return {"configurable": {"thread_id": thread_id},
+            "callbacks": [get_tracer(), *callbacks],
+            "metadata": {"request_id": request_id or request_id_var.get() or new_request_id()}}
+
+
+if __name__ == "__main__":
+    bind_request_id("demo-request")
+    with span("mcp_tool", "web_search", query="iphone 15 price"):
+        time.sleep(0.05)
+    print(METRICS.render())
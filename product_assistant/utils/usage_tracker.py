@@ -0,0 +1,85 @@
+import time
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+
+class NodeUsageTracker(BaseCallbackHandler):
+    """
+    Callback that accounts LLM calls, tokens and latency per LangGraph node and model.
+
+    The node comes from the `langgraph_node` metadata LangGraph attaches to every run inside
+    a node (direct calls outside a graph are reported as "-"). Only leaf model runs are
+    counted, so wrappers such as CascadingLLM don't double count their inner calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs: Dict[UUID, Dict] = {}
+        self._totals: Dict[tuple, Dict] = defaultdict(
+            lambda: {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_s": 0.0, "errors": 0})
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], metadata: Optional[Dict], kwargs: Dict):
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or (kwargs.get("invocation_params") or {}).get("model_name") or "unknown"
+        with self._lock:
+            if parent_run_id in self._runs:
+                self._runs[parent_run_id]["has_children"] = True
+            self._runs[run_id] = {"node": metadata.get("langgraph_node", "-"), "model": model,
+                                  "started": time.perf_counter(), "has_children": False}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[BaseMessage]], *,
+                            run_id: UUID, parent_run_id: Optional[UUID] = None,
+                            metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        self._start(run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID,
+                     parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                     **kwargs: Any) -> Any:
+        self._start(run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> Any:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None or run["has_children"]:
+            return
+        input_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens):
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            input_tokens, output_tokens = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        with self._lock:
+            totals = self._totals[(run["node"], run["model"])]
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["latency_s"] += time.perf_counter() - run["started"]
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> Any:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            if run is not None and not run["has_children"]:
+                self._totals[(run["node"], run["model"])]["errors"] += 1
+
+    def report(self) -> List[Dict]:
+        """One row per (node, model) with call count, token totals and mean latency."""
+        with self._lock:
+            rows = []
+            for (node, model), totals in sorted(self._totals.items()):
+                calls = totals["calls"] or 1
+                rows.append({"node": node, "model": model, **totals,
+                             "latency_s": round(totals["latency_s"], 3),
+                             "mean_latency_ms": round(totals["latency_s"] / calls * 1000, 1)})
+            return rows
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
@@ -1,7 +1,9 @@
-from typing import Annotated, Sequence, TypedDict, Literal
+import re
+from typing import Annotated, Optional, Sequence, TypedDict, Literal
 from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.checkpoint.memory import MemorySaver
@@ -11,7 +13,13 @@ import asyncio
 from product_assistant.prompt_library.prompts import PROMPT_REGISTRY, PromptType    
 from product_assistant.retriever.retrieval import Retriever
 from product_assistant.utils.model_loader import ModelLoader
-from product_assistant.evaluation.ragas_eval import evaluate_response_precision, evaluate_response_relevancy
+from product_assistant.utils.usage_tracker import NodeUsageTracker
+from product_assistant.utils.tracing import trace_config
+from product_assistant.utils.ttl_cache import TTLCache
+from product_assistant.utils.query_log import normalize_query
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+_GRADE = re.compile(r"\b(generator|rewriter|yes|no)\b")
 
 
 class AgenticRAG:
@@ -19,14 +27,38 @@ class AgenticRAG:
 
     class AgentState(TypedDict):
         messages: Annotated[Sequence[BaseMessage], add_messages]
+        question: str  # the user's question in the current turn
+        rewrites: int  # query rewrites in the current turn
+
+    NODES = ("assistant", "grader", "generator", "rewriter")
 
-    def __init__(self):
-        self.retriver_obj = Retriever()
-        self.model_loader = ModelLoader()
-        self.llm = self.model_loader.load_llm()
+    def __init__(self, llm=None, retriever=None, node_llms=None, intent_router=None, max_rewrites: int = 2):
+        """
+        Each node gets the model configured for it in `node_models` (see ModelLoader.load_llm_for).
+        `llm` (one model for every node), `node_llms` (per-node overrides), `retriever` and
+        `intent_router` accept stand-ins, e.g. product_assistant.benchmarks.fakes, to run the graph offline.
+        After `max_rewrites` rewrites in one turn the grader is skipped and the Generator answers.
+        """
+        self.max_rewrites = max_rewrites
+        self.retriver_obj = Retriever() if retriever is None else None
+        self.retriever = retriever
+        node_llms = node_llms or {}
+        if llm is None and any(node not in node_llms for node in self.NODES):
+            model_loader = ModelLoader()
+            self.llms = {node: node_llms.get(node) or model_loader.load_llm_for(node) for node in self.NODES}
+        else:
+            self.llms = {node: node_llms.get(node, llm) for node in self.NODES}
+        self.llm = self.llms["generator"]
+        self.intent_router = intent_router
+        self._intent_router_loaded = intent_router is not None
+        # Retrievals for popular questions, precomputed by the cache warmer (see warm())
+        self.retrieval_cache = TTLCache(max_size=1024, ttl_s=24 * 3600)
+        self.usage = NodeUsageTracker()
         self.checkpointer = MemorySaver()
         self.workflow = self._build_workflow()
         self.app = self.workflow.compile(checkpointer=self.checkpointer)
+        # One-shot questions keep no conversation state, so nothing accumulates in the checkpointer.
+        self.oneshot_app = self.workflow.compile()
 
     # ---------------- Helpers ----------------
     def _format_docs(self, docs) -> str:
@@ -43,70 +75,131 @@ class AgenticRAG:
             )
             formatted_chunks.append(formatted)
         return "\n\n---\n\n".join(formatted_chunks)
+
+    def load_retriever(self):
+        if self.retriever is None:
+            self.retriever = self.retriver_obj.load_retriever()  # type: ignore
+        return self.retriever
+
+    def warm(self, entries, ttl_s: float = None):
+        """
+        Build the intent router's centroids, then load precomputed entries from the cache
+        warmer: query embeddings go into the intent router's vector cache and retrieved
+        documents into the retrieval cache, for the entry's remaining "ttl_s" if it has one.
+        """
+        from langchain_core.documents import Document
+        router = self.get_intent_router()
+        if router is not None:
+            try:
+                router.build()  # not inside the first user request
+            except Exception as e:
+                log.warning("Intent router build failed, routing by keyword until it succeeds", error=str(e))
+        for entry in entries:
+            if router is not None and entry.get("embedding"):
+                router.prime(entry["query"], entry["embedding"])
+            if entry.get("documents") is not None:
+                self.retrieval_cache.set(entry["normalized"], [Document(**d) for d in entry["documents"]],
+                                         entry.get("ttl_s", ttl_s))
+
+    def get_intent_router(self):
+        from product_assistant.workflow.intent_router import load_intent_router
+        if not self._intent_router_loaded:
+            self.intent_router = load_intent_router()
+            self._intent_router_loaded = True
+        return self.intent_router
+
+    def _route_intent(self, query: str):
+        """Intent of `query` from the embedding router (config `intent_router`), keyword rule if disabled."""
+        from product_assistant.workflow.intent_router import IntentDecision, keyword_intent
+        router = self.get_intent_router()
+        if router is None:
+            return IntentDecision(keyword_intent(query), 0.0, "keyword")
+        return router.route(query)
     
+    def _retrieval_query(self, state: AgentState) -> str:
+        """The question to search for: the last message, or the one before the assistant's TOOL marker."""
+        messages = state["messages"]
+        query = messages[-1].content
+        if str(query).startswith("TOOL:") and len(messages) > 1:
+            query = messages[-2].content
+        return query  # type: ignore
+
+    @staticmethod
+    def _parse_grade(score: str) -> Literal["generator", "rewriter"]:
+        """First decision word in the grader output; unparseable output goes to the Generator."""
+        match = _GRADE.search(score.lower())
+        return "rewriter" if match and match.group(1) in ("rewriter", "no") else "generator"
+
     # ---------------- Nodes ----------------
-    def _ai_assistant(self, state: AgentState):
-        """Decide whether to call the retriever or answer directly."""
+    def _ai_assistant(self, state: AgentState, config: RunnableConfig):
+        """Decide whether to call the retriever, greet, or answer directly."""
         print("--- Calling AI Assistant Node ---")
         messages = state["messages"]
         last_message = messages[-1].content
 
-        # Simple routing: if query mentions product -> go retriever
-        if any(word in last_message.lower() for word in ["product", "price", "review"]): #type: ignore
-            return {"messages": [HumanMessage(content="TOOL: retriever")]}
+        # Embedding intent routing: product -> retriever, greeting -> canned reply, general -> LLM
+        decision = self._route_intent(last_message)  # type: ignore
+        if decision.intent == "product":
+            return {"messages": [HumanMessage(content="TOOL: retriever")], "question": last_message, "rewrites": 0}
+        elif decision.intent == "greeting":
+            from product_assistant.workflow.intent_router import GREETING_REPLY
+            return {"messages": [HumanMessage(content=GREETING_REPLY)]}
         else:
             prompt = ChatPromptTemplate.from_template(
                 "You are a helpful assistant. Answer the user directly.\n\nQuestion: {question}\nAnswer:"
             )
-            chain = prompt | self.llm | StrOutputParser()
-            response = chain.invoke({"question": last_message})
+            chain = prompt | self.llms["assistant"] | StrOutputParser()
+            response = chain.invoke({"question": last_message}, config=config)
             return {"messages": [HumanMessage(content=response)]}
         
-    def _vector_retriever(self, state: AgentState):
+    def _vector_retriever(self, state: AgentState, config: RunnableConfig):
         """Fetch product info from vector DB."""
         print("--- RETRIEVER ---")
-        query = state["messages"][-1].content
-        retriever = self.retriver_obj.load_retriever()
-        docs = retriever.invoke(query)  # type: ignore
+        query = self._retrieval_query(state)
+        docs = self.retrieval_cache.get(normalize_query(query))  # type: ignore
+        if docs is None:
+            docs = self.load_retriever().invoke(query, config=config)  # type: ignore
         context = self._format_docs(docs)
         response_message = HumanMessage(content=f"CONTEXT: {context}\n\nQuestion: {query}\nAnswer:")
         return {"messages": [response_message]}
     
-    def _grade_documents(self, state: AgentState) -> Literal["generator", "rewriter"]:
+    def _grade_documents(self, state: AgentState, config: RunnableConfig) -> Literal["generator", "rewriter"]:
         """Grade docs relevance"""
         print("--- GRADER ---")
-        question = state["messages"][0].content
+        if state.get("rewrites", 0) >= self.max_rewrites:
+            return "generator"
+        question = state["question"]
         docs = state["messages"][-1].content
         prompt = ChatPromptTemplate.from_template(
             "Given the question and the retrieved documents, decide if the documents are relevant enough to answer the question. "
             "If they are relevant, return 'generator'. If they are not relevant, return 'rewriter'.\n\n"
             "Question: {question}\nDocuments: {documents}\nDecision:"
         )
-        chain = prompt | self.llm | StrOutputParser()
-        score = chain.invoke({"question": question, "documents": docs})
-        return "generator" if "yes" in score.lower() else "rewriter"
+        chain = prompt | self.llms["grader"] | StrOutputParser()
+        score = chain.invoke({"question": question, "documents": docs}, config=config)
+        return self._parse_grade(score)
     
-    def _generate(self, state: AgentState):
+    def _generate(self, state: AgentState, config: RunnableConfig):
         """Generate answer using LLM and retrieved context."""
         print("--- GENERATOR ---")
-        question = state["messages"][0].content
+        question = state["question"]
         docs = state["messages"][-1].content
         prompt = ChatPromptTemplate.from_template(
             PROMPT_REGISTRY[PromptType.PRODUCT_BOT].template
         )
-        chain = prompt | self.llm | StrOutputParser()
-        answer = chain.invoke({"question": question, "context": docs})
+        chain = prompt | self.llms["generator"] | StrOutputParser()
+        answer = chain.invoke({"question": question, "context": docs}, config=config)
         return {"messages": [HumanMessage(content=answer)]}
     
-    def _rewrite(self, state: AgentState):
+    def _rewrite(self, state: AgentState, config: RunnableConfig):
         """Rewrite question for clarity."""
         """Rewrite bad query"""
         print("--- REWRITE ---")
-        question = state["messages"][0].content
-        new_q = self.llm.invoke(
-            [HumanMessage(content=f"Rewrite this question to be more specific: {question}")]
+        question = state["question"]
+        new_q = self.llms["rewriter"].invoke(
+            [HumanMessage(content=f"Rewrite this question to be more specific: {question}")], config=config
         )
-        return {"messages": [HumanMessage(content=new_q.content)]}
+        return {"messages": [HumanMessage(content=new_q.content)], "rewrites": state.get("rewrites", 0) + 1}
 
     # ---------------- Build Workflow ----------------
     def _build_workflow(self):
@@ -126,17 +219,26 @@ class AgenticRAG:
         workflow.add_conditional_edges(
             "Retriever",
             self._grade_documents,
-            {"Generator": "Generator", "Rewriter": "Rewriter"}
+            {"generator": "Generator", "rewriter": "Rewriter"}
         )
         workflow.add_edge("Generator", END)
-        workflow.add_edge("Rewriter", "Assistant")
+        workflow.add_edge("Rewriter", "Retriever")  # a rewritten product query needs no re-routing
         return workflow
     
     # ---------------- Public Run ----------------
-    def run(self, query: str, thread_id: str = "default_thread"):
-        """Run the agentic RAG workflow."""
-        result = self.app.invoke({"messages": [HumanMessage(content=query)]},
-                                 config={"configurable":{'thread_id': thread_id}})
+    def _app_for(self, thread_id: Optional[str]):
+        return self.app if thread_id is not None else self.oneshot_app
+
+    def run(self, query: str, thread_id: Optional[str] = "default_thread"):
+        """Run the agentic RAG workflow; thread_id=None answers a stand-alone question without keeping state."""
+        result = self._app_for(thread_id).invoke({"messages": [HumanMessage(content=query)]},
+                                                 config=trace_config(thread_id, self.usage))
+        return result["messages"][-1].content
+
+    async def arun(self, query: str, thread_id: Optional[str] = "default_thread"):
+        """Async variant of run(); sync nodes execute in the default executor, off the event loop."""
+        result = await self._app_for(thread_id).ainvoke({"messages": [HumanMessage(content=query)]},
+                                                        config=trace_config(thread_id, self.usage))
         return result["messages"][-1].content
     
 if __name__ == "__main__":
@@ -2,17 +2,19 @@ from typing import Annotated, Sequence, TypedDict, Literal
 from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_mcp_adapters.client import MultiServerMCPClient
 import asyncio
 
 
 from product_assistant.prompt_library.prompts import PROMPT_REGISTRY, PromptType    
 from product_assistant.retriever.retrieval import Retriever
 from product_assistant.utils.model_loader import ModelLoader
-from product_assistant.evaluation.ragas_eval import evaluate_response_precision, evaluate_response_relevancy
+from product_assistant.utils.usage_tracker import NodeUsageTracker
+from product_assistant.utils.tracing import trace_config
+from product_assistant.mcp_servers.session_manager import get_mcp_session_manager
 
 
 class AgenticRAG:
@@ -20,60 +22,66 @@ class AgenticRAG:
 
     class AgentState(TypedDict):
         messages: Annotated[Sequence[BaseMessage], add_messages]
+        question: str  # the user's question in the current turn
         
     def __init__(self):
         self.retriver_obj = Retriever()
         self.model_loader = ModelLoader()
-        self.llm = self.model_loader.load_llm()
+        # Per-node models from config `node_models` (small tier for grading/rewriting)
+        self.llms = {node: self.model_loader.load_llm_for(node)
+                     for node in ("assistant", "grader", "generator", "rewriter")}
+        self.llm = self.llms["generator"]
+        self.intent_router = None  # embedding intent router, loaded on the first query
+        self._intent_router_loaded = False
+        self.usage = NodeUsageTracker()
         self.checkpointer = MemorySaver()
 
-        self.mcp_client = MultiServerMCPClient(
-            {
-                "hybrid_search": {
-                    "transport": "streamable-http",
-                    "url": "http://localhost:8000/mcp"
-                }
-            } #type: ignore
-        ) 
+        # Shared across instances; connects lazily on the first tool call inside the running loop.
+        self.mcp = get_mcp_session_manager()
         self.workflow = self._build_workflow()
         self.app = self.workflow.compile(checkpointer=self.checkpointer)
-        asyncio.run(self._safe_async_init())
 
-    async def _safe_async_init(self):
-        """Wrapper to safely initialize MCP client."""
-        try:
-            self.mcp_tools = await self.mcp_client.get_tools()
-            print("MCP tools initialized successfully.")
-        except Exception as e:
-            print(f"Error initializing MCP tools: {e}")
 
+    def _route_intent(self, query: str):
+        """Intent of `query` from the embedding router (config `intent_router`), keyword rule if disabled."""
+        from product_assistant.workflow.intent_router import IntentDecision, keyword_intent, load_intent_router
+        if not self._intent_router_loaded:
+            self.intent_router = load_intent_router()
+            self._intent_router_loaded = True
+        if self.intent_router is None:
+            return IntentDecision(keyword_intent(query), 0.0, "keyword")
+        return self.intent_router.route(query)
 
-    def _ai_assistant(self, state: AgentState):
+    def _ai_assistant(self, state: AgentState, config: RunnableConfig):
         print("--- CALL ASSISTANT ---")
         messages = state["messages"]
         last_message = messages[-1].content
 
-        if any(word in last_message.lower() for word in ["price", "review", "product"]): #type: ignore
-            return {"messages": [HumanMessage(content="TOOL: retriever")]}
+        decision = self._route_intent(last_message)  # type: ignore
+        if decision.intent == "product":
+            return {"messages": [HumanMessage(content="TOOL: retriever")], "question": last_message}
+        elif decision.intent == "greeting":
+            from product_assistant.workflow.intent_router import GREETING_REPLY
+            return {"messages": [HumanMessage(content=GREETING_REPLY)]}
         else:
             prompt = ChatPromptTemplate.from_template(
                 "You are a helpful assistant. Answer the user directly.\n\nQuestion: {question}\nAnswer:"
             )
-            chain = prompt | self.llm | StrOutputParser()
-            response = chain.invoke({"question": last_message}) or "I'm not sure about that."
+            chain = prompt | self.llms["assistant"] | StrOutputParser()
+            response = chain.invoke({"question": last_message}, config=config) or "I'm not sure about that."
             return {"messages": [HumanMessage(content=response)]}
 
     async def _vector_retriever(self, state: AgentState):
         print("--- RETRIEVER (MCP) ---")
         query = state["messages"][-1].content
-
-        tool = next((t for t in self.mcp_tools if t.name == "get_product_info"), None)
-        if not tool:
-            return {"messages": [HumanMessage(content="Retriever tool not found in MCP client.")]}
+        if str(query).startswith("TOOL:") and len(state["messages"]) > 1:
+            query = state["messages"][-2].content  # search for the question, not the routing marker
 
         try:
-            result = await tool.ainvoke({"query": query})
+            result = await self.mcp.call_tool("get_product_info", {"query": query})
             context = result or "No relevant product data found."
+        except KeyError:
+            context = "Retriever tool not found in MCP client."
         except Exception as e:
             context = f"Error invoking retriever: {e}"
 
@@ -82,15 +90,17 @@ class AgenticRAG:
     async def _web_search(self, state: AgentState):
         print("--- WEB SEARCH (MCP) ---")
         query = state["messages"][-1].content
-        tool = next(t for t in self.mcp_tools if t.name == "web_search")
-        result = await tool.ainvoke({"query": query})  # ✅
-        context = result if result else "No data from web"
+        try:
+            result = await self.mcp.call_tool("web_search", {"query": query})
+            context = result if result else "No data from web"
+        except Exception as e:
+            context = f"Error invoking web search: {e}"
         return {"messages": [HumanMessage(content=context)]}
 
 
-    def _grade_documents(self, state: AgentState) -> Literal["generator", "rewriter"]:
+    def _grade_documents(self, state: AgentState, config: RunnableConfig) -> Literal["generator", "rewriter"]:
         print("--- GRADER ---")
-        question = state["messages"][0].content
+        question = state["question"]
         docs = state["messages"][-1].content
 
         prompt = PromptTemplate(
@@ -98,39 +108,39 @@ class AgenticRAG:
             Are docs relevant to the question? Answer yes or no.""",
             input_variables=["question", "docs"],
         )
-        chain = prompt | self.llm | StrOutputParser()
-        score = chain.invoke({"question": question, "docs": docs}) or ""
+        chain = prompt | self.llms["grader"] | StrOutputParser()
+        score = chain.invoke({"question": question, "docs": docs}, config=config) or ""
         return "generator" if "yes" in score.lower() else "rewriter"
 
-    def _generate(self, state: AgentState):
+    def _generate(self, state: AgentState, config: RunnableConfig):
         print("--- GENERATE ---")
-        question = state["messages"][0].content
+        question = state["question"]
         docs = state["messages"][-1].content
 
         prompt = ChatPromptTemplate.from_template(
             PROMPT_REGISTRY[PromptType.PRODUCT_BOT].template
         )
-        chain = prompt | self.llm | StrOutputParser()
+        chain = prompt | self.llms["generator"] | StrOutputParser()
 
         try:
-            response = chain.invoke({"context": docs, "question": question}) or "No response generated."
+            response = chain.invoke({"context": docs, "question": question}, config=config) or "No response generated."
         except Exception as e:
             response = f"Error generating response: {e}"
 
         return {"messages": [HumanMessage(content=response)]}
 
-    def _rewrite(self, state: AgentState):
+    def _rewrite(self, state: AgentState, config: RunnableConfig):
         print("--- REWRITE ---")
-        question = state["messages"][0].content
+        question = state["question"]
 
         prompt = ChatPromptTemplate.from_template(
             "Rewrite this user query to make it more clear and specific for a search engine. "
             "Do NOT answer the query. Only rewrite it.\n\nQuery: {question}\nRewritten Query:"
         )
-        chain = prompt | self.llm | StrOutputParser()
+        chain = prompt | self.llms["rewriter"] | StrOutputParser()
 
         try:
-            new_q = chain.invoke({"question": question}).strip()
+            new_q = chain.invoke({"question": question}, config=config).strip()
         except Exception as e:
             new_q = f"Error rewriting query: {e}"
 
@@ -168,6 +178,6 @@ class AgenticRAG:
         """Run the workflow for a given query and return the final answer."""
         result = await self.app.ainvoke(
             {"messages": [HumanMessage(content=query)]},
-            config={"configurable": {"thread_id": thread_id}}
+            config=trace_config(thread_id, self.usage)
         )
         return result["messages"][-1].content
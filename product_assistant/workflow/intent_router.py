@@ -0,0 +1,327 @@
+import os
+import csv
+import time
+import asyncio
+import hashlib
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+from product_assistant.utils.config_loader import load_config
+from product_assistant.utils.metrics import METRICS
+from product_assistant.utils.query_log import normalize_query
+from product_assistant.utils.ttl_cache import TTLCache
+from product_assistant.logger import GLOBAL_LOGGER as log
+
+# Labelled seed set. "product" is further extended with centroids over the catalog titles.
+SEED_INTENTS: Dict[str, List[str]] = {
+    "product": [
+        "What is the price of this phone?",
+        "Show me reviews for these earbuds",
+        "How good is the camera on the Pixel?",
+        "Which laptop has the best battery life?",
+        "Compare Galaxy S24 and iPhone 15",
+        "Is this smartwatch worth buying?",
+        "Best headphones under 5000 rupees",
+        "What do customers say about the display quality?",
+        "What is the rating of the OnePlus 12?",
+        "Recommend a budget smartphone with a good camera",
+        "Does this tablet support a stylus?",
+        "How is the sound quality of these speakers?",
+        "Any complaints about overheating in this model?",
+        "Cheapest noise cancelling headphones with good reviews",
+    ],
+    "greeting": [
+        "Hello", "Hi there", "Hey!", "Good morning", "Thanks a lot", "Thank you",
+        "Bye", "See you later", "Who are you?", "What can you do?",
+    ],
+    "general": [
+        "Tell me a fun fact",
+        "What is the capital of France?",
+        "Write a poem about the sea",
+        "Explain how photosynthesis works",
+        "What's the weather like today?",
+        "Who won the football world cup?",
+        "Translate good night into Spanish",
+        "How do I cook pasta?",
+        "Solve 12 times 17",
+        "Tell me a joke",
+    ],
+}
+
+GREETING_REPLY = ("Hi! I can help you find products, compare prices and summarise customer reviews. "
+                  "What are you shopping for?")
+ROUTING_KEYWORDS = ("product", "price", "review")
+
+INTENT_DECISIONS = METRICS.counter("rag_intent_decisions_total", "Assistant routing decisions by intent and method.",
+                                   ["intent", "method"])
+
+
+class IntentDecision(NamedTuple):
+    intent: str
+    score: float
+    method: str  # "embedding" | "keyword"
+
+
+def keyword_intent(query: str) -> str:
+    """The original routing rule, used when the embedding match is not confident."""
+    return "product" if any(word in query.lower() for word in ROUTING_KEYWORDS) else "general"
+
+
+def load_catalog_titles(path: str, limit: Optional[int] = None) -> List[str]:
+    """Unique `product_title` values from the scraped catalog CSV (empty when it doesn't exist yet)."""
+    if not path or not os.path.exists(path):
+        return []
+    titles, seen = [], set()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            title = (row.get("product_title") or "").strip()
+            if title and title not in seen:
+                seen.add(title)
+                titles.append(title)
+                if limit and len(titles) >= limit:
+                    break
+    return titles
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans_centroids(vectors: np.ndarray, k: int, iterations: int = 15, seed: int = 0) -> np.ndarray:
+    """Spherical k-means: a few unit-length centroids that summarise many title embeddings."""
+    vectors = _normalize(vectors.astype(np.float32))
+    if len(vectors) <= k:
+        return vectors
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for j in range(k):
+            members = vectors[assignment == j]
+            if len(members):
+                centroids[j] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+    return centroids
+
+
+class IntentRouter:
+    """
+    Embedding-based intent classifier for the assistant node.
+
+    Every intent is represented by one or more unit-length centroids (the mean of its seed
+    phrases, plus k-means centroids of the catalog titles for "product"), stacked into one
+    matrix. Routing a query is a single matrix-vector product and an argmax; the query
+    embedding is the only remote call and repeated queries hit a small vector cache.
+    Centroids are cached on disk keyed by the embedding model, seeds and titles.
+    A decision is accepted when the best score is >= `min_score` and beats the best other
+    intent by `min_margin`; otherwise the keyword rule decides. The keyword rule also decides
+    while the centroids cannot be built (embeddings outage); a failed build is retried after
+    `build_retry_s` rather than on every request.
+    """
+
+    def __init__(self, embeddings, seeds: Optional[Dict[str, List[str]]] = None,
+                 catalog_titles: Sequence[str] = (), title_centroids: int = 16,
+                 min_score: float = 0.35, min_margin: float = 0.03,
+                 cache_path: Optional[str] = None, query_cache_size: int = 2048, build_retry_s: float = 60.0):
+        self.embeddings = embeddings
+        self.seeds = seeds or SEED_INTENTS
+        self.catalog_titles = list(catalog_titles)
+        self.title_centroids = title_centroids
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.cache_path = cache_path
+        self.build_retry_s = build_retry_s
+        self.intents = sorted(self.seeds)
+        self._vectors = TTLCache(max_size=query_cache_size, ttl_s=24 * 3600)
+        self._matrix: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._starts: Optional[np.ndarray] = None  # first row of each intent in _matrix
+        self._build_failed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    # ---------------- Centroids ----------------
+    def _fingerprint(self) -> str:
+        model = getattr(self.embeddings, "model", None) or getattr(self.embeddings, "size", None)
+        h = hashlib.sha256(f"{type(self.embeddings).__name__}|{model}|{self.title_centroids}".encode())
+        for intent in self.intents:
+            h.update(("\x1e" + intent + "\x1f" + "\x1f".join(self.seeds[intent])).encode())
+        h.update(("\x1e" + "\x1f".join(self.catalog_titles)).encode())
+        return h.hexdigest()
+
+    def _load_cached(self, fingerprint: str):
+        """(matrix, labels) from the on-disk cache, or None when missing, stale or unreadable."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if str(data["fingerprint"]) != fingerprint:
+                    return None
+                return data["matrix"], data["labels"]
+        except Exception as e:
+            log.warning("Ignoring unreadable intent centroid cache", path=self.cache_path, error=str(e))
+            return None
+
+    def _publish(self, matrix: np.ndarray, labels: np.ndarray):
+        # classify_vector() reads without the lock and treats a non-None _matrix as "built",
+        # so _matrix is assigned only once everything it is used with is in place.
+        self._starts = np.flatnonzero(np.r_[True, np.diff(labels) != 0])
+        self._labels = labels
+        self._matrix = matrix
+
+    def build(self) -> "IntentRouter":
+        """Embed seeds and catalog titles into the centroid matrix (or load it from the cache)."""
+        with self._lock:
+            if self._matrix is not None:
+                return self
+            if self._build_failed_at is not None and time.monotonic() - self._build_failed_at < self.build_retry_s:
+                raise RuntimeError("Intent centroid build failed recently, not retrying yet")
+            fingerprint = self._fingerprint()
+            cached = self._load_cached(fingerprint)
+            if cached is not None:
+                self._publish(*cached)
+                log.info("Intent centroids loaded from cache", path=self.cache_path, centroids=len(cached[1]))
+                return self
+
+            started = time.perf_counter()
+            centroids, labels = [], []
+            try:
+                for index, intent in enumerate(self.intents):
+                    seed_vectors = _normalize(np.asarray(self.embeddings.embed_documents(self.seeds[intent]), np.float32))
+                    centroids.append(_normalize(seed_vectors.mean(axis=0)))
+                    labels.append(index)
+                if self.catalog_titles and "product" in self.intents:
+                    title_vectors = np.asarray(self.embeddings.embed_documents(self.catalog_titles), np.float32)
+                    for centroid in kmeans_centroids(title_vectors, self.title_centroids):
+                        centroids.append(centroid)
+                        labels.append(self.intents.index("product"))
+            except Exception:
+                self._build_failed_at = time.monotonic()
+                raise
+            order = np.argsort(np.asarray(labels), kind="stable")  # rows grouped by intent for reduceat
+            matrix = np.vstack(centroids).astype(np.float32)[order]
+            label_array = np.asarray(labels, dtype=np.int32)[order]
+
+            if self.cache_path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+                np.savez(self.cache_path, fingerprint=np.asarray(fingerprint), matrix=matrix, labels=label_array)
+            self._publish(matrix, label_array)
+            log.info("Intent centroids built", centroids=len(labels), titles=len(self.catalog_titles),
+                     duration_s=round(time.perf_counter() - started, 3))
+            return self
+
+    # ---------------- Routing ----------------
+    def classify_vector(self, vector) -> Dict[str, float]:
+        """Best cosine similarity per intent for an (unnormalised) query embedding."""
+        matrix = self._matrix
+        if matrix is None:
+            self.build()
+            matrix = self._matrix
+        starts, labels = self._starts, self._labels  # published before _matrix
+        query = np.asarray(vector, dtype=np.float32)
+        similarities = matrix @ (query / (np.linalg.norm(query) or 1.0))  # type: ignore
+        best = np.maximum.reduceat(similarities, starts)
+        return {self.intents[label]: float(score) for label, score in zip(labels[starts], best)}  # type: ignore
+
+    @staticmethod
+    def _keyword_decision(query: str, score: float = 0.0) -> IntentDecision:
+        decision = IntentDecision(keyword_intent(query), round(score, 4), "keyword")
+        INTENT_DECISIONS.inc(intent=decision.intent, method=decision.method)
+        return decision
+
+    def decide(self, query: str, vector) -> IntentDecision:
+        try:
+            scores = self.classify_vector(vector)
+        except Exception as e:
+            log.warning("Intent centroids unavailable, using keyword routing", error=str(e))
+            return self._keyword_decision(query)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (intent, score), runner_up = ranked[0], ranked[1][1] if len(ranked) > 1 else -1.0
+        if score < self.min_score or score - runner_up < self.min_margin:
+            return self._keyword_decision(query, score)
+        INTENT_DECISIONS.inc(intent=intent, method="embedding")
+        return IntentDecision(intent, round(score, 4), "embedding")
+
+    def _cached_vector(self, query: str):
+        return self._vectors.get(normalize_query(query))
+
+    def prime(self, query: str, vector):
+        """Seed the query-vector cache, e.g. with embeddings precomputed by the cache warmer."""
+        self._vectors.set(normalize_query(query), np.asarray(vector, dtype=np.float32))
+
+    def route(self, query: str) -> IntentDecision:
+        vector = self._cached_vector(query)
+        if vector is None:
+            try:
+                vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+            except Exception as e:
+                log.warning("Intent embedding failed, using keyword routing", error=str(e))
+                return self._keyword_decision(query)
+            self._vectors.set(normalize_query(query), vector)
+        return self.decide(query, vector)
+
+    async def aroute(self, query: str) -> IntentDecision:
+        vector = self._cached_vector(query)
+        if vector is None:
+            try:
+                vector = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+            except Exception as e:
+                log.warning("Intent embedding failed, using keyword routing", error=str(e))
+                return self._keyword_decision(query)
+            self._vectors.set(normalize_query(query), vector)
+        if self._matrix is None:
+            try:
+                await asyncio.to_thread(self.build)  # off the event loop
+            except Exception:
+                pass  # decide() logs it and falls back to keywords
+        return self.decide(query, vector)
+
+    def stats(self) -> Dict:
+        return {"centroids": 0 if self._labels is None else int(len(self._labels)),
+                "query_cache": self._vectors.stats()}
+
+
+def load_intent_router(embeddings=None) -> Optional[IntentRouter]:
+    """
+    Process-wide IntentRouter built from the `intent_router` config block, or None when
+    disabled (the assistant then uses the keyword rule). Centroids are built on first use;
+    AgenticRAG.warm() builds them at router startup.
+    """
+    from product_assistant.utils.model_loader import ModelLoader, get_model_registry
+
+    cfg = load_config().get("intent_router", {})
+    if not cfg.get("enabled", True):
+        return None
+
+    def build():
+        return IntentRouter(
+            embeddings if embeddings is not None else ModelLoader().load_embeddings(),
+            catalog_titles=load_catalog_titles(os.path.join(os.getcwd(), cfg.get("catalog_path", "data/product_reviews.csv")),
+                                               limit=cfg.get("max_titles", 2000)),
+            title_centroids=cfg.get("title_centroids", 16),
+            min_score=cfg.get("min_score", 0.35),
+            min_margin=cfg.get("min_margin", 0.03),
+            cache_path=cfg.get("cache_path"),
+            build_retry_s=cfg.get("build_retry_s", 60),
+        )
+
+    return get_model_registry().get_or_create("intent_router", {**cfg, "embeddings": id(embeddings)}, build)
+
+
+if __name__ == "__main__":
+    # Offline timing of the vectorized lookup, with hash-based fake embeddings.
+    from product_assistant.benchmarks.fakes import LatencyFakeEmbeddings, synthetic_catalog
+
+    fake = LatencyFakeEmbeddings(size=1536, latency_s=0)
+    router = IntentRouter(fake, catalog_titles=[d.metadata["product_title"] for d in synthetic_catalog(2000)],
+                          title_centroids=64).build()
+    vectors = [fake.embed_query(f"query {i}") for i in range(2000)]
+    started = time.perf_counter()
+    arrays = [np.asarray(v, dtype=np.float32) for v in vectors]
+    convert_us = (time.perf_counter() - started) / len(vectors) * 1e6
+    started = time.perf_counter()
+    for v in arrays:
+        router.decide("query", v)
+    per_query_us = (time.perf_counter() - started) / len(vectors) * 1e6
+    print(f"{router.stats()['centroids']} centroids: {per_query_us:.1f}us per routing decision "
+          f"(+{convert_us:.1f}us to convert the embedding API's list to an array)")
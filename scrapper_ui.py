@@ -1,9 +1,16 @@
 import streamlit as st
 from product_assistant.etl.data_scrapper import FlipkartScrapper
 from product_assistant.etl.data_ingestion import DataIngestion
+from product_assistant.etl.streaming_pipeline import ScrapeToIngestPipeline
 import os
+import time
 
-flipkart_scrapper = FlipkartScrapper()
+@st.cache_resource
+def get_scrapper():
+    # Cached across Streamlit reruns so the driver pool stays warm between button presses.
+    return FlipkartScrapper()
+
+flipkart_scrapper = get_scrapper()
 output_path = "data/product_reviews.csv"
 st.title("📦 Product Review Scraper")
 
@@ -27,6 +34,8 @@ st.button("➕ Add Another Product", on_click=add_product_input)
 
 max_products = st.number_input("How many products per search?", min_value=1, max_value=10, value=1)
 review_count = st.number_input("How many reviews per product?", min_value=1, max_value=10, value=2)
+force_refresh = st.checkbox("🔄 Ignore cached results (force re-scrape)", value=False)
+stream_to_db = st.checkbox("⚡ Stream into Vector DB while scraping", value=False)
 
 if st.button("🚀 Start Scraping"):
     product_inputs = [p.strip() for p in st.session_state.product_inputs if p.strip()]
@@ -37,10 +46,33 @@ if st.button("🚀 Start Scraping"):
         st.warning("⚠️ Please enter at least one product name or a product description.")
     else:
         final_data = []
-        for query in product_inputs:
-            st.write(f"🔍 Searching for: {query}")
-            results = flipkart_scrapper.scrape_flipkart_products(query, max_products=max_products, review_count=review_count)
-            final_data.extend(results)
+        if stream_to_db:
+            pipeline = ScrapeToIngestPipeline(flipkart_scrapper, DataIngestion(require_csv=False))
+            pipeline.start(product_inputs, max_products=max_products, review_count=review_count,
+                           use_cache=not force_refresh)
+            st.write(f"🔍 Streaming {len(product_inputs)} searches into AstraDB...")
+            stage_columns = dict(zip(ScrapeToIngestPipeline.STAGES, st.columns(len(ScrapeToIngestPipeline.STAGES))))
+            placeholders = {stage: col.empty() for stage, col in stage_columns.items()}
+            while True:
+                progress = pipeline.progress()
+                for stage, stats in progress["stages"].items():
+                    placeholders[stage].metric(stage.title(), stats["out"],
+                                               f"{stats['errors']} errors" if stats["errors"] else None,
+                                               delta_color="inverse")
+                if not progress["running"]:
+                    break
+                time.sleep(0.5)
+            pipeline.join()
+            final_data = pipeline.rows
+            for error in pipeline.errors:
+                st.warning(f"⚠️ {error}")
+            st.success(f"✅ Streamed {len(pipeline.inserted_ids)} products into AstraDB in {pipeline.progress()['elapsed_s']}s")
+        else:
+            for query in product_inputs:
+                st.write(f"🔍 Searching for: {query}")
+                results = flipkart_scrapper.scrape_flipkart_products(query, max_products=max_products, review_count=review_count,
+                                                                     use_cache=not force_refresh)
+                final_data.extend(results)
 
         unique_products = {}
         for row in final_data:
@@ -52,6 +84,14 @@ if st.button("🚀 Start Scraping"):
         
         final_data = list(unique_products.values())
         st.session_state["scraped_data"] = final_data  # ✅ store in session
+        st.caption(f"⏱️ Page timings: {flipkart_scrapper.pool.timing_summary()}")
+        if flipkart_scrapper.cache is not None:
+            cache_stats = flipkart_scrapper.cache.stats()
+            st.caption(
+                "🗃️ Scrape cache — products: {p[hits]} hits / {p[stale]} stale / {p[misses]} misses ({p[entries]} stored); "
+                "queries: {q[hits]} hits / {q[stale]} stale / {q[misses]} misses ({q[entries]} stored)".format(
+                    p=cache_stats["products"], q=cache_stats["queries"])
+            )
         flipkart_scrapper.save_to_csv(final_data, output_path)
         st.success("✅ Data saved to `data/product_reviews.csv`")
         st.download_button("📥 Download CSV", data=open(output_path, "rb"), file_name="product_reviews.csv")
@@ -61,9 +101,14 @@ if "scraped_data" in st.session_state and st.button("🧠 Store in Vector DB (As
     with st.spinner("📡 Initializing ingestion pipeline..."):
         try:
             ingestion = DataIngestion()
-            st.info("🚀 Running ingestion pipeline...")
-            ingestion.run_pipeline()
+            state = ingestion.get_journal().state()
+            if state and state["status"] == "running" and state["next_offset"]:
+                st.info(f"⏯️ Resuming previous run from document {state['next_offset']} of {state['total']}...")
+            else:
+                st.info("🚀 Running ingestion pipeline...")
+            progress = st.progress(0.0)
+            ingestion.run_pipeline(progress_callback=lambda done, total: progress.progress(done / max(total, 1)))
             st.success("✅ Data successfully ingested to AstraDB!")
         except Exception as e:
-            st.error("❌ Ingestion failed!")
+            st.error("❌ Ingestion failed! Progress is checkpointed; click the button again to resume.")
             st.exception(e)
\ No newline at end of file
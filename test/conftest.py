@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# Keep the global logger's files out of the working tree while the tests run.
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="product_assistant_logs_"))
+os.environ.setdefault("LOG_CONSOLE", "0")
@@ -0,0 +1,179 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from product_assistant.router.admission import AdmissionController, AdmissionRejected, client_id_from
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_per_client_queue_limit_is_429():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_client=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        assert (rejected.value.status_code, rejected.value.reason) == (429, "client_queue_full")
+        assert rejected.value.retry_after_s >= 1
+        controller.release()
+        await waiting
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_is_503():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("c")
+        assert (rejected.value.status_code, rejected.value.reason) == (503, "queue_full")
+        controller.release()
+        await waiting
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_is_503_and_frees_the_queue_entry():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, queue_timeout_s=0.05)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        assert (rejected.value.status_code, rejected.value.reason) == (503, "queue_timeout")
+        assert controller.stats()["queued"] == 0 and controller.stats()["clients_waiting"] == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("fair, expected", [
+    (True, ["a1", "b1", "c1", "a2", "a3"]),
+    (False, ["a1", "a2", "a3", "b1", "c1"]),
+])
+def test_freed_slots_go_round_robin(fair, expected):
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_client=10, fair=fair)
+        admitted = []
+
+        async def request(name: str):
+            await controller.acquire(name[0])
+            admitted.append(name)
+
+        await controller.acquire("holder")
+        tasks = []
+        for name in ["a1", "a2", "a3", "b1", "c1"]:
+            tasks.append(asyncio.create_task(request(name)))
+            await _settle()
+        for _ in tasks:
+            controller.release()
+            await _settle()
+        await asyncio.gather(*tasks)
+        controller.release()
+        assert controller.stats()["in_flight"] == 0
+        return admitted
+
+    assert asyncio.run(scenario()) == expected
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert controller.stats()["queued"] == 0
+        controller.release()
+        assert controller.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_handed_to_a_cancelled_waiter_is_given_back():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await _settle()
+        controller.release()  # hands the slot to "b" ...
+        waiting.cancel()      # ... which is cancelled before it resumes
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert controller.stats()["in_flight"] == 0
+        assert await controller.acquire("c") == 0.0
+
+    asyncio.run(scenario())
+
+
+def test_slot_context_releases_on_error():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        with pytest.raises(RuntimeError):
+            async with controller.slot("a"):
+                raise RuntimeError("workflow failed")
+        assert controller.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def _request(peer: str, **headers):
+    return SimpleNamespace(client=SimpleNamespace(host=peer), headers=headers)
+
+
+def test_client_headers_are_ignored_from_untrusted_peers():
+    request = _request("203.0.113.7", **{"x-client-id": "rotating-1", "x-forwarded-for": "198.51.100.1"})
+    assert client_id_from(request) == "203.0.113.7"
+
+
+def test_client_headers_are_honoured_behind_trusted_proxy():
+    controller = AdmissionController(trusted_proxies=["10.0.0.0/8"])
+    assert controller.client_id(_request("10.1.2.3", **{"x-client-id": "tenant-42"})) == "tenant-42"
+    # Rightmost hop not added by a trusted proxy; anything left of it is client-controlled.
+    forwarded = _request("10.1.2.3", **{"x-forwarded-for": "1.2.3.4, 198.51.100.9, 10.0.0.5"})
+    assert controller.client_id(forwarded) == "198.51.100.9"
+    assert controller.client_id(_request("10.1.2.3")) == "10.1.2.3"
+
+
+def test_router_returns_429_with_retry_after():
+    httpx = pytest.importorskip("httpx")
+    from product_assistant.router import main
+
+    release = asyncio.Event()
+
+    class SlowAgent:
+        async def arun(self, msg, thread_id=None):
+            await release.wait()
+            return "answer"
+
+    controller = AdmissionController(max_concurrency=1, max_queue_per_client=1)
+    main.app.state.rag_agent = SlowAgent()
+    main.app.dependency_overrides.update({
+        main.get_admission_controller: lambda: controller,
+        main.get_query_log: lambda: None,
+    })
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/get", data={"msg": "q", "thread_id": "t1"}))
+            queued = asyncio.create_task(client.post("/get", data={"msg": "q", "thread_id": "t2"}))
+            while controller.stats()["queued"] < 1:
+                await asyncio.sleep(0.01)
+            rejected = await client.post("/get", data={"msg": "q", "thread_id": "t3"})
+            release.set()
+            return rejected, await running, await queued
+
+    try:
+        rejected, first, second = asyncio.run(scenario())
+    finally:
+        main.app.dependency_overrides.clear()
+        main.app.state.rag_agent = None
+    assert rejected.status_code == 429 and int(rejected.headers["retry-after"]) >= 1
+    assert first.status_code == second.status_code == 200
@@ -0,0 +1,94 @@
+from typing import Any, List, Optional
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.vectorstores import InMemoryVectorStore
+from product_assistant.workflow.agentic_rag_workflow import AgenticRAG
+from product_assistant.workflow.intent_router import IntentRouter
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Grader answers `grade`, rewrites echo the question, everything else gets a fixed answer."""
+
+    grade: str = "generator"
+    prompts: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-chat"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        self.prompts.append(prompt)
+        if "Decision:" in prompt:
+            text = self.grade
+        elif prompt.startswith("Rewrite this question"):
+            text = prompt.split(":", 1)[-1].strip()
+        else:
+            text = "final answer"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def calls(self, marker: str) -> int:
+        return sum(marker in p for p in self.prompts)
+
+
+def _agent(grade: str, **kwargs) -> AgenticRAG:
+    docs = [Document(page_content=f"{title} review: good battery", metadata={"product_title": title, "price": "₹999"})
+            for title in ("iPhone 15", "Pixel 8")]
+    store = InMemoryVectorStore.from_documents(docs, DeterministicFakeEmbedding(size=64))
+    router = IntentRouter(DeterministicFakeEmbedding(size=64), catalog_titles=["iPhone 15", "Pixel 8"])
+    return AgenticRAG(llm=ScriptedChatModel(grade=grade, prompts=[]), retriever=store.as_retriever(),
+                      intent_router=router, **kwargs)
+
+
+def test_grader_following_the_prompt_goes_to_generator():
+    agent = _agent("generator")
+    assert agent.run("What is the price of iPhone 15?", thread_id="t1") == "final answer"
+    assert agent.llm.calls("Decision:") == 1
+    assert agent.llm.calls("Rewrite this question") == 0
+
+
+def test_rewrites_are_capped_per_turn():
+    agent = _agent("rewriter", max_rewrites=2)
+    assert agent.run("What is the price of iPhone 15?", thread_id="t1") == "final answer"
+    assert agent.llm.calls("Rewrite this question") == 2
+    assert agent.llm.calls("Decision:") == 2  # the capped attempt goes straight to the Generator
+
+    # The counter starts over on the next turn of the same thread.
+    agent.run("Show reviews for Pixel 8", thread_id="t1")
+    assert agent.llm.calls("Rewrite this question") == 4
+
+
+def test_follow_up_turn_grades_and_answers_its_own_question():
+    agent = _agent("generator")
+    agent.run("What is the price of iPhone 15?", thread_id="t1")
+    agent.llm.prompts.clear()
+    agent.run("Show reviews for Pixel 8", thread_id="t1")
+    grader, generator = [p for p in agent.llm.prompts if "Decision:" in p or "CONTEXT:" in p]
+    assert "Question: Show reviews for Pixel 8" in grader
+    assert "Show reviews for Pixel 8" in generator and "iPhone 15?" not in generator
+
+
+def test_one_shot_questions_keep_no_checkpoints():
+    agent = _agent("generator")
+    for _ in range(3):
+        assert agent.run("What is the price of iPhone 15?", thread_id=None) == "final answer"
+    assert not agent.checkpointer.storage
+    agent.run("What is the price of iPhone 15?", thread_id="t1")
+    assert set(agent.checkpointer.storage) == {"t1"}
+
+
+@pytest.mark.parametrize("score, decision", [
+    ("generator", "generator"),
+    ("Decision: rewriter", "rewriter"),
+    ("'Generator' - the documents are relevant, no rewriter needed", "generator"),
+    ("yes", "generator"),
+    ("No.", "rewriter"),
+    ("unsure", "generator"),
+])
+def test_parse_grade(score, decision):
+    assert AgenticRAG._parse_grade(score) == decision
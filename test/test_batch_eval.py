@@ -0,0 +1,91 @@
+import json
+import pytest
+from product_assistant.evaluation import batch_eval
+from product_assistant.evaluation.batch_eval import BatchEvaluator, ScoreCache, _summarize
+
+
+SAMPLES = [
+    {"id": 1, "query": "iPhone 15 price", "response": "Rs. 69,999", "contexts": ["iPhone 15 costs Rs. 69,999"]},
+    {"id": 2, "query": "Pixel 8 reviews", "response": "Mostly positive", "contexts": ["Great camera"]},
+    {"id": 3, "query": "broken", "response": "?", "contexts": []},
+]
+SCORES = {("context_precision", 1): 1.0, ("context_precision", 2): 0.5,
+          ("response_relevancy", 1): 0.9, ("response_relevancy", 2): 0.7}
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    calls = []
+
+    async def fake_ascore(metric, query, response, contexts):
+        sample_id = next(s["id"] for s in SAMPLES if s["query"] == query)
+        calls.append((metric, sample_id))
+        if (metric, sample_id) not in SCORES:
+            raise RuntimeError("evaluator refused")
+        return SCORES[(metric, sample_id)]
+
+    monkeypatch.setattr(batch_eval, "ascore", fake_ascore)
+    monkeypatch.setattr(batch_eval, "evaluator_model", lambda: "judge-1")
+    return calls
+
+
+def test_score_cache_round_trip(tmp_path):
+    path = str(tmp_path / "cache" / "scores.jsonl")
+    cache = ScoreCache(path)
+    key = ScoreCache.key("context_precision", "judge-1", SAMPLES[0])
+    assert cache.get(key) is None
+
+    cache.put(key, 0.75)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("torn line\n")
+    reloaded = ScoreCache(path)
+    assert reloaded.get(key) == 0.75
+    assert reloaded.get(ScoreCache.key("context_precision", "judge-2", SAMPLES[0])) is None
+    assert reloaded.get(ScoreCache.key("response_relevancy", "judge-1", SAMPLES[0])) is None
+    assert reloaded.get(ScoreCache.key("context_precision", "judge-1", dict(SAMPLES[0], response="other"))) is None
+
+
+def test_summarize():
+    assert _summarize([]) == {"count": 0}
+    assert _summarize([0.2, 1.0, 0.6, 0.4]) == {
+        "count": 4, "mean": 0.55, "p10": 0.2, "p50": 0.5, "min": 0.2, "max": 1.0}
+
+
+def test_aevaluate_aggregates_and_reuses_cache(tmp_path, scorer):
+    cache_path = str(tmp_path / "scores.jsonl")
+    report = BatchEvaluator(concurrency=2, cache_path=cache_path).evaluate(SAMPLES)
+
+    assert report["evaluator_model"] == "judge-1"
+    assert (report["samples"], report["concurrency"]) == (3, 2)
+    assert (report["scored"], report["cache_hits"], report["failed"]) == (4, 0, 2)
+    assert report["metrics"]["context_precision"] == {
+        "count": 2, "mean": 0.75, "p10": 0.5, "p50": 0.75, "min": 0.5, "max": 1.0}
+    assert report["metrics"]["response_relevancy"]["mean"] == 0.8
+    assert report["results"][2] == {"id": 3, "query": "broken", "context_precision": None, "response_relevancy": None}
+    assert len(scorer) == 6
+
+    # A fresh evaluator over the same cache file only re-runs the failures.
+    scorer.clear()
+    again = BatchEvaluator(concurrency=2, cache_path=cache_path).evaluate(SAMPLES)
+    assert (again["scored"], again["cache_hits"], again["failed"]) == (0, 4, 2)
+    assert sorted(scorer) == [("context_precision", 3), ("response_relevancy", 3)]
+    assert again["metrics"] == report["metrics"]
+
+
+def test_concurrency_defaults_to_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_eval, "load_config", lambda: {"evaluation": {"concurrency": 3}})
+    assert BatchEvaluator(cache_path=str(tmp_path / "c.jsonl")).concurrency == 3
+    assert BatchEvaluator(concurrency=1, cache_path=str(tmp_path / "c.jsonl")).concurrency == 1
+
+
+def test_cli_exit_code_and_report(tmp_path, monkeypatch, scorer):
+    monkeypatch.setattr(batch_eval, "load_config", lambda: {"evaluation": {"concurrency": 3}})
+    dataset = tmp_path / "dataset.jsonl"
+    dataset.write_text("\n".join(json.dumps(s) for s in SAMPLES[:2]) + "\n", encoding="utf-8")
+    report_path = tmp_path / "report.json"
+
+    code = batch_eval.main([str(dataset), "--report", str(report_path), "--cache", str(tmp_path / "c.jsonl")])
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert code == 0
+    assert report["concurrency"] == 3
+    assert report["metrics"]["context_precision"]["count"] == 2
@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import pytest
+from product_assistant.etl.cache_warmer import CacheWarmer, invalidate_warm_cache, load_warm_cache
+from product_assistant.utils.query_log import QueryLog
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # cache_warmer and query_log paths are relative to the working directory
+    return tmp_path
+
+
+def _log_queries(counts):
+    log = QueryLog(os.path.join("data", "query_log.jsonl"))
+    for query, count in counts.items():
+        for _ in range(count):
+            log.record(query)
+    log.close()
+
+
+def test_warm_writes_answers_documents_and_embeddings(workdir):
+    from product_assistant.benchmarks.load_test import build_fake_agent
+
+    _log_queries({"What is the price of Product 3?": 4, "Tell me a joke": 3, "Rare question": 1})
+    agent = build_fake_agent(llm_latency_s=0, embed_latency_s=0, n_products=20)
+    summary = CacheWarmer(agent=agent).warm()
+    assert (summary["candidates"], summary["warmed"], summary["failed"]) == (2, 2, 0)
+
+    payload = json.loads((workdir / "data" / "warm_cache.json").read_text(encoding="utf-8"))
+    assert time.time() - payload["built_at"] < 60
+    entries = {e["normalized"]: e for e in payload["entries"]}
+    product = entries["what is the price of product 3"]
+    assert product["count"] == 4 and product["intent"] == "product"
+    assert product["answer"] and product["documents"] and len(product["embedding"]) == 256
+    assert "documents" not in entries["tell me a joke"]  # only product questions are retrieved
+    assert load_warm_cache() == payload["entries"]
+
+
+def test_warm_skips_failing_queries(workdir):
+    from product_assistant.benchmarks.load_test import build_fake_agent
+
+    class FlakyAgent:
+        def __init__(self, agent):
+            self._agent = agent
+
+        def __getattr__(self, name):
+            return getattr(self._agent, name)
+
+        def run(self, query, thread_id=None):
+            if "joke" in query:
+                raise RuntimeError("llm down")
+            return self._agent.run(query, thread_id=thread_id)
+
+    _log_queries({"What is the price of Product 3?": 3, "Tell me a joke": 3})
+    summary = CacheWarmer(agent=FlakyAgent(build_fake_agent(llm_latency_s=0, embed_latency_s=0, n_products=20))).warm()
+    assert (summary["warmed"], summary["failed"]) == (1, 1)
+    assert [e["normalized"] for e in load_warm_cache()] == ["what is the price of product 3"]
+
+
+def _write_cache(path, built_at, entries):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"built_at": built_at, "source": "test", "entries": entries}), encoding="utf-8")
+
+
+def test_entries_expire_at_built_at_plus_ttl(workdir):
+    path = workdir / "data" / "warm_cache.json"
+    entries = [{"normalized": "pixel 8", "query": "Pixel 8", "answer": "warmed"}]
+    _write_cache(path, time.time() - 100, entries)
+
+    assert load_warm_cache(ttl_s=None) == entries
+    assert load_warm_cache(ttl_s=50) == []
+    [entry] = load_warm_cache(ttl_s=1000)
+    assert entry["answer"] == "warmed" and 890 < entry["ttl_s"] <= 900  # what is left, not a fresh ttl
+
+    _write_cache(path, None, entries)  # no timestamp: cannot tell its age
+    assert load_warm_cache(ttl_s=1000) == []
+    path.write_text("{torn", encoding="utf-8")
+    assert load_warm_cache(ttl_s=1000) == []
+
+
+def test_invalidate_warm_cache(workdir):
+    path = workdir / "data" / "warm_cache.json"
+    _write_cache(path, time.time(), [])
+    assert invalidate_warm_cache() is True
+    assert not path.exists()
+    assert invalidate_warm_cache() is False
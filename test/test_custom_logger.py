@@ -0,0 +1,72 @@
+import io
+import time
+import queue
+import logging
+from product_assistant.logger.custom_logger import _BatchingQueueListener, _DroppingQueueHandler
+
+
+def _record(level: int, msg: str) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+def _messages(q: queue.Queue):
+    return [r.msg for r in list(q.queue)]
+
+
+def test_full_queue_drops_info_without_blocking():
+    q = queue.Queue(maxsize=2)
+    handler = _DroppingQueueHandler(q)
+    dropped = _DroppingQueueHandler.dropped
+    for i in range(3):
+        handler.enqueue(_record(logging.INFO, f"info {i}"))
+    assert _messages(q) == ["info 0", "info 1"]
+    assert _DroppingQueueHandler.dropped == dropped + 1
+
+
+def test_warning_evicts_oldest_info_instead_of_blocking():
+    q = queue.Queue(maxsize=3)
+    handler = _DroppingQueueHandler(q)
+    handler.enqueue(_record(logging.ERROR, "error 0"))
+    handler.enqueue(_record(logging.INFO, "info 1"))
+    handler.enqueue(_record(logging.DEBUG, "debug 2"))
+    dropped = _DroppingQueueHandler.dropped
+
+    started = time.perf_counter()
+    handler.enqueue(_record(logging.WARNING, "warning 3"))
+    handler.enqueue(_record(logging.ERROR, "error 4"))
+    assert time.perf_counter() - started < 0.1
+    assert _messages(q) == ["error 0", "warning 3", "error 4"]
+    assert _DroppingQueueHandler.dropped == dropped + 2
+
+    # Nothing left to evict: the new error is dropped, still without waiting.
+    handler.enqueue(_record(logging.ERROR, "error 5"))
+    assert _messages(q) == ["error 0", "warning 3", "error 4"]
+    assert _DroppingQueueHandler.dropped == dropped + 3
+
+
+def test_stop_on_full_queue_writes_everything():
+    q = queue.Queue(maxsize=4)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for i in range(4):
+        q.put_nowait(_record(logging.INFO, f"line {i}"))
+
+    listener = _BatchingQueueListener(q, handler)
+    listener.enqueue_sentinel()  # queue is full: must not raise queue.Full
+    listener.start()
+    listener._thread.join(timeout=5)  # the sentinel stops the writer once the records are out
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(4)]
+
+
+def test_stop_is_safe_while_records_are_queued():
+    q = queue.Queue(maxsize=8)
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    listener = _BatchingQueueListener(q, handler)
+    listener.start()
+    queue_handler = _DroppingQueueHandler(q)
+    for i in range(50):
+        queue_handler.enqueue(_record(logging.INFO, f"line {i}"))
+    listener.stop()
+    assert listener._thread is None
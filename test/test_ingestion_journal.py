@@ -0,0 +1,119 @@
+import pytest
+from product_assistant.etl.data_ingestion import DataIngestion
+from product_assistant.etl.ingestion_journal import IngestionJournal
+
+
+class FlakyStore:
+    """Vector store stand-in that records acknowledged batches and can fail on one batch."""
+
+    def __init__(self, fail_on_call=None):
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+        self.batches = []
+
+    def add_documents(self, documents, ids):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise ConnectionError("store went away mid-run")
+        self.batches.append(list(ids))
+        return list(ids)
+
+    def similarity_search(self, query):
+        return []
+
+
+def _ingestion(tmp_path, monkeypatch, store, n_products=7, batch_size=2):
+    import pandas as pd
+
+    monkeypatch.chdir(tmp_path)  # data/ paths (warm cache) resolve against the working directory
+    csv_path = tmp_path / "product_reviews.csv"
+    pd.DataFrame([{"product_id": f"P{i}", "product_title": f"Phone {i}", "rating": 4.0, "total_reviews": 10,
+                   "price": f"₹{1000 + i}", "top_reviews": f"review {i}"} for i in range(n_products)]
+                 ).to_csv(csv_path, index=False)
+    ingestion = DataIngestion.__new__(DataIngestion)  # no env or model loading
+    ingestion.csv_path = str(csv_path)
+    ingestion.product_data = ingestion._load_csv()
+    ingestion.config = {"astra_db": {"collection_name": "products"}}
+    ingestion.batch_size = batch_size
+    ingestion.journal_dir = str(tmp_path / "journal")
+    monkeypatch.setattr(ingestion, "get_vector_store", lambda *args, **kwargs: store)
+    return ingestion
+
+
+def test_crashed_run_resumes_with_the_remaining_batches(tmp_path, monkeypatch):
+    crashed = FlakyStore(fail_on_call=3)
+    ingestion = _ingestion(tmp_path, monkeypatch, crashed)
+    with pytest.raises(ConnectionError):
+        ingestion.run_pipeline()
+
+    state = ingestion.get_journal().state()
+    assert state["status"] == IngestionJournal.STATUS_RUNNING
+    assert state["next_offset"] == 4 and state["batches_committed"] == 2
+
+    resumed = FlakyStore()
+    monkeypatch.setattr(ingestion, "get_vector_store", lambda *args, **kwargs: resumed)
+    ingestion.run_pipeline()
+    assert [len(b) for b in resumed.batches] == [2, 1]  # offsets 4-6 only
+
+    written = [i for b in crashed.batches + resumed.batches for i in b]
+    assert len(written) == len(set(written)) == 7
+    state = ingestion.get_journal().state()
+    assert state["status"] == IngestionJournal.STATUS_COMPLETED
+    assert state["inserted_ids"] == written
+
+
+def test_completed_run_is_not_repeated(tmp_path, monkeypatch):
+    store = FlakyStore()
+    ingestion = _ingestion(tmp_path, monkeypatch, store)
+    ingestion.run_pipeline()
+    ingestion.run_pipeline()
+    assert store.calls == 4
+
+
+def test_document_ids_are_stable_across_runs(tmp_path, monkeypatch):
+    first, second = FlakyStore(), FlakyStore()
+    ingestion = _ingestion(tmp_path, monkeypatch, first)
+    ingestion.run_pipeline()
+    monkeypatch.setattr(ingestion, "get_vector_store", lambda *args, **kwargs: second)
+    ingestion.run_pipeline(resume=False)  # starts from zero, overwriting the same ids
+    assert first.batches == second.batches
+
+
+def test_aborted_run_starts_over(tmp_path, monkeypatch):
+    crashed = FlakyStore(fail_on_call=2)
+    ingestion = _ingestion(tmp_path, monkeypatch, crashed)
+    with pytest.raises(ConnectionError):
+        ingestion.run_pipeline()
+    ingestion.get_journal().abort("operator cancelled")
+    assert ingestion.get_journal().state()["status"] == IngestionJournal.STATUS_ABORTED
+
+    rerun = FlakyStore()
+    monkeypatch.setattr(ingestion, "get_vector_store", lambda *args, **kwargs: rerun)
+    ingestion.run_pipeline()
+    assert sum(len(b) for b in rerun.batches) == 7
+
+
+def test_torn_journal_line_is_skipped(tmp_path):
+    journal = IngestionJournal(str(tmp_path), "run")
+    journal.start(total=4, batch_size=2)
+    journal.record_batch(0, 0, 2, ["a", "b"])
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"event": "batch", "batch": 1, "sta')  # crash mid-write
+    journal.record_batch(1, 2, 4, ["c", "d"])
+    state = journal.state()
+    assert state["next_offset"] == 4 and state["inserted_ids"] == ["a", "b", "c", "d"]
+
+
+def test_completed_run_invalidates_the_warm_cache(tmp_path, monkeypatch):
+    ingestion = _ingestion(tmp_path, monkeypatch, FlakyStore(fail_on_call=2))
+    warm_cache = tmp_path / "data" / "warm_cache.json"
+    warm_cache.parent.mkdir()
+    warm_cache.write_text('{"built_at": 0, "entries": []}', encoding="utf-8")
+
+    with pytest.raises(ConnectionError):
+        ingestion.run_pipeline()
+    assert warm_cache.exists()  # dropped once the run completes, not per batch
+
+    monkeypatch.setattr(ingestion, "get_vector_store", lambda *args, **kwargs: FlakyStore())
+    ingestion.run_pipeline()
+    assert not warm_cache.exists()
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List
+import numpy as np
+from product_assistant.workflow.intent_router import IntentRouter
+
+# One axis per intent; catalog titles live on their own axis so only their k-means
+# centroids (not the "product" seed centroid) can match title-like queries.
+AXES = {"product": 0, "greeting": 1, "general": 2, "titles": 3}
+SEEDS = {
+    "product": ["price of this phone", "reviews for these earbuds"],
+    "greeting": ["hello", "thanks"],
+    "general": ["write a poem", "tell me a joke"],
+}
+TITLES = [f"Title {i}" for i in range(12)]
+
+
+def axis(name: str, noise: float = 0.0, seed: int = 0) -> List[float]:
+    vector = np.random.default_rng(seed).normal(0, noise, 5) if noise else np.zeros(5)
+    vector[AXES[name]] += 1.0
+    return vector.tolist()
+
+
+class ControlledEmbeddings:
+    """Seeds and titles map onto fixed axes; counts embed_documents calls; fails while `down`."""
+
+    def __init__(self, delay_s: float = 0.0, down: bool = False):
+        self.delay_s = delay_s
+        self.down = down
+        self.documents_calls = 0
+        self._lock = threading.Lock()
+        self.vectors: Dict[str, List[float]] = {text: axis(intent, 0.05, i)
+                                                for intent, texts in SEEDS.items() for i, text in enumerate(texts)}
+        self.vectors.update({title: axis("titles", 0.1, 100 + i) for i, title in enumerate(TITLES)})
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.documents_calls += 1
+        if self.down:
+            raise ConnectionError("embeddings unavailable")
+        time.sleep(self.delay_s)
+        return [self.vectors[t] for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.vectors.get(text, axis("general"))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+def _router(embeddings=None, **kwargs) -> IntentRouter:
+    return IntentRouter(embeddings or ControlledEmbeddings(), seeds=SEEDS, catalog_titles=TITLES,
+                        title_centroids=3, **kwargs)
+
+
+def test_concurrent_first_requests_build_once():
+    embeddings = ControlledEmbeddings(delay_s=0.02)
+    router = _router(embeddings)
+    decisions, errors = [], []
+
+    def classify():
+        try:
+            decisions.append(router.decide("price?", axis("product")))
+        except Exception as e:  # e.g. reduceat over unpublished row offsets
+            errors.append(e)
+
+    threads = [threading.Thread(target=classify) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert {d.intent for d in decisions} == {"product"}
+    assert embeddings.documents_calls == len(SEEDS) + 1  # one batch per intent + the titles
+
+
+def test_build_failure_falls_back_to_keywords_and_retries_later():
+    embeddings = ControlledEmbeddings(down=True)
+    router = _router(embeddings, build_retry_s=0.1)
+    embeddings.vectors["show me the price"] = axis("general")
+
+    decision = router.route("show me the price")
+    assert (decision.intent, decision.method) == ("product", "keyword")
+    assert asyncio.run(router.aroute("hello")).method == "keyword"
+    assert embeddings.documents_calls == 1  # the failed build is not retried on every request
+
+    embeddings.down = False
+    time.sleep(0.15)
+    decision = router.decide("show me the price", axis("general"))
+    assert (decision.intent, decision.method) == ("general", "embedding")
+
+
+def test_agent_warm_builds_the_router_eagerly():
+    from product_assistant.workflow.agentic_rag_workflow import AgenticRAG
+
+    router = _router()
+    agent = AgenticRAG(llm=object(), retriever=object(), intent_router=router)
+    agent.warm([])
+    assert router.stats()["centroids"] == len(SEEDS) + 3
+
+    broken = _router(ControlledEmbeddings(down=True))
+    AgenticRAG(llm=object(), retriever=object(), intent_router=broken).warm([])  # logged, not raised
+    assert broken.stats()["centroids"] == 0
+
+
+def test_each_intent_is_recognised_by_its_centroid():
+    router = _router()
+    for intent in SEEDS:
+        decision = router.decide("no keywords here", axis(intent, 0.05, 7))
+        assert (decision.intent, decision.method) == (intent, "embedding")
+        assert decision.score > 0.9
+
+
+def test_catalog_titles_extend_the_product_intent():
+    router = _router().build()
+    # Seeds give one centroid per intent; k-means adds title_centroids rows, all labelled "product".
+    assert router.stats()["centroids"] == len(SEEDS) + 3
+    assert list(router._labels) == sorted(router._labels)  # grouped by intent for reduceat
+    scores = router.classify_vector(axis("titles", 0.1, 42))
+    assert set(scores) == set(SEEDS)
+    assert scores["product"] > 0.9 > max(scores["greeting"], scores["general"])
+    assert router.decide("Title 3", axis("titles", 0.1, 42)).intent == "product"
+
+
+def test_low_score_or_margin_falls_back_to_keywords():
+    router = _router(min_score=0.35, min_margin=0.03)
+    tie = (np.asarray(axis("greeting")) + np.asarray(axis("general"))).tolist()
+    decision = router.decide("what is the price", tie)
+    assert (decision.intent, decision.method) == ("product", "keyword")  # keyword rule: "price"
+    assert decision.score < 0.75
+
+    unrelated = np.zeros(5)
+    unrelated[4] = 1.0
+    decision = router.decide("hello", unrelated.tolist())
+    assert (decision.intent, decision.method) == ("general", "keyword") and decision.score < 0.35
+
+
+def test_centroid_cache_round_trip_and_fingerprint_mismatch(tmp_path):
+    cache_path = str(tmp_path / "cache" / "intent_centroids.npz")
+    built = _router(cache_path=cache_path).build()
+
+    embeddings = ControlledEmbeddings(down=True)  # any embed_documents call would fail the build
+    loaded = _router(embeddings, cache_path=cache_path).build()
+    assert embeddings.documents_calls == 0
+    np.testing.assert_array_equal(loaded._matrix, built._matrix)
+    np.testing.assert_array_equal(loaded._starts, built._starts)
+    assert loaded.decide("x", axis("greeting")).intent == "greeting"
+
+    # Different catalog titles -> different fingerprint -> rebuilt and the cache overwritten.
+    embeddings = ControlledEmbeddings()
+    embeddings.vectors["Title 12"] = axis("titles", 0.1, 112)
+    rebuilt = IntentRouter(embeddings, seeds=SEEDS, catalog_titles=TITLES + ["Title 12"], title_centroids=3,
+                           cache_path=cache_path).build()
+    assert embeddings.documents_calls == len(SEEDS) + 1
+    with np.load(cache_path) as data:
+        assert str(data["fingerprint"]) == rebuilt._fingerprint() != built._fingerprint()
+
+
+def test_unreadable_cache_is_rebuilt(tmp_path):
+    cache_path = tmp_path / "intent_centroids.npz"
+    cache_path.write_bytes(b"not a numpy archive")
+    embeddings = ControlledEmbeddings()
+    _router(embeddings, cache_path=str(cache_path)).build()
+    assert embeddings.documents_calls == len(SEEDS) + 1
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from product_assistant.utils.llm_cascade import CascadingLLM
+from product_assistant.utils.usage_tracker import NodeUsageTracker
+
+GOOD = "The iPhone 15 is listed at Rs. 69,999 with a 4.6 rating."
+
+
+class StubModel(BaseChatModel):
+    """Returns `reply` (or echoes the question) with usage and optional logprobs; raises when `fail` is set."""
+
+    model_name: str
+    reply: str = GOOD
+    echo: bool = False
+    logprobs: Optional[List[float]] = None
+    fail: bool = False
+    input_tokens: int = 10
+    output_tokens: int = 5
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-model"
+
+    def _message(self, messages: List[BaseMessage]) -> AIMessage:
+        metadata: Dict[str, Any] = {}
+        if self.logprobs is not None:
+            metadata["logprobs"] = {"content": [{"token": "t", "logprob": lp} for lp in self.logprobs]}
+        return AIMessage(content=messages[-1].content if self.echo else self.reply, response_metadata=metadata,
+                         usage_metadata={"input_tokens": self.input_tokens, "output_tokens": self.output_tokens,
+                                         "total_tokens": self.input_tokens + self.output_tokens})
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.fail:
+            raise RuntimeError("small model down")
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages))])
+
+
+QUESTION = [HumanMessage(content="price of iPhone 15?")]
+
+
+def _cascade(**small) -> CascadingLLM:
+    return CascadingLLM(small=StubModel(model_name="small-1", **small),
+                        large=StubModel(model_name="large-1", reply="Large model: " + GOOD, input_tokens=20,
+                                        output_tokens=8),
+                        logprob_threshold=-1.0)
+
+
+@pytest.mark.parametrize("small, reason", [
+    ({}, None),
+    ({"reply": "Rs. 69,999"}, "short_answer"),
+    ({"reply": "I'm not sure which iPhone 15 variant you mean, sorry."}, "hedging_phrase"),
+    ({"logprobs": [-0.1, -0.3]}, None),
+    ({"logprobs": [-2.0, -1.0]}, "low_confidence(p=0.22)"),
+    ({"logprobs": []}, None),  # provider returned no logprobs: rule skipped
+])
+def test_escalation_reason(small, reason):
+    cascade = _cascade(**small)
+    assert cascade.escalation_reason(cascade.small.invoke(QUESTION)) == reason
+
+
+def test_logprob_rule_is_off_without_threshold():
+    cascade = _cascade(logprobs=[-5.0])
+    cascade.logprob_threshold = None
+    assert cascade.escalation_reason(cascade.small.invoke(QUESTION)) is None
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("small, expected, reason", [
+    ({}, "small", None),
+    ({"reply": "Unclear."}, "large", "short_answer"),
+    ({"fail": True}, "large", "small_model_error(RuntimeError)"),
+])
+def test_generate_picks_model(use_async, small, expected, reason):
+    cascade = _cascade(**small)
+    if use_async:
+        result = asyncio.run(cascade._agenerate(QUESTION))
+    else:
+        result = cascade._generate(QUESTION)
+    assert result.llm_output == {"cascade_model": expected, "escalation_reason": reason}
+    assert result.generations[0].message.content.startswith("Large model") == (expected == "large")
+    assert cascade.stats() == {"calls": 1, "escalations": int(expected == "large"),
+                               "escalation_rate": float(expected == "large")}
+
+
+def test_counters_are_exact_across_threads():
+    cascade = _cascade(echo=True)
+    questions = [HumanMessage(content="ok?")], [HumanMessage(content=GOOD)]  # escalates / answered small
+
+    def worker(i: int):
+        for _ in range(50):
+            cascade._generate(questions[i % 2])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cascade.stats() == {"calls": 400, "escalations": 200, "escalation_rate": 0.5}
+
+
+def test_usage_tracker_counts_leaf_calls_only():
+    tracker = NodeUsageTracker()
+    escalating = _cascade(reply="Not sure.")
+    failing = _cascade(fail=True)
+    escalating.invoke(QUESTION, config={"callbacks": [tracker]})
+    _cascade().invoke(QUESTION, config={"callbacks": [tracker]})
+    failing.invoke(QUESTION, config={"callbacks": [tracker]})
+
+    rows = {row["model"]: row for row in tracker.report()}
+    assert set(rows) == {"small-1", "large-1"}  # no row for the cascade wrapper itself
+    assert (rows["small-1"]["calls"], rows["small-1"]["errors"]) == (2, 1)
+    assert (rows["small-1"]["input_tokens"], rows["small-1"]["output_tokens"]) == (20, 10)
+    assert (rows["large-1"]["calls"], rows["large-1"]["input_tokens"], rows["large-1"]["output_tokens"]) == (2, 40, 16)
+    assert {row["node"] for row in tracker.report()} == {"-"}
+
+    tracker.reset()
+    assert tracker.report() == []
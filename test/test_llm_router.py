@@ -0,0 +1,148 @@
+import time
+import asyncio
+import threading
+from typing import Any, List, Optional
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from product_assistant.utils.llm_router import LLMRouter
+
+
+class StubProvider(BaseChatModel):
+    """Local provider stand-in: answers with its own name after `delay_s`, or raises when `fail` is set."""
+
+    label: str
+    delay_s: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-provider"
+
+    def _reply(self) -> ChatResult:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError(f"{self.label} unavailable")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.label))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay_s)
+        return self._reply()
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.delay_s)
+        return self._reply()
+
+
+QUESTION = [HumanMessage(content="price of iPhone 15?")]
+
+
+def _router(**kwargs) -> LLMRouter:
+    params = dict(hedge_percentile=90, hedge_min_delay_s=0.05, hedge_default_delay_s=2.0, min_samples=5,
+                  max_error_rate=0.5, cooldown_s=30)
+    params.update(kwargs)
+    providers = {"primary": StubProvider(label="primary", delay_s=0.01),
+                 "secondary": StubProvider(label="secondary", delay_s=0.01)}
+    return LLMRouter(providers=providers, **params)
+
+
+def _invoke(router: LLMRouter, use_async: bool) -> str:
+    if use_async:
+        return asyncio.run(router.ainvoke(QUESTION)).content
+    return router.invoke(QUESTION).content
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_hedge_fires_past_latency_percentile(use_async):
+    router = _router()
+    router.providers["secondary"].delay_s = 0.03
+    for _ in range(6):  # both get sampled; the faster primary then ranks first
+        _invoke(router, use_async)
+    assert router.ranked_providers() == ["primary", "secondary"]
+    assert router.hedge_delay("primary") == pytest.approx(0.05)  # p90 of ~10 ms, clamped to the minimum
+
+    router.providers["primary"].delay_s = 1.0
+    started = time.perf_counter()
+    assert _invoke(router, use_async) == "secondary"
+    assert time.perf_counter() - started < 0.5
+    assert router.stats()["secondary"]["hedges_won"] == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_no_hedge_before_the_default_delay_without_samples(use_async):
+    router = _router(hedge_default_delay_s=0.5)
+    router.providers["primary"].delay_s = 0.2
+    assert _invoke(router, use_async) == "primary"
+    assert router.providers["secondary"].calls == 0
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_fails_over_on_provider_error(use_async):
+    router = _router()
+    router.providers["primary"].fail = True
+    assert _invoke(router, use_async) == "secondary"
+    assert router.stats()["primary"]["failures"] == 1
+
+
+def test_raises_when_every_provider_fails():
+    router = _router()
+    for provider in router.providers.values():
+        provider.fail = True
+    with pytest.raises(RuntimeError, match="unavailable"):
+        router.invoke(QUESTION)
+
+
+def test_cooldown_moves_unhealthy_provider_to_the_back():
+    router = _router(cooldown_s=0.2)
+    router.providers["primary"].fail = True
+    for _ in range(3):
+        assert _invoke(router, use_async=False) == "secondary"
+    assert router.ranked_providers() == ["secondary", "primary"]
+
+    # While cooling down the primary is not tried first, so it sees no traffic.
+    calls = router.providers["primary"].calls
+    assert _invoke(router, use_async=False) == "secondary"
+    assert router.providers["primary"].calls == calls
+
+    time.sleep(0.25)
+    router.providers["primary"].fail = False
+    assert router.ranked_providers()[0] == "primary"
+    assert _invoke(router, use_async=False) == "primary"
+
+
+def test_hedges_are_bounded_when_every_call_is_slow():
+    router = _router(hedge_default_delay_s=0.05, max_hedges_in_flight=2)
+    router.providers["primary"].delay_s = 0.4
+    router.providers["secondary"].delay_s = 0.4
+    answers = []
+    threads = [threading.Thread(target=lambda: answers.append(_invoke(router, use_async=False))) for _ in range(8)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Every call waits on its own primary, which never queues behind the hedges.
+    assert len(answers) == 8 and time.perf_counter() - started < 0.8
+    time.sleep(0.45)  # losing hedges finish (stubs count calls when they answer) and hand their slots back
+    assert router.providers["primary"].calls == 8
+    assert router.providers["secondary"].calls == 2
+    assert router._hedge_slots.acquire(blocking=False) and router._hedge_slots.acquire(blocking=False)
+
+
+def test_primary_does_not_queue_behind_a_saturated_pool():
+    router = _router(hedge_default_delay_s=0.05, max_hedges_in_flight=2)
+    stuck = threading.Event()
+    for _ in range(2):  # e.g. losing hedges still waiting on a provider that stalled
+        router._executor.submit(stuck.wait, 2)
+    try:
+        started = time.perf_counter()
+        assert _invoke(router, use_async=False) == "primary"
+        assert time.perf_counter() - started < 0.2
+        assert router.providers["secondary"].calls == 0
+    finally:
+        stuck.set()
@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from product_assistant.utils import tracing
+from product_assistant.utils.metrics import MetricsRegistry
+from product_assistant.utils.ttl_cache import TTLCache
+
+
+def test_counter_and_gauge_rendering():
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests handled.", ["route"])
+    requests.inc(route="/get")
+    requests.inc(2, route='/a"b\\c')
+    depth = registry.gauge("demo_queue_depth", "Queued requests.")
+    depth.inc(3)
+    depth.dec()
+
+    assert registry.render() == (
+        "# HELP demo_queue_depth Queued requests.\n"
+        "# TYPE demo_queue_depth gauge\n"
+        "demo_queue_depth 2\n"
+        "# HELP demo_requests_total Requests handled.\n"
+        "# TYPE demo_requests_total counter\n"
+        'demo_requests_total{route="/a\\"b\\\\c"} 2\n'
+        'demo_requests_total{route="/get"} 1\n')
+    assert requests.value(route="/get") == 1
+    assert registry.counter("demo_requests_total", "again", ["route"]) is requests
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.histogram("demo_requests_total", "clash")
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("demo_latency_seconds", "Latency.", ["route"], buckets=(0.5, 0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.3, 2.0):
+        latency.observe(seconds, route="/get")
+
+    lines = registry.render().splitlines()[2:]
+    assert lines == [
+        'demo_latency_seconds_bucket{route="/get",le="0.1"} 2',  # le is inclusive
+        'demo_latency_seconds_bucket{route="/get",le="0.5"} 3',
+        'demo_latency_seconds_bucket{route="/get",le="1"} 3',
+        'demo_latency_seconds_bucket{route="/get",le="+Inf"} 4',
+        'demo_latency_seconds_sum{route="/get"} 2.45',
+        'demo_latency_seconds_count{route="/get"} 4',
+    ]
+    assert latency.snapshot(route="/get") == {"count": 4, "sum": pytest.approx(2.45)}
+    assert latency.snapshot(route="/other") == {"count": 0, "sum": 0.0}
+
+
+def test_span_records_errors():
+    before = tracing.SPAN_ERRORS.value(kind="mcp_tool", name="test_span")
+    with pytest.raises(RuntimeError):
+        with tracing.span("mcp_tool", "test_span"):
+            raise RuntimeError("tool down")
+    with tracing.span("mcp_tool", "test_span"):
+        pass
+    assert tracing.SPAN_ERRORS.value(kind="mcp_tool", name="test_span") == before + 1
+    assert tracing.SPAN_SECONDS.snapshot(kind="mcp_tool", name="test_span")["count"] >= 2
+
+
+def test_graph_run_is_exported_on_metrics_endpoint(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    from product_assistant.benchmarks.load_test import build_fake_agent
+    from product_assistant.router import main
+
+    spans = []
+
+    def capture(event, **fields):
+        if event == "span":
+            spans.append(fields)
+
+    monkeypatch.setattr(tracing.log, "info", capture)
+    main.app.state.rag_agent = build_fake_agent(llm_latency_s=0, embed_latency_s=0, n_products=20)
+    main.app.dependency_overrides.update({main.get_answer_cache: lambda: TTLCache(max_size=1, ttl_s=60),
+                                          main.get_query_log: lambda: None})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            answer = await client.post("/get", data={"msg": "What is the price of Product 3?"},
+                                       headers={"X-Request-ID": "req-metrics-1"})
+            return answer, await client.get("/metrics")
+
+    try:
+        answer, scraped = asyncio.run(scenario())
+    finally:
+        main.app.dependency_overrides.clear()
+        main.app.state.rag_agent = None
+
+    assert answer.status_code == 200 and answer.headers["x-request-id"] == "req-metrics-1"
+    body = scraped.text
+    assert scraped.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for series in ('rag_span_duration_seconds_count{kind="node",name="Assistant"}',
+                   'rag_span_duration_seconds_count{kind="node",name="Retriever"}',
+                   'rag_span_duration_seconds_count{kind="node",name="Generator"}',
+                   'rag_span_duration_seconds_count{kind="retriever",',
+                   'rag_span_duration_seconds_count{kind="llm",name="fake-latency-chat-large"}',
+                   'rag_llm_tokens_total{node="Generator",model="fake-latency-chat-large",direction="output"}',
+                   'http_requests_total{route="/get",method="POST",status="200"}'):
+        assert series in body, series
+
+    kinds = {(s["kind"], s.get("node")) for s in spans}
+    assert {("node", None), ("retriever", "Retriever"), ("llm", "Generator")} <= kinds
+    assert {s.get("request_id") for s in spans} == {"req-metrics-1"}
@@ -0,0 +1,41 @@
+import os
+import pytest
+from product_assistant.utils import config_loader
+from product_assistant.utils.model_loader import ModelRegistry
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    path.write_text("llm:\n  groq:\n    model_name: small\n", encoding="utf-8")
+    monkeypatch.setenv("CONFIG_PATH", str(path))
+    monkeypatch.setenv("ENV", "production")  # no .env reload during the test
+    yield path
+    config_loader._config_cache.pop(config_loader.resolve_config_path(str(path)), None)
+
+
+def _touch(path, text):
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))  # coarse-mtime filesystems
+
+
+def test_reload_drops_clients_when_config_changes(config_file):
+    registry = ModelRegistry()
+    first = registry.get_or_create("llm", {"model_name": "small"}, object)
+    assert registry.reload() is False
+    assert registry.get_or_create("llm", {"model_name": "small"}, object) is first
+
+    _touch(config_file, "llm:\n  groq:\n    model_name: large\n")
+    config_loader.load_config()  # another component notices the change first
+    assert registry.reload() is True
+    assert registry.stats()["models"] == []
+    assert registry.get_or_create("llm", {"model_name": "small"}, object) is not first
+    assert registry.reload() is False
+
+
+def test_forced_reload_always_clears(config_file):
+    registry = ModelRegistry()
+    registry.get_or_create("llm", {"model_name": "small"}, object)
+    assert registry.reload(force=True) is True
+    assert registry.stats()["models"] == []
@@ -0,0 +1,76 @@
+from pathlib import Path
+from product_assistant.etl.page_parser import parse_product_page, parse_reviews, parse_search_results
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def test_parse_product_page():
+    product = parse_product_page(_fixture("flipkart_product.html"), review_count=2)
+    assert product["title"] == "Apple iPhone 15 (Black, 128 GB)"
+    assert product["price"] == "₹61,999"
+    assert product["rating"] == "4.6"
+    assert product["reviews"] == [
+        "5 Brilliant Camera quality is superb and the battery easily lasts a day.",
+        "4 Worth the money Display is bright, a bit pricey.",
+    ]
+
+
+def test_parse_reviews_skips_duplicate_blocks():
+    reviews = parse_reviews(_fixture("flipkart_product.html"), count=10)
+    assert len(reviews) == 3
+    assert reviews[-1] == "3 Decent Charging is slow without the 20W brick."
+
+
+def test_parse_product_page_legacy_layout():
+    product = parse_product_page(_fixture("flipkart_product_legacy.html"), review_count=5)
+    assert product["title"] == "boAt Airdopes 141 with 42 Hours Playback"
+    assert product["price"] == "₹1,099"
+    assert product["rating"] is None
+    assert product["reviews"] == ["Bass is good for the price.", "Case feels cheap."]
+
+
+def test_parse_product_page_without_matches():
+    assert parse_product_page("<html><body><p>Access denied</p></body></html>") == {
+        "title": None, "price": None, "rating": None, "reviews": []}
+
+
+def test_parse_search_results():
+    products = parse_search_results(_fixture("flipkart_search.html"), max_products=10)
+    assert products == [
+        {"product_id": "itm6ac6485515ae4", "product_title": "Apple iPhone 15 (Black, 128 GB)", "rating": "4.6",
+         "total_reviews": "9,567", "price": "₹61,999",
+         "product_link": "https://www.flipkart.com/apple-iphone-15-black-128-gb/p/itm6ac6485515ae4"
+                         "?pid=MOBGTAGPTB3VS24W&lid=LSTMOB"},
+        {"product_id": "itm96f61fdd7e604", "product_title": "Apple iPhone 15 Plus (Blue, 256 GB)", "rating": "4.5",
+         "total_reviews": "789", "price": "₹79,999",
+         "product_link": "https://www.flipkart.com/apple-iphone-15-plus-blue-256-gb/p/itm96f61fdd7e604"
+                         "?pid=MOBGTAGPNMZA5PU5"},
+    ]
+    assert len(parse_search_results(_fixture("flipkart_search.html"), max_products=1)) == 1
+
+
+def test_parse_search_results_falls_back_per_field():
+    products = {p["product_link"].split("?")[0].rsplit("/p/", 1)[0].rsplit("/", 1)[-1]: p
+                for p in parse_search_results(_fixture("flipkart_search_partial.html"), max_products=10)}
+    assert list(products) == ["boat-airdopes-141", "noise-buds-vs102", "oneplus-nord-buds-2r", "sponsored-audio"]
+
+    no_price = products["boat-airdopes-141"]
+    assert no_price["price"] == "N/A"
+    assert (no_price["product_title"], no_price["rating"], no_price["total_reviews"], no_price["product_id"]) == \
+        ("boAt Airdopes 141", "4.1", "18,432", "itm0a1b2c3d4e5f6")
+
+    no_rating = products["noise-buds-vs102"]
+    assert (no_rating["rating"], no_rating["total_reviews"]) == ("N/A", "N/A")
+    assert (no_rating["product_title"], no_rating["price"]) == ("Noise Buds VS102", "₹899")
+
+    link_title = products["oneplus-nord-buds-2r"]
+    assert (link_title["product_title"], link_title["rating"], link_title["price"]) == \
+        ("OnePlus Nord Buds 2r", "4.3", "₹1,799")
+
+    bare = products["sponsored-audio"]
+    assert (bare["product_title"], bare["product_id"], bare["rating"], bare["price"]) == ("N/A", "N/A", "N/A", "₹499")
+    assert bare["product_link"].startswith("https://www.flipkart.com/sponsored-audio/p/")
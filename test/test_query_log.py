@@ -0,0 +1,34 @@
+import time
+from product_assistant.utils.query_log import QueryLog, normalize_query, top_queries
+
+
+def test_top_queries_skips_conversation_turns(tmp_path):
+    path = str(tmp_path / "query_log.jsonl")
+    log = QueryLog(path)
+    for _ in range(3):
+        log.record("What is the price of iPhone 15?")
+        log.record("and the price?", thread_id="t1")
+    log.record("what is the price of iphone 15", thread_id="t2")
+    log.record("Pixel 8 reviews", status=500)
+    log.close()
+
+    assert top_queries(path, min_count=1) == [
+        {"normalized": "what is the price of iphone 15", "query": "What is the price of iPhone 15?", "count": 3},
+    ]
+
+
+def test_top_queries_applies_min_count_and_age(tmp_path):
+    path = tmp_path / "query_log.jsonl"
+    old = time.time() - 40 * 86400
+    lines = [f'{{"ts": {old}, "query": "old", "normalized": "old", "status": 200}}'] * 5
+    lines += ['{"ts": %f, "query": "Pixel 8", "normalized": "pixel 8", "status": 200}' % time.time()] * 2
+    lines += ["not json"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    assert top_queries(str(path), min_count=2, since_days=30) == [
+        {"normalized": "pixel 8", "query": "Pixel 8", "count": 2}]
+    assert top_queries(str(path), min_count=3, since_days=30) == []
+
+
+def test_normalize_query():
+    assert normalize_query("  What is the PRICE   of iPhone 15?? ") == "what is the price of iphone 15"
@@ -0,0 +1,143 @@
+import json
+import time
+import asyncio
+import threading
+import pytest
+from product_assistant.router import main
+from product_assistant.utils.ttl_cache import TTLCache
+from product_assistant.utils.query_log import normalize_query
+
+
+@pytest.fixture
+def app_state():
+    main.app.state.rag_agent = None
+    yield main.app
+    main.app.dependency_overrides.clear()
+    main.app.state.rag_agent = None
+    main._answer_cache.update(signature=None, cache=None)
+
+
+class EchoAgent:
+    """Stands in for AgenticRAG on cache misses; records what it was asked and what it was warmed with."""
+
+    def __init__(self):
+        from product_assistant.utils.ttl_cache import TTLCache
+        self.questions = []
+        self.retrieval_cache = TTLCache(max_size=16, ttl_s=60)
+
+    def warm(self, entries, ttl_s=None):
+        for entry in entries:
+            self.retrieval_cache.set(entry["normalized"], entry.get("documents", []), entry.get("ttl_s", ttl_s))
+
+    async def arun(self, msg, thread_id=None):
+        self.questions.append((msg, thread_id))
+        return f"live answer to {msg}"
+
+
+def _write_warm_cache(workdir, built_at, answers):
+    path = workdir / "data" / "warm_cache.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entries = [{"normalized": normalize_query(q), "query": q, "count": 5, "answer": a, "documents": []}
+               for q, a in answers.items()]
+    path.write_text(json.dumps({"built_at": built_at, "source": "test", "entries": entries}), encoding="utf-8")
+    return path
+
+
+def _post(app, **data):
+    httpx = pytest.importorskip("httpx")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/get", data=data)
+
+    return asyncio.run(scenario())
+
+
+def test_concurrent_first_requests_share_one_agent(app_state, monkeypatch):
+    built = []
+
+    class SlowAgent:
+        def __init__(self):
+            time.sleep(0.05)  # model clients and graph compilation
+            built.append(self)
+
+        def warm(self, entries, ttl_s=None):
+            pass
+
+    monkeypatch.setattr(main, "AgenticRAG", SlowAgent)
+    monkeypatch.setattr(main, "load_warm_cache", lambda **kwargs: [])
+    agents = []
+    threads = [threading.Thread(target=lambda: agents.append(main.get_rag_agent())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(agent is built[0] for agent in agents) and app_state.state.rag_agent is built[0]
+
+
+def test_answer_cache_hit_does_not_build_the_agent(app_state, monkeypatch):
+    cache = TTLCache(max_size=4, ttl_s=60)
+    cache.set(normalize_query("What is the price of iPhone 15?"), "warmed answer")
+
+    def no_agent():
+        raise AssertionError("agent resolved on an answer-cache hit")
+
+    monkeypatch.setattr(main, "get_rag_agent", no_agent)
+    app_state.dependency_overrides.update({main.get_answer_cache: lambda: cache, main.get_query_log: lambda: None})
+
+    response = _post(app_state, msg="what is the price of iphone 15")
+    assert response.status_code == 200 and response.json() == {"response": "warmed answer"}
+
+
+@pytest.fixture
+def warm_router(app_state, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    agent = EchoAgent()
+    app_state.state.rag_agent = agent
+    app_state.dependency_overrides[main.get_query_log] = lambda: None
+    return tmp_path, agent
+
+
+def test_get_serves_warm_hits_and_runs_the_agent_on_misses(warm_router):
+    workdir, agent = warm_router
+    _write_warm_cache(workdir, time.time(), {"What is the price of iPhone 15?": "warmed answer"})
+    hits, misses = main.ANSWER_CACHE.value(result="hit"), main.ANSWER_CACHE.value(result="miss")
+
+    assert _post(main.app, msg="what is the price of  iPhone 15").json() == {"response": "warmed answer"}
+    assert _post(main.app, msg="Pixel 8 reviews").json() == {"response": "live answer to Pixel 8 reviews"}
+    # Conversation turns never come from the warm cache.
+    assert _post(main.app, msg="What is the price of iPhone 15?", thread_id="t1").json()["response"].startswith("live")
+
+    assert agent.questions == [("Pixel 8 reviews", None), ("What is the price of iPhone 15?", "t1")]
+    assert main.ANSWER_CACHE.value(result="hit") == hits + 1
+    assert main.ANSWER_CACHE.value(result="miss") == misses + 1
+
+
+def test_warm_answers_expire_at_built_at_plus_ttl(warm_router, monkeypatch):
+    workdir, agent = warm_router
+    ttl_s = main.load_config()["cache_warmer"]["answer_ttl_s"]
+    _write_warm_cache(workdir, time.time() - ttl_s - 1, {"Pixel 8 reviews": "stale answer"})
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "live answer to Pixel 8 reviews"
+
+    # Written 1s before it expires: served now, but only for what is left of its lifetime.
+    _write_warm_cache(workdir, time.time() - ttl_s + 1, {"Pixel 8 reviews": "warmed answer"})
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "warmed answer"
+    real_monotonic = time.monotonic
+    monkeypatch.setattr("product_assistant.utils.ttl_cache.time.monotonic", lambda: real_monotonic() + 2)
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "live answer to Pixel 8 reviews"
+
+
+def test_answer_cache_follows_the_warm_cache_file(warm_router):
+    workdir, agent = warm_router
+    path = _write_warm_cache(workdir, time.time(), {"Pixel 8 reviews": "old catalog answer"})
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "old catalog answer"
+    agent.retrieval_cache.set("something else", ["old doc"])
+
+    path.unlink()  # what an ingestion run does
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "live answer to Pixel 8 reviews"
+    assert "something else" not in agent.retrieval_cache
+
+    _write_warm_cache(workdir, time.time(), {"Pixel 8 reviews": "new catalog answer"})
+    assert _post(main.app, msg="Pixel 8 reviews").json()["response"] == "new catalog answer"
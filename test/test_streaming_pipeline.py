@@ -0,0 +1,88 @@
+import time
+import threading
+from types import SimpleNamespace
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
+from product_assistant.etl.data_ingestion import DataIngestion
+from product_assistant.etl.streaming_pipeline import ScrapeToIngestPipeline
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    texts_embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.texts_embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+class StubScrapper:
+    """Yields rows per query; optionally pauses after `pause_after` rows until `resume` is set, or fails."""
+
+    def __init__(self, rows_per_query=3, pause_after=None, fail_after=None):
+        self.rows_per_query = rows_per_query
+        self.pause_after = pause_after
+        self.fail_after = fail_after
+        self.resume = threading.Event()
+
+    def iter_flipkart_products(self, query, max_products, review_count, use_cache):
+        for i in range(self.rows_per_query):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("browser crashed")
+            if self.pause_after is not None and i == self.pause_after:
+                self.resume.wait(5)
+            yield [f"{query}-{i}", f"{query} phone {i}", "4.2", "120", "₹9,999", f"review of {query} {i}"]
+
+
+def _pipeline(scrapper, **kwargs):
+    embeddings = CountingEmbeddings(size=16)
+    stores = []
+
+    def get_vector_store(embedding=None, **_):
+        stores.append(InMemoryVectorStore(embedding))
+        return stores[-1]
+
+    ingestion = SimpleNamespace(batch_size=2, model_loader=SimpleNamespace(load_embeddings=lambda: embeddings),
+                                get_vector_store=get_vector_store)
+    pipeline = ScrapeToIngestPipeline(scrapper, ingestion, queue_size=2, **kwargs)
+    return pipeline, stores[0], embeddings
+
+
+def test_rows_stream_through_every_stage():
+    pipeline, store, embeddings = _pipeline(StubScrapper(rows_per_query=3))
+    pipeline.start(["pixel", "iphone", "pixel"]).join(timeout=10)
+
+    assert not pipeline.is_running() and pipeline.errors == []
+    assert len(pipeline.rows) == 6  # the repeated query's titles are de-duplicated
+    assert sorted(pipeline.inserted_ids) == sorted(store.store)
+    expected_ids = {DataIngestion.document_id(DataIngestion.to_document(
+        dict(zip(["product_id", "product_title", "rating", "total_reviews", "price", "top_reviews"], row))))
+        for row in pipeline.rows}
+    assert set(store.store) == expected_ids
+    assert embeddings.texts_embedded == 6  # the upsert used the precomputed vectors
+    stages = pipeline.progress()["stages"]
+    assert stages["upsert"]["out"] == 6 and stages["embed"]["out"] == 6
+
+
+def test_partial_batch_is_flushed_while_scraping_is_idle():
+    scrapper = StubScrapper(rows_per_query=2, pause_after=1)
+    pipeline, store, _ = _pipeline(scrapper, batch_size=10, flush_after_s=0.05)
+    pipeline.start(["pixel"])
+    try:
+        deadline = time.monotonic() + 5
+        while not store.store and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(store.store) == 1 and pipeline.is_running()
+    finally:
+        scrapper.resume.set()
+    pipeline.join(timeout=10)
+    assert len(store.store) == 2 and not pipeline.is_running()
+
+
+def test_stage_failure_still_shuts_down_cleanly():
+    pipeline, store, _ = _pipeline(StubScrapper(rows_per_query=5, fail_after=3))
+    pipeline.start(["pixel", "iphone"]).join(timeout=10)
+
+    assert not pipeline.is_running()
+    assert pipeline.errors == ["scrape: browser crashed", "scrape: browser crashed"]
+    assert len(store.store) == 6  # rows scraped before each failure are still ingested
+    assert pipeline.progress()["queues"] == {"rows": 0, "documents": 0, "batches": 0}
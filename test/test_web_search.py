@@ -0,0 +1,111 @@
+import time
+import asyncio
+import threading
+import pytest
+from product_assistant.mcp_servers.web_search import AsyncWebSearch
+
+
+class StandInBackend:
+    """Blocking search stand-in that records call counts and peak concurrency."""
+
+    def __init__(self, delay_s: float = 0.05, gate: threading.Event = None):
+        self.delay_s = delay_s
+        self.gate = gate
+        self.calls = 0
+        self.in_flight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            else:
+                time.sleep(self.delay_s)
+            return f"results for {query}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_slow_backend_times_out():
+    gate = threading.Event()
+    searcher = AsyncWebSearch(StandInBackend(gate=gate), max_concurrent=2, timeout_s=0.1)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(searcher.search("slow query"))
+        assert searcher.stats["timeouts"] == 1
+        assert searcher.cache.get(searcher._key("slow query")) is None
+    finally:
+        gate.set()
+        searcher.shutdown()
+
+
+def test_identical_in_flight_queries_share_one_call():
+    backend = StandInBackend(delay_s=0.1)
+    searcher = AsyncWebSearch(backend, max_concurrent=4, timeout_s=2)
+
+    async def burst():
+        return await asyncio.gather(*(searcher.search(q) for q in ["iPhone 15 price"] * 5 + ["  iphone 15   PRICE "] * 5))
+
+    results = asyncio.run(burst())
+    searcher.shutdown()
+    assert backend.calls == 1
+    assert searcher.stats["coalesced"] == 9
+    assert set(results) == {"results for iPhone 15 price"}
+
+
+def test_results_are_served_from_cache_until_expiry():
+    backend = StandInBackend(delay_s=0.01)
+    searcher = AsyncWebSearch(backend, max_concurrent=2, timeout_s=2, cache_ttl_s=0.2)
+
+    async def scenario():
+        await searcher.search("pixel 8 reviews")
+        await searcher.search("Pixel 8 reviews")
+        assert backend.calls == 1 and searcher.stats["cache_hits"] == 1
+        await asyncio.sleep(0.25)
+        await searcher.search("pixel 8 reviews")
+
+    asyncio.run(scenario())
+    searcher.shutdown()
+    assert backend.calls == 2
+
+
+def test_concurrency_is_bounded():
+    backend = StandInBackend(delay_s=0.05)
+    searcher = AsyncWebSearch(backend, max_concurrent=3, timeout_s=5)
+
+    async def burst():
+        return await asyncio.gather(*(searcher.search(f"query {i}") for i in range(20)))
+
+    results = asyncio.run(burst())
+    searcher.shutdown()
+    assert len(results) == 20 and backend.calls == 20
+    assert backend.peak == 3
+
+
+def test_timed_out_call_keeps_its_slot_until_the_backend_returns():
+    gate = threading.Event()
+    backend = StandInBackend(gate=gate)
+    searcher = AsyncWebSearch(backend, max_concurrent=1, timeout_s=0.1)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await searcher.search("stuck query")
+        # The stuck call still occupies the only slot, so this one times out waiting for it.
+        with pytest.raises(asyncio.TimeoutError):
+            await searcher.search("next query")
+        assert backend.calls == 1
+        gate.set()
+        await asyncio.sleep(0.05)
+        return await searcher.search("next query")
+
+    try:
+        assert asyncio.run(scenario()) == "results for next query"
+    finally:
+        gate.set()
+        searcher.shutdown()
+    assert backend.peak == 1